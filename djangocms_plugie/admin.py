@@ -0,0 +1,49 @@
+from django.contrib import admin, messages
+from djangocms_plugie.jobs import cancel_import_job, delete_export_file, delete_imported_plugins, resume_import_job
+from djangocms_plugie.models import ExportJob, ImportJob
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'status', 'placeholder', 'created_plugins', 'total_plugins', 'created_by', 'created_at', 'heartbeat_at',
+        'finished_at',
+    )
+    list_filter = ('status',)
+    readonly_fields = [field.name for field in ImportJob._meta.fields]
+    actions = ['cancel_jobs', 'resume_jobs', 'delete_plugins']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Cancel the selected import jobs")
+    def cancel_jobs(self, request, queryset):
+        cancelled = sum(cancel_import_job(job.pk) for job in queryset)
+        self.message_user(request, f"Cancelled {cancelled} import jobs.", messages.SUCCESS)
+
+    @admin.action(description="Resume the selected failed, cancelled or stale import jobs")
+    def resume_jobs(self, request, queryset):
+        resumed = sum(resume_import_job(job.pk) for job in queryset)
+        self.message_user(request, f"Resumed {resumed} import jobs.", messages.SUCCESS)
+
+    @admin.action(description="Delete the plugins created by the selected failed or cancelled import jobs")
+    def delete_plugins(self, request, queryset):
+        jobs = queryset.filter(status__in=(ImportJob.STATUS_FAILED, ImportJob.STATUS_CANCELLED))
+        deleted = sum(delete_imported_plugins(job.pk) for job in jobs)
+        self.message_user(request, f"Deleted {deleted} plugins.", messages.SUCCESS)
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'component_type', 'component_id', 'total_plugins', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = [field.name for field in ExportJob._meta.fields]
+    actions = ['delete_files']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Delete the export files of the selected export jobs")
+    def delete_files(self, request, queryset):
+        deleted = sum(delete_export_file(job) for job in queryset)
+        self.message_user(request, f"Deleted {deleted} export files.", messages.SUCCESS)
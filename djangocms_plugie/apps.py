@@ -3,6 +3,7 @@ from django.apps import AppConfig
 
 class PlugieConfig(AppConfig):
     name = 'djangocms_plugie'
+    default_auto_field = 'django.db.models.AutoField'
     verbose_name = 'Django CMS Plugins Importer/Exporter'
 
     def ready(self):
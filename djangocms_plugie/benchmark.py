@@ -0,0 +1,261 @@
+import io
+import json
+import platform
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import cms
+import django
+from django.db import connections, transaction
+from cms.models import Placeholder
+from djangocms_plugie import __version__
+from djangocms_plugie.db import QueryCounter
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.utils import get_importer, parse_and_plan_import_file
+
+PHASES = ('export', 'parse', 'import')
+BENCHMARK_SLOT = 'plugie_benchmark'
+
+
+class BenchmarkRollback(Exception):
+    """Raised to roll back the plugins created by a benchmark."""
+
+
+def generate_import_data(
+    count: int,
+    depth: int = 3,
+    fan_out: int = 4,
+    plugin_types: Optional[Dict[str, int]] = None,
+    field_factories: Optional[Dict[str, Callable[[random.Random, int], Dict[str, Any]]]] = None,
+    language: str = 'en',
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Generate the import data of a synthetic plugin tree, in the format of an
+    export file. Root plugins are added until there are `count` plugins, and
+    each of them gets a full subtree of `fan_out` children per plugin, down to
+    `depth` levels, or what is left of it for the last one.
+
+    :param count: int, the number of plugins
+    :param depth: int, the number of levels of each root subtree
+    :param fan_out: int, the number of children of the plugins above the last level
+    :param plugin_types: dict, the plugin types and their weights in the mix.
+    Default is PlugiePlugin only
+    :param field_factories: dict, per plugin type, a callable taking the random
+    generator and the index of the plugin, and returning the fields of the
+    plugin, e.g. inline related items built with `related_items`
+    :param language: str, the language of the plugins
+    :param seed: int, the seed of the random generator, so runs are repeatable
+
+    :return: dict, the import data
+    """
+    plugin_types = plugin_types or {'PlugiePlugin': 1}
+    field_factories = field_factories or {}
+    rng = random.Random(seed)
+    type_names = list(plugin_types)
+    weights = list(plugin_types.values())
+    all_plugins = []
+    positions = {}
+
+    def add(parent_id, level):
+        if len(all_plugins) >= count:
+            return
+        plugin_id = len(all_plugins) + 1
+        plugin_type = rng.choices(type_names, weights)[0]
+        position = positions.get(parent_id, 0)
+        positions[parent_id] = position + 1
+        plugin = {
+            'meta': {
+                'id': plugin_id,
+                'parent': parent_id,
+                'position': position,
+                'plugin_type': plugin_type,
+                'language': language,
+            },
+        }
+        factory = field_factories.get(plugin_type)
+        if factory is not None:
+            plugin.update(factory(rng, plugin_id))
+        all_plugins.append(plugin)
+
+        if level + 1 < depth:
+            for _ in range(fan_out):
+                add(plugin_id, level + 1)
+
+    while len(all_plugins) < count:
+        add(None, 0)
+
+    return {'version': __version__, 'all_plugins': all_plugins}
+
+
+def related_items(model_label: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the exported value of inline related items, e.g. in a field factory
+    of `generate_import_data`.
+
+    :param model_label: str, the label of the related model, e.g. 'app.Item'
+    :param items: list of dict, the fields of the items, without the relation
+    to the plugin
+
+    :return: dict, the special field of the items
+    """
+    return {'_type': 'relatedmanager', '_model_label': model_label, '_list': items}
+
+
+def measure(func: Callable[[], Any], using: str = 'default', memory: bool = True) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run a function and measure its wall time, its queries on a database and,
+    if `memory` is True, its peak memory. The peak memory is traced in a
+    second run, as tracing slows the first one down, so the function must be
+    repeatable.
+
+    :param func: the function to run
+    :param using: str, the database alias to count the queries of
+    :param memory: bool, whether to measure the peak memory
+
+    :return: tuple of the result of the first run and of the measurement
+    """
+    with QueryCounter(using) as queries:
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+
+    measurement = {'seconds': round(seconds, 4), 'queries': queries.count, 'peak_memory': None}
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            measurement['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result, measurement
+
+
+def run_benchmark(count: int, using: str = 'default', memory: bool = True, **generator_options) -> Dict[str, Any]:
+    """
+    Benchmark the export, the parsing and the import of a synthetic plugin
+    tree. The tree is imported into a new placeholder first, then exported
+    with `Exporter.serialize_plugins`, the export file is parsed and
+    validated, and imported again. Everything is rolled back at the end.
+
+    :param count: int, the number of plugins
+    :param using: str, the database alias to run on
+    :param memory: bool, whether to measure the peak memory of the phases
+    :param generator_options: the options of `generate_import_data`
+
+    :return: dict, the size of the tree and the measurements of the phases
+    """
+    import_data = generate_import_data(count, **generator_options)
+    phases = {}
+
+    def import_into_placeholder(import_data, import_plan=None):
+        placeholder = Placeholder.objects.using(using).create(slot=BENCHMARK_SLOT)
+        data = {'plugin': None, 'placeholder': placeholder, 'import_data': import_data, 'using': using}
+        if import_plan is not None:
+            data['import_plan'] = import_plan
+        get_importer(data).import_plugins_to_target()
+        return placeholder
+
+    def rolled_back(func):
+        def run():
+            try:
+                with transaction.atomic(using=using):
+                    func()
+                    raise BenchmarkRollback
+            except BenchmarkRollback:
+                pass
+        return run
+
+    try:
+        with transaction.atomic(using=using):
+            source = import_into_placeholder(import_data)
+            plugins = get_plugin_tree('placeholder', source.pk, using=using)
+
+            all_plugins, phases['export'] = measure(
+                lambda: Exporter(using=using).serialize_plugins(plugins.all()), using, memory)
+            export_file = json.dumps({'version': __version__, 'all_plugins': all_plugins}).encode('utf-8')
+
+            (parsed_data, import_plan), phases['parse'] = measure(
+                lambda: parse_and_plan_import_file(io.BytesIO(export_file)), using, memory)
+
+            _, phases['import'] = measure(
+                rolled_back(lambda: import_into_placeholder(parsed_data, import_plan)), using, memory)
+            raise BenchmarkRollback
+    except BenchmarkRollback:
+        pass
+
+    return {
+        'plugins': count,
+        'options': {key: value for key, value in generator_options.items() if key != 'field_factories'},
+        'export_bytes': len(export_file),
+        'phases': phases,
+    }
+
+
+def get_environment(using: str = 'default') -> Dict[str, str]:
+    """
+    Get the versions and the database the benchmark ran with, saved with the
+    results as numbers are only comparable in the same environment.
+    """
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'django_cms': cms.__version__,
+        'plugie': __version__,
+        'database': connections[using].vendor,
+    }
+
+
+def save_baseline(results: List[Dict[str, Any]], path: str, using: str = 'default') -> None:
+    """
+    Save the results of benchmark runs as a baseline JSON file.
+
+    :param results: list of the results of `run_benchmark`
+    :param path: str, the path of the baseline file
+    :param using: str, the database alias the benchmarks ran on
+    """
+    with open(path, 'w') as baseline_file:
+        json.dump({'environment': get_environment(using), 'runs': results}, baseline_file, indent=4, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """
+    Load a baseline JSON file saved with `save_baseline`.
+    """
+    with open(path, 'r') as baseline_file:
+        return json.load(baseline_file)
+
+
+def compare_results(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare the results of benchmark runs with the runs of a baseline of the
+    same number of plugins.
+
+    :param results: list of the results of `run_benchmark`
+    :param baseline: dict, a baseline loaded with `load_baseline`
+
+    :return: list of dict, per run and phase, the ratio of each measurement
+    to the baseline one, e.g. 1.2 for 20% slower
+    """
+    baseline_runs = {run['plugins']: run for run in baseline.get('runs', [])}
+    comparisons = []
+
+    for result in results:
+        baseline_run = baseline_runs.get(result['plugins'])
+        if baseline_run is None:
+            continue
+        for phase, measurement in result['phases'].items():
+            baseline_measurement = baseline_run['phases'].get(phase, {})
+            comparisons.append({
+                'plugins': result['plugins'],
+                'phase': phase,
+                **{
+                    key: round(value / baseline_measurement[key], 2) if baseline_measurement.get(key) else None
+                    for key, value in measurement.items()
+                    if value is not None
+                },
+            })
+
+    return comparisons
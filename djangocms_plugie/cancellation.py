@@ -0,0 +1,36 @@
+import threading
+
+
+class ImportCancelledError(Exception):
+    """Raised by the importer when its cancellation token is cancelled."""
+
+    def __init__(self, message="The import was cancelled."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class CancellationToken:
+    """
+    Token to stop an import from another thread. The importer checks it
+    between plugins and raises ImportCancelledError once it is cancelled, so
+    the transaction the import runs in is rolled back.
+
+    Pass it as the "cancel_token" key of the importer data.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raises:
+            ImportCancelledError: If the token was cancelled.
+        """
+        if self.is_cancelled:
+            raise ImportCancelledError()
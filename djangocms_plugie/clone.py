@@ -0,0 +1,53 @@
+from typing import Literal, Optional
+from cms.models import CMSPlugin, Placeholder
+from django.db import transaction
+from djangocms_plugie.importer.plan import ImportPlan, PluginRecord
+from djangocms_plugie.utils import initialize_and_run_importer
+
+
+def clone_plugin_tree(
+        component_type: Literal['plugin', 'placeholder'],
+        component_id: int,
+        placeholder: Optional[Placeholder] = None,
+        target_plugin: Optional[CMSPlugin] = None
+) -> object:
+    """
+    Clone the plugin tree of a component into a placeholder or under a
+    plugin of the same database.
+
+    The exporter output is handed to the importer as Python objects, so there
+    is no JSON encoding, no file and no validation of the import data, which
+    comes straight from the exporter. The whole clone runs in one transaction.
+
+    :param component_type: str, 'plugin' or 'placeholder', the source type
+    :param component_id: int, ID of the source component
+    :param placeholder: Placeholder object, the target placeholder
+    :param target_plugin: CMSPlugin object, the target plugin. Its placeholder
+    is used as the target placeholder
+
+    :return: the importer that ran, counting the created plugins in its
+    'created_count'
+    """
+    from djangocms_plugie.exporter import Exporter, get_plugin_tree
+
+    if placeholder is None and target_plugin is None:
+        raise ValueError('A target placeholder or plugin must be provided.')
+
+    # Read from the target database rather than from the export database,
+    # which may be a lagging read replica.
+    using = (target_plugin or placeholder)._state.db
+
+    with transaction.atomic(using=using):
+        exporter = Exporter(using=using)
+        plugin_tree = get_plugin_tree(component_type, component_id, using=using)
+        import_data = exporter.get_export_data(plugin_tree)
+        # The plan is built from the exporter output as is, without the
+        # validation of the meta of each plugin that import files go through.
+        records = [PluginRecord.from_plugin_fields(plugin) for plugin in import_data['all_plugins']]
+        data = {
+            'plugin': target_plugin,
+            'placeholder': placeholder,
+            'import_data': import_data,
+            'import_plan': ImportPlan.from_records(records),
+        }
+        return initialize_and_run_importer(data)
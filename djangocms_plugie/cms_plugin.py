@@ -1,9 +1,13 @@
+from functools import lru_cache
 from cms.plugin_base import CMSPluginBase, PluginMenuItem
 from cms.models import CMSPlugin, PlaceholderReference
 from cms.plugin_pool import plugin_pool
 from django.urls import reverse
 from django.http import HttpRequest
-from typing import Literal, List
+from typing import Literal, List, Optional, Tuple
+
+# Stands for the ID of the component in the URL templates of the menu items.
+URL_ID_MARKER = '__component_id__'
 
 
 @plugin_pool.register_plugin
@@ -33,11 +37,11 @@ class PlugiePlugin(CMSPluginBase):
         except AttributeError:
             return []
 
-        if not plugin.get_plugin_class().allow_children:
-            return [plugin_menu_item('export', component_type, id)]
+        if not allows_children(plugin.plugin_type):
+            return [plugin_menu_item('export', component_type, id, request)]
 
         return [
-            plugin_menu_item(operation, component_type, id)
+            plugin_menu_item(operation, component_type, id, request)
             for operation in ['export', 'import']
         ]
 
@@ -58,18 +62,24 @@ class PlugiePlugin(CMSPluginBase):
             return []
 
         return [
-            plugin_menu_item(operation, component_type, id)
+            plugin_menu_item(operation, component_type, id, request)
             for operation in ['export', 'import']
         ]
 
 
-def plugin_menu_item(operation: Literal['export', 'import'], component_type: Literal['plugin', 'placeholder'], id: str) -> PluginMenuItem:
+def plugin_menu_item(
+        operation: Literal['export', 'import'],
+        component_type: Literal['plugin', 'placeholder'],
+        id: str,
+        request: Optional[HttpRequest] = None
+) -> PluginMenuItem:
     """
     Create a PluginMenuItem object for exporting or importing plugins.
 
     :param operation: str, 'export' or 'import'
     :param component_type: str, 'plugin' or 'placeholder'
     :param id: int, ID of the component
+    :param request: HttpRequest object, if any, to keep the URL templates on
 
     :return: PluginMenuItem object
     """
@@ -82,14 +92,63 @@ def plugin_menu_item(operation: Literal['export', 'import'], component_type: Lit
 
     label = f"{operation.capitalize()} Plugins"
     action = "modal" if operation == "import" else "none"
-    url = reverse(f"{operation}_component_data",
-                  kwargs={"component_type": component_type,
-                          "component_id": id})
+    url_prefix, url_suffix = get_url_template(operation, component_type, request)
     return PluginMenuItem(
         label,
-        url,
+        f"{url_prefix}{id}{url_suffix}",
         action=action,
         attributes={
             "icon": operation,
         },
     )
+
+
+def get_url_template(
+        operation: Literal['export', 'import'],
+        component_type: Literal['plugin', 'placeholder'],
+        request: Optional[HttpRequest] = None
+) -> Tuple[str, str]:
+    """
+    Get the URL of the export or import view of a component type, split
+    around the ID of the component. The URL is reversed once per request,
+    rather than once per plugin of the page, and kept on the request for the
+    other plugins of the page. It is not cached across requests, so it
+    follows the URL conf when django CMS reloads it, e.g. for apphooks.
+
+    :param operation: str, 'export' or 'import'
+    :param component_type: str, 'plugin' or 'placeholder'
+    :param request: HttpRequest object, if any
+
+    :return: tuple of the parts of the URL before and after the ID
+    """
+    url_templates = getattr(request, '_plugie_url_templates', None)
+    if url_templates is None:
+        url_templates = {}
+        if request is not None:
+            request._plugie_url_templates = url_templates
+
+    url_template = url_templates.get((operation, component_type))
+    if url_template is None:
+        url_template = url_templates[operation, component_type] = _get_url_template(operation, component_type)
+    return url_template
+
+
+def _get_url_template(operation: str, component_type: str) -> Tuple[str, str]:
+    url = reverse(f"{operation}_component_data",
+                  kwargs={"component_type": component_type,
+                          "component_id": URL_ID_MARKER})
+    url_prefix, _, url_suffix = url.partition(URL_ID_MARKER)
+    return url_prefix, url_suffix
+
+
+@lru_cache(maxsize=None)
+def allows_children(plugin_type: str) -> bool:
+    """
+    Check whether the plugins of a type can have children, which the import
+    menu item needs. The plugin pool is looked up once per plugin type.
+
+    :param plugin_type: str, the plugin type, e.g. 'TextPlugin'
+
+    :return: bool, True if the plugins of the type can have children
+    """
+    return bool(plugin_pool.get_plugin(plugin_type).allow_children)
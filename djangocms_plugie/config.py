@@ -1,7 +1,7 @@
 
 import json
 import logging
-from typing import List
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +20,28 @@ class Config:
     - skip_fields: list, the fields to skip when exporting plugins
     - config_file: str, the name of the configuration file
     - custom_methods_path: str, the path to the custom methods directory. Default is 'plugie/custom_methods'
+    - export_database: str, the database alias the exporter reads from, e.g. a read replica. Default is None
+    - jobs: dict, the settings of the background jobs
+    - suppress_plugin_signals: bool, whether imports skip the save signal receivers wrapped with skip_during_import. Default is False
+    - staged_imports: bool, whether imports build the plugin tree in a staging placeholder before attaching it. Default is False
+    - staging_timeout: int, the seconds after which a staging placeholder left behind by an import is deleted. Default is 3600
+    - metrics: dict, the settings of the export and import metrics
+    - profiling: dict, the settings of the profiling of the export and import views
+    - memory: dict, the settings of the peak memory tracking of the exports and imports
     """
     def __init__(self):
         self.dummy_plugins = {}
         self.skip_fields = ["placeholder","cmsplugin_ptr", "alias_reference"] # default skip fields
         self.config_file = "plugie_config.json"
         self.custom_methods_path = 'plugie/custom_methods'
+        self.export_database = None
+        self.jobs = {}
+        self.suppress_plugin_signals = False
+        self.staged_imports = False
+        self.staging_timeout = 3600
+        self.metrics = {}
+        self.profiling = {}
+        self.memory = {}
         self.load_config()
 
     def load_config(self) -> None:
@@ -42,6 +58,14 @@ class Config:
             self.dummy_plugins = self.config.get("dummy_plugins", {})
             self.skip_fields += self.config.get("skip_fields", [])
             self.custom_methods_path = self.config.get("custom_methods_path", self.custom_methods_path)
+            self.export_database = self.config.get("export_database", self.export_database)
+            self.jobs = self.config.get("jobs", self.jobs)
+            self.suppress_plugin_signals = self.config.get("suppress_plugin_signals", self.suppress_plugin_signals)
+            self.staged_imports = self.config.get("staged_imports", self.staged_imports)
+            self.staging_timeout = self.config.get("staging_timeout", self.staging_timeout)
+            self.metrics = self.config.get("metrics", self.metrics)
+            self.profiling = self.config.get("profiling", self.profiling)
+            self.memory = self.config.get("memory", self.memory)
         
         except FileNotFoundError:
             logger.warning(f"Configuration file '{self.config_file}' not found. Using default settings.")
@@ -88,4 +112,251 @@ class Config:
         Returns:
             str: The path to the custom methods directory.
         """
-        return self.custom_methods_path
\ No newline at end of file
+        return self.custom_methods_path
+
+    def get_export_database(self) -> Optional[str]:
+        """
+        Get the database alias the exporter reads from.
+
+        Returns:
+            str: The database alias, or None to use the default routing.
+        """
+        return self.export_database
+
+    def get_suppress_plugin_signals(self) -> bool:
+        """
+        Get whether imports skip the pre_save and post_save receivers wrapped
+        with `skip_during_import` for the plugins they create. Imports send
+        one post_import signal per placeholder and language either way.
+
+        Returns:
+            bool: True if the signals are suppressed.
+        """
+        return bool(self.suppress_plugin_signals)
+
+    def get_staged_imports(self) -> bool:
+        """
+        Get whether imports build the plugin tree in a hidden staging
+        placeholder, and attach it to the target in one short transaction
+        once it is complete. Import jobs always import into the target, as
+        they commit and checkpoint their progress batch by batch, and so do
+        the imports run in a transaction of their caller, which would hold
+        the locks of the target until it commits anyway.
+
+        Returns:
+            bool: True if imports are staged.
+        """
+        return bool(self.staged_imports)
+
+    def get_staging_timeout(self) -> float:
+        """
+        Get the number of seconds after which a staging placeholder is
+        considered left behind, e.g. by a process killed mid-import, and
+        can be deleted.
+
+        Returns:
+            float: The number of seconds.
+        """
+        return self.staging_timeout
+
+    def get_metrics_sink(self) -> Optional[str]:
+        """
+        Get the sink the export and import metrics are reported to: "logging",
+        "memory" or the dotted path of a MetricsSink subclass.
+
+        Returns:
+            str: The sink, or None to turn the metrics off.
+        """
+        if isinstance(self.metrics, dict):
+            return self.metrics.get("sink", None)
+        return None
+
+    def get_method_timing(self) -> bool:
+        """
+        Get whether the serialize and deserialize methods are timed, and their
+        timings logged at the end of each export and import.
+
+        Returns:
+            bool: True if the methods are timed.
+        """
+        if isinstance(self.metrics, dict):
+            return bool(self.metrics.get("method_timing", False))
+        return False
+
+    def get_profiling_enabled(self) -> bool:
+        """
+        Get whether staff users can profile the export and import views with
+        the plugie_profile query parameter.
+
+        Returns:
+            bool: True if profiling is enabled.
+        """
+        if isinstance(self.profiling, dict):
+            return bool(self.profiling.get("enabled", False))
+        return False
+
+    def get_profiling_directory(self) -> str:
+        """
+        Get the directory the profiles of the views are saved to.
+
+        Returns:
+            str: The path of the directory.
+        """
+        if isinstance(self.profiling, dict):
+            return self.profiling.get("directory", "plugie/profiles")
+        return "plugie/profiles"
+
+    def get_profiling_top(self) -> int:
+        """
+        Get the number of functions in the summaries of the profiles.
+
+        Returns:
+            int: The number of functions.
+        """
+        if isinstance(self.profiling, dict):
+            return self.profiling.get("top", 50)
+        return 50
+
+    def get_memory_tracking(self) -> bool:
+        """
+        Get whether the peak memory of the phases of the exports and imports
+        is tracked with tracemalloc.
+
+        Returns:
+            bool: True if the memory is tracked.
+        """
+        if isinstance(self.memory, dict):
+            return bool(self.memory.get("enabled", False))
+        return False
+
+    def get_memory_top(self) -> int:
+        """
+        Get the number of allocation sites reported for each phase.
+
+        Returns:
+            int: The number of allocation sites.
+        """
+        if isinstance(self.memory, dict):
+            return self.memory.get("top", 10)
+        return 10
+
+    def get_memory_limits(self) -> Dict[str, float]:
+        """
+        Get the peak memory limits of the phases, in MiB, e.g.
+        {"parse": 512}. A warning is logged when a phase exceeds its limit.
+
+        Returns:
+            dict: The limits by phase name.
+        """
+        if isinstance(self.memory, dict):
+            return self.memory.get("limits", {}) or {}
+        return {}
+
+    def get_background_imports(self) -> bool:
+        """
+        Get whether imports from the import view run as background jobs.
+
+        Returns:
+            bool: True if imports run in the background.
+        """
+        if isinstance(self.jobs, dict):
+            return bool(self.jobs.get("imports", False))
+        return False
+
+    def get_job_runner(self) -> str:
+        """
+        Get what runs the background jobs: "thread", a thread pool of the web
+        process, or "worker", the plugie_worker management command.
+
+        Returns:
+            str: The job runner.
+        """
+        if isinstance(self.jobs, dict):
+            return self.jobs.get("runner", "thread")
+        return "thread"
+
+    def get_job_threads(self) -> int:
+        """
+        Get the number of threads running background jobs in the web process.
+
+        Returns:
+            int: The number of threads.
+        """
+        if isinstance(self.jobs, dict):
+            return self.jobs.get("threads", 2)
+        return 2
+
+    def get_checkpoint_interval(self) -> int:
+        """
+        Get the number of plugins an import job creates in one transaction,
+        before saving its progress and a checkpoint to resume from.
+
+        Returns:
+            int: The number of plugins.
+        """
+        if isinstance(self.jobs, dict):
+            return self.jobs.get("checkpoint_interval", 100)
+        return 100
+
+    def get_rollback_cancelled(self) -> bool:
+        """
+        Get whether cancelling an import job deletes the plugins it created,
+        rather than keeping them so the job can be resumed.
+
+        Returns:
+            bool: True if cancelled jobs are rolled back.
+        """
+        if isinstance(self.jobs, dict):
+            return bool(self.jobs.get("rollback_cancelled", True))
+        return True
+
+    def get_stale_job_timeout(self) -> float:
+        """
+        Get the number of seconds after which a running import job whose
+        heartbeat was not refreshed is stale, e.g. because its worker was
+        killed. Stale jobs can be resumed or cancelled. Keep it longer than
+        the time an import job takes to create a batch of plugins.
+
+        Returns:
+            float: The number of seconds.
+        """
+        if isinstance(self.jobs, dict):
+            return self.jobs.get("stale_timeout", 600)
+        return 600
+
+    def get_export_retention(self) -> Optional[float]:
+        """
+        Get the number of hours the files of finished export jobs are kept
+        before they are deleted.
+
+        Returns:
+            float: The number of hours, or None to keep the files.
+        """
+        if isinstance(self.jobs, dict):
+            return self.jobs.get("export_retention", 24)
+        return 24
+
+    def get_import_retention(self) -> Optional[float]:
+        """
+        Get the number of hours the files of failed and cancelled import jobs
+        are kept, so the jobs can be resumed, before they are deleted. The
+        files of the jobs that are done are deleted right away.
+
+        Returns:
+            float: The number of hours, or None to keep the files.
+        """
+        if isinstance(self.jobs, dict):
+            return self.jobs.get("import_retention", 24)
+        return 24
+
+    def get_export_threshold(self) -> Optional[int]:
+        """
+        Get the number of plugins above which an export from the export view
+        runs as a background job.
+
+        Returns:
+            int: The number of plugins, or None to always export synchronously.
+        """
+        if isinstance(self.jobs, dict):
+            return self.jobs.get("export_threshold", None)
+        return None
\ No newline at end of file
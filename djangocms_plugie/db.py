@@ -0,0 +1,176 @@
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from types import FrameType
+from typing import Callable, Hashable, Iterator, Optional
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+ROUTER_PATH = 'djangocms_plugie.db.PlugieRouter'
+# The key of the database lock on the plugin tree, see `lock_plugin_tree`.
+PLUGIN_TREE_LOCK_NAME = 'djangocms_plugie.plugin_tree'
+PLUGIN_TREE_LOCK_ID = 0x706c7567
+
+_local = threading.local()
+
+
+class PlugieRouter:
+    """
+    Database router sending the queries of the exporter and the importer to
+    the database alias they run on.
+
+    Queries made on behalf of an instance, e.g. through its related managers,
+    go to the database the instance was loaded from. Other queries, e.g. the
+    ones of django CMS or of the custom methods, go to the alias set with
+    `use_database` in the current thread. Outside of it, the router has no
+    opinion and the next router, or the default database, is used.
+
+    Add it to the DATABASE_ROUTERS setting to export from or import to a
+    database other than the default one:
+
+        DATABASE_ROUTERS = ['djangocms_plugie.db.PlugieRouter']
+    """
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        return self._get_alias(**hints)
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        return self._get_alias(**hints)
+
+    def _get_alias(self, **hints) -> Optional[str]:
+        alias = get_current_database()
+        if alias is None:
+            return None
+
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return alias
+
+
+def get_current_database() -> Optional[str]:
+    """
+    Get the database alias set with `use_database` in the current thread.
+
+    :return: str, the database alias, or None
+    """
+    return getattr(_local, 'alias', None)
+
+
+@contextmanager
+def use_database(alias: Optional[str]) -> Iterator[None]:
+    """
+    Send the queries made in the current thread to a database alias, through
+    the PlugieRouter. Nothing changes when the alias is None.
+
+    :param alias: str, the database alias, or None
+
+    Raises:
+        ImproperlyConfigured: If the queries cannot be routed to the alias.
+    """
+    if alias is None:
+        yield
+        return
+
+    previous = get_current_database()
+    _local.alias = alias
+    try:
+        check_router(alias)
+        yield
+    finally:
+        _local.alias = previous
+
+
+def check_router(alias: str) -> None:
+    """
+    Check that the queries are routed to the given database alias.
+
+    :param alias: str, the database alias
+
+    Raises:
+        ImproperlyConfigured: If the PlugieRouter is not installed and the
+        alias is not the database the queries go to anyway.
+    """
+    # The router module is loaded with the settings, before the apps.
+    from cms.models import CMSPlugin
+
+    if router.db_for_write(CMSPlugin) != alias:
+        raise ImproperlyConfigured(
+            f"Queries cannot be routed to the database '{alias}'. Add "
+            f"'{ROUTER_PATH}' to the DATABASE_ROUTERS setting, before any "
+            "router that routes the cms models."
+        )
+
+
+@contextmanager
+def lock_plugin_tree(using: Optional[str] = None) -> Iterator[None]:
+    """
+    Hold an exclusive database lock on the plugin tree while importing into
+    it. The root plugins of all the placeholders share one tree, so two
+    transactions adding root plugins at the same time pick the same paths
+    and one of them fails. Wrap the transaction in the lock, so that it is
+    only released once the transaction is committed:
+
+        with lock_plugin_tree(using), transaction.atomic(using=using):
+            ...
+
+    PostgreSQL and MySQL take a session level advisory lock. SQLite runs one
+    write transaction at a time anyway, and other databases are not locked.
+
+    :param using: str, the database alias, or None for the default database
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor == 'postgresql':
+        lock, unlock = 'SELECT pg_advisory_lock(%s)', 'SELECT pg_advisory_unlock(%s)'
+        key = PLUGIN_TREE_LOCK_ID
+    elif connection.vendor == 'mysql':
+        lock, unlock = 'SELECT GET_LOCK(%s, -1)', 'SELECT RELEASE_LOCK(%s)'
+        key = PLUGIN_TREE_LOCK_NAME
+    else:
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(lock, [key])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(unlock, [key])
+
+
+class QueryCounter:
+    """
+    Count the queries of a block on a database, through an execute wrapper,
+    without the query log and its limit of 9000 queries. With a `key`
+    function, the queries are also counted per key of the frame running them,
+    e.g. per code path:
+
+        with QueryCounter() as queries:
+            exporter.serialize_plugins(plugins)
+        queries.count
+
+    :param using: str, the database alias, by default the one set with
+    `use_database`, or the default database
+    :param key: callable, taking the frame running a query and returning its key
+    """
+    def __init__(self, using: Optional[str] = None, key: Optional[Callable[[FrameType], Hashable]] = None):
+        self.using = using
+        self.key = key
+        self.count = 0
+        self.per_key = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        if self.key is not None:
+            self.per_key[self.key(sys._getframe(1))] += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> 'QueryCounter':
+        alias = self.using or get_current_database() or DEFAULT_DB_ALIAS
+        self._wrapper = connections[alias].execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._wrapper.__exit__(*exc_info)
@@ -1,3 +1,3 @@
-from .exporter import Exporter
+from .exporter import Exporter, get_plugin_tree
 
-__all__ = ['Exporter']
+__all__ = ['Exporter', 'get_plugin_tree']
@@ -1,17 +1,137 @@
+import json
+import textwrap
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Literal, Optional
+from cms.models import CMSPlugin
+from django.db.models import QuerySet
+from djangocms_plugie.config import Config
+from djangocms_plugie.db import use_database
 from djangocms_plugie.methods.exporter_method_map import ExporterMethodMap
 from djangocms_plugie.exporter.plugin_serializer import PluginSerializer
+from djangocms_plugie.memory import get_memory_tracker
+from djangocms_plugie.metrics import get_metrics
 from djangocms_plugie import __version__
 
 
 class Exporter:
-    def __init__(self):
+    def __init__(self, using: Optional[str] = None, memory=None):
+        """
+        Initialize the Exporter.
+
+        :param using: Optional[str], the database alias to read the plugins
+        from. Defaults to the 'export_database' setting, e.g. a read replica.
+        Other aliases than the default one require the PlugieRouter
+        :param memory: the memory tracker of the export, e.g. the one of an
+        export job. Defaults to a new one if memory tracking is on
+        """
         self.version = __version__
+        self.using = using if using is not None else Config().get_export_database()
         self.exporter_method_map = ExporterMethodMap(exporter=self)
         self.plugin_serializer = PluginSerializer(self.exporter_method_map)
+        self.metrics = get_metrics('export', self.using)
+        self.memory = memory or get_memory_tracker('export')
+
+    def report(self) -> None:
+        """
+        Report the metrics and log the method timings of the export since the
+        last report, and log its peak memory.
+        """
+        self.metrics.report()
+        self.exporter_method_map.report_method_timings()
+        self.memory.report()
 
     def serialize_plugins(self, plugins):
-        return [
-            serialized_plugin
-            for plugin in plugins
-            if (serialized_plugin := self.plugin_serializer.serialize_plugin(plugin)) != {}
-        ]
+        metrics = self.metrics
+        with use_database(self.using):
+            with metrics.phase('fetch'):
+                plugins = list(plugins)
+            with metrics.phase('downcast'):
+                self.plugin_serializer.prefetch_plugins(plugins, self.using)
+            with metrics.phase('serialize'):
+                serialized_plugins = [
+                    serialized_plugin
+                    for plugin in plugins
+                    if (serialized_plugin := self.plugin_serializer.serialize_plugin(plugin)) != {}
+                ]
+
+        if metrics.enabled:
+            for serialized_plugin in serialized_plugins:
+                metrics.increment(f"plugins_serialized.{serialized_plugin['meta'].get('plugin_type')}")
+        return serialized_plugins
+
+    def get_export_data(self, plugins) -> Dict[str, Any]:
+        """
+        Get the content of an export file for the given plugins.
+
+        :param plugins: iterable of CMSPlugin objects
+
+        :return: dict, with the export version and the serialized plugins
+        """
+        export_data = {
+            'version': self.version,
+            'all_plugins': self.serialize_plugins(plugins),
+        }
+        self.report()
+        return export_data
+
+    def iter_export_json(self, plugins: Iterable[Any], chunk_size: int = 100) -> Iterator[str]:
+        """
+        Encode the export file of the given plugins piece by piece, so that
+        big plugin trees can be written out without holding the whole file in
+        memory. The output is the same as json.dumps(data, indent=4,
+        sort_keys=True) of the export data.
+
+        :param plugins: iterable of CMSPlugin objects, e.g. a queryset iterator
+        :param chunk_size: int, the number of plugins serialized at once
+
+        :return: iterator of str, the pieces of the export file
+        """
+        with self.metrics.phase('fetch'):
+            # Iterating a queryset, rather than its iterator(), fetches it all.
+            plugins = iter(plugins)
+        is_empty = True
+        yield '{\n    "all_plugins": ['
+
+        while True:
+            with self.metrics.phase('fetch'):
+                chunk = list(islice(plugins, chunk_size))
+            if not chunk:
+                break
+
+            serialized_plugins = self.serialize_plugins(chunk)
+            with self.metrics.phase('encode'), self.memory.phase('encode'):
+                encoded_plugins = []
+                for serialized_plugin in serialized_plugins:
+                    encoded_plugin = json.dumps(serialized_plugin, indent=4, sort_keys=True)
+                    encoded_plugins.append(('\n' if is_empty else ',\n') + textwrap.indent(encoded_plugin, ' ' * 8))
+                    is_empty = False
+            if self.metrics.enabled:
+                # The pieces are ASCII, json.dumps escapes the other characters.
+                self.metrics.increment('bytes_out', sum(map(len, encoded_plugins)))
+            yield from encoded_plugins
+
+        yield ']' if is_empty else '\n    ]'
+        yield f',\n    "version": {json.dumps(self.version)}\n}}'
+        self.report()
+
+
+def get_plugin_tree(component_type: Literal['plugin', 'placeholder'], component_id: int, using: Optional[str] = None) -> QuerySet:
+    """
+    Get the plugin tree of a given component.
+
+    :param component_type: str, 'plugin' or 'placeholder'
+    :param component_id: int, ID of the component
+    :param using: Optional[str], the database alias to read the plugins from
+
+    :return: QuerySet object of CMSPlugin
+    """
+
+    if not component_type or not component_id:
+        raise ValueError('Component type and ID must be provided.')
+
+    filter_criteria = {'id': component_id} if component_type == 'plugin' else {'placeholder_id': component_id}
+    parent_queryset = CMSPlugin.objects.using(using).filter(**filter_criteria)
+    descendants = parent_queryset[0].get_descendants().using(using) if component_type == 'plugin' else CMSPlugin.objects.using(using).none()
+    plugin_tree = parent_queryset | descendants
+
+    return plugin_tree
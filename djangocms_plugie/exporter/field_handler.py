@@ -14,7 +14,12 @@ class FieldHandler:
         ]
 
     def get_non_meta_fields(self, downcasted_obj):
-        all_fields = [field.name for field in downcasted_obj._meta.get_fields()]
+        # The reverse relations to the subclasses of the model, e.g. the ones
+        # of CMSPlugin to the plugin models, are not data of the object.
+        all_fields = [
+            field.name for field in downcasted_obj._meta.get_fields()
+            if not (field.one_to_one and field.auto_created and not field.concrete and field.parent_link)
+        ]
 
         exclude_fields = set(self.meta_fields + self.skip_fields)
         return [field for field in all_fields if field not in exclude_fields]
@@ -1,4 +1,6 @@
 import logging
+from collections import defaultdict
+from django.db.models import prefetch_related_objects
 from cms.models import CMSPlugin
 from djangocms_plugie.exporter.field_handler import FieldHandler
 
@@ -30,6 +32,38 @@ class PluginSerializer:
 
         return serialized_obj
 
+    def prefetch_plugins(self, plugins, using=None):
+        """
+        Fetch the parents and the plugin model instances of CMS plugins before
+        serializing them, with one query for the parents and one per plugin
+        model, rather than a few queries per plugin in `serialize_plugin`.
+
+        :param plugins: list of CMSPlugin objects
+        :param using: Optional[str], the database alias to read the instances from
+        """
+        plugins = [plugin for plugin in plugins if isinstance(plugin, CMSPlugin)]
+        prefetch_related_objects(plugins, 'parent')
+
+        plugins_per_model = defaultdict(list)
+        for plugin in plugins:
+            if hasattr(plugin, '_inst'):
+                continue
+            try:
+                plugin_model = plugin.get_plugin_class().model
+            except KeyError:
+                continue
+            if plugin_model is not type(plugin):
+                plugins_per_model[plugin_model].append(plugin)
+
+        for plugin_model, model_plugins in plugins_per_model.items():
+            instances = plugin_model._default_manager.using(using).in_bulk([plugin.pk for plugin in model_plugins])
+            for plugin in model_plugins:
+                instance = instances.get(plugin.pk)
+                if instance is not None:
+                    instance._render_meta = plugin._render_meta
+                # As in CMSPlugin.get_bound_plugin, which returns it from now on.
+                plugin._inst = instance
+
     def _get_downcasted_plugin(self, plugin):
         if isinstance(plugin, CMSPlugin):
             return self._get_plugin_instance(plugin)
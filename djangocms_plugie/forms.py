@@ -4,7 +4,10 @@ from django.db.utils import IntegrityError
 from django import forms
 from django.core.exceptions import ValidationError
 from cms.models import CMSPlugin, Placeholder
-from djangocms_plugie.utils import get_importer, ImporterLoadingError, parse_and_validate_import_file, initialize_and_run_importer
+from djangocms_plugie.clone import clone_plugin_tree
+from djangocms_plugie.jobs import create_import_job
+from djangocms_plugie.models import ImportJob
+from djangocms_plugie.utils import get_importer, ImporterLoadingError, parse_and_plan_import_file, initialize_and_run_importer
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +105,7 @@ class ImportForm(PluginOrPlaceholderSelectionForm):
 
         Returns:
             dict: The cleaned data if validation is successful, including 
-            parsed import data.
+            parsed import data and the import plan made while validating it.
 
         Raises:
             ValidationError: If the import file is invalid or contains invalid data.
@@ -111,7 +114,7 @@ class ImportForm(PluginOrPlaceholderSelectionForm):
             return self.cleaned_data
 
         import_file = self.cleaned_data["import_file"]
-        self.cleaned_data["import_data"] = parse_and_validate_import_file(import_file)
+        self.cleaned_data["import_data"], self.cleaned_data["import_plan"] = parse_and_plan_import_file(import_file)
 
         return self.cleaned_data
 
@@ -127,4 +130,74 @@ class ImportForm(PluginOrPlaceholderSelectionForm):
             Exception: If an unexpected error occurs.
         """
         data = self.cleaned_data
-        initialize_and_run_importer(data)
\ No newline at end of file
+        initialize_and_run_importer(data)
+
+    def queue_import(self, user=None) -> ImportJob:
+        """
+        Queues the import as a background job, storing the import file with
+        the job.
+
+        Args:
+            user: The user starting the import, if any.
+
+        Returns:
+            ImportJob: The queued job.
+        """
+        return create_import_job(self.cleaned_data, self.cleaned_data["import_file"], user=user)
+
+class CloneForm(PluginOrPlaceholderSelectionForm):
+    """
+    Form for cloning the plugin tree of a source plugin or placeholder to a
+    selected plugin or placeholder of the same database.
+
+    Inherits from PluginOrPlaceholderSelectionForm to include the selection
+    of a target plugin or placeholder.
+
+    Attributes:
+        source_type (ChoiceField): The type of the component to clone.
+        source_id (IntegerField): The ID of the component to clone.
+    """
+    source_type = forms.ChoiceField(
+        choices=[("plugin", "Plugin"), ("placeholder", "Placeholder")],
+        required=True,
+    )
+    source_id = forms.IntegerField(min_value=1, required=True)
+
+    def clean(self) -> Dict[str, Any]:
+        """
+        Cleans and validates the source component, ensuring that it has
+        plugins to clone.
+
+        Returns:
+            dict: The cleaned data if validation is successful.
+
+        Raises:
+            ValidationError: If the source component has no plugins.
+        """
+        if self.errors:
+            return self.cleaned_data
+
+        source_type = self.cleaned_data["source_type"]
+        source_id = self.cleaned_data["source_id"]
+        filter_criteria = {"id": source_id} if source_type == "plugin" else {"placeholder_id": source_id}
+
+        if not CMSPlugin.objects.filter(**filter_criteria).exists():
+            raise ValidationError(f"The source {source_type} has no plugins to clone.")
+
+        return self.cleaned_data
+
+    def run_clone(self) -> None:
+        """
+        Clones the source plugin tree into the target plugin or placeholder.
+
+        Raises:
+            TypeError: If an error occurs during the import of the clone.
+            Exception: If an unexpected error occurs.
+        """
+        data = self.cleaned_data
+        clone_plugin_tree(
+            data["source_type"],
+            data["source_id"],
+            placeholder=data["placeholder"],
+            target_plugin=data["plugin"],
+        )
@@ -0,0 +1,337 @@
+import logging
+from contextlib import nullcontext
+from functools import partial
+from cms.models import CMSPlugin
+from django.db import transaction
+from djangocms_plugie.config import Config
+from djangocms_plugie.db import use_database
+from djangocms_plugie.importer.plugin_context import PluginContext
+from djangocms_plugie.importer.planner import plan_import
+from djangocms_plugie.importer.utils import is_special_field
+from djangocms_plugie.importer.resolver import ResolutionCache
+from djangocms_plugie.importer.staging import (
+    attach_staged_plugins, create_staging_placeholder, discard_staging_placeholder, in_caller_transaction
+)
+from djangocms_plugie.utils import build_import_plan
+from djangocms_plugie.methods.importer_method_map import ImporterMethodMap
+from djangocms_plugie.memory import get_memory_tracker
+from djangocms_plugie.metrics import get_metrics
+from djangocms_plugie.signals import invalidate_placeholder, suppress_plugin_signals
+from djangocms_plugie import __version__
+
+
+logger = logging.getLogger(__name__)
+
+
+class Logger:
+    def log(self, level, message):
+        logger.log(level, message)
+
+    def info(self, message):
+        logger.info(message)
+
+
+class ImportPluginsError(Exception):
+    """Raised when an error occurs during plugin import."""
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+class ImportEngine:
+    """
+    The import engine shared by the importers of all the versions of the
+    export file format. The importer of a version subclasses it, and only
+    overrides what its format does differently, so the optimizations of the
+    engine cover every supported version.
+    """
+    def __init__(self, logger=None, data=None):
+        self.logger = logger or Logger()
+        self.version = __version__
+        self.importer_method_map = ImporterMethodMap()
+        self.method_map = self.importer_method_map.method_map
+        self.prefetch_map = self.importer_method_map.prefetch_map
+        config = Config()
+        self.dummy_plugins = config.get_dummy_plugins_source()
+        self.dummy_plugins_target = config.get_dummy_plugins_target()
+        self.suppress_signals = config.get_suppress_plugin_signals()
+        self.staged_imports = config.get_staged_imports()
+        self.data = data
+        self.staging_placeholder = None
+        # The created plugins that still have children to create, by source
+        # ID, so the memory of an import does not grow with its size.
+        self.plugin_map = {}
+        self.remaining_children = {}
+        self.created_count = 0
+        self.type_plans = {}
+        # The IDs of the created plugins by language, until their transaction
+        # commits and until they are invalidated.
+        self.pending_plugin_ids = {}
+        self.committed_plugin_ids = {}
+        self.resolver = ResolutionCache(using=(data or {}).get('using'))
+        self.metrics = get_metrics('import', (data or {}).get('using'))
+        self.memory = (data or {}).get('memory') or get_memory_tracker('import')
+
+    @property
+    def placeholder(self):
+        return self.data.get('placeholder')
+
+    @property
+    def root_target_plugin(self):
+        return self.data.get('plugin')
+
+    @property
+    def using(self):
+        return self.data.get('using')
+
+    @property
+    def cancel_token(self):
+        return self.data.get('cancel_token')
+
+    @property
+    def defer_invalidation(self):
+        return self.data.get('defer_invalidation', False)
+
+    @property
+    def staged(self):
+        return self.data.get('staging', self.staged_imports)
+
+    @property
+    def imported_plugins(self):
+        try:
+            return self.data.get("import_data").get("all_plugins")
+        except Exception as e:
+            msg = f"Failed to get all plugins from import data: {e}"
+            self.logger.info(msg)
+            raise ImportPluginsError(msg)
+
+    def import_plugins_to_target(self):
+        staged = self.staged
+        if staged and in_caller_transaction(self.using):
+            self.logger.info(
+                "The import runs in a transaction of its caller, which holds the locks of the target "
+                "until it commits, so it is not staged."
+            )
+            staged = False
+
+        if staged:
+            self.import_plugins_staged(self.get_sorted_plugins())
+        else:
+            self.import_plugins(self.get_sorted_plugins())
+        self.report()
+
+    def report(self):
+        """
+        Report the metrics and log the method timings of the import since the
+        last report, and log its peak memory.
+        """
+        self.metrics.report()
+        self.importer_method_map.report_method_timings()
+        self.memory.report()
+
+    def get_sorted_plugins(self):
+        """
+        Get the imported plugins in the order they are created, from the plan
+        made while validating the import file if there is one.
+        """
+        plan = self.data.get('import_plan')
+        if plan is None:
+            plan = build_import_plan(self.imported_plugins)
+        return plan.plugins
+
+    def plan_import(self):
+        """
+        Dry run of the import: validate the plugins and count what the import
+        would create, without touching the database.
+        """
+        return plan_import(self)
+
+    def resume(self, plugins, created_plugin_ids):
+        """
+        Resume an import from a checkpoint: map the plugins created by the
+        previous runs that still have children to create, and get the plugins
+        left to create.
+
+        :param plugins: list of the records of the import plan
+        :param created_plugin_ids: dict, mapping the source IDs of the created
+        plugins to their IDs
+
+        :return: list of the records left to create
+        """
+        pending = [record for record in plugins if record.source_id not in created_plugin_ids]
+        remaining_children = {}
+        for record in pending:
+            if record.parent_id in created_plugin_ids:
+                remaining_children[record.parent_id] = remaining_children.get(record.parent_id, 0) + 1
+
+        with use_database(self.using):
+            parents = CMSPlugin.objects.in_bulk([created_plugin_ids[source_id] for source_id in remaining_children])
+        for source_id, count in remaining_children.items():
+            self.plugin_map[source_id] = parents[created_plugin_ids[source_id]]
+            self.remaining_children[source_id] = count
+        self.created_count += len(created_plugin_ids)
+        return pending
+
+    def import_plugins(self, plugins):
+        """
+        Import the records of an import plan in the given order, e.g. one
+        batch of a stream of plugins. Parents must come before their children,
+        and the plugins created by previous calls are kept as possible parents
+        until their last child is created.
+
+        The receivers of the save signals wrapped with `skip_during_import`
+        are skipped if `suppress_plugin_signals` is on, and the placeholder is
+        invalidated once per language when the transaction commits, or by
+        `invalidate` if the importer data sets 'defer_invalidation'.
+
+        :return: dict, mapping the source IDs of the records to the IDs of
+        the created plugins
+        """
+        created_plugin_ids = self._build_plugin_tree(plugins)
+        pending_plugin_ids, self.pending_plugin_ids = self.pending_plugin_ids, {}
+        transaction.on_commit(partial(self._on_commit, pending_plugin_ids), using=self.using)
+        return created_plugin_ids
+
+    def import_plugins_staged(self, plugins):
+        """
+        Import the records of an import plan into a hidden staging placeholder,
+        then attach the plugin tree to the target in a second, short
+        transaction. The target placeholder is only locked, and its pages only
+        invalidated, while the tree is attached, however big the import is.
+
+        The plugins are validated against the target as for `import_plugins`.
+        If the import fails, the staging placeholder is deleted and the target
+        is left untouched.
+        """
+        with use_database(self.using):
+            self.staging_placeholder = create_staging_placeholder()
+        try:
+            with transaction.atomic(using=self.using):
+                created_plugin_ids = self._build_plugin_tree(plugins)
+            with use_database(self.using), transaction.atomic(using=self.using), self.metrics.phase('attach'):
+                attach_staged_plugins(self.staging_placeholder, self.placeholder, self.root_target_plugin)
+        except Exception:
+            self.pending_plugin_ids = {}
+            with use_database(self.using):
+                discard_staging_placeholder(self.staging_placeholder)
+            raise
+        finally:
+            self.staging_placeholder = None
+
+        pending_plugin_ids, self.pending_plugin_ids = self.pending_plugin_ids, {}
+        transaction.on_commit(partial(self._on_commit, pending_plugin_ids), using=self.using)
+        return created_plugin_ids
+
+    def invalidate(self):
+        """
+        Invalidate the target placeholder once per language for the plugins
+        committed since the last invalidation.
+        """
+        committed_plugin_ids, self.committed_plugin_ids = self.committed_plugin_ids, {}
+        with use_database(self.using):
+            for language, plugin_ids in committed_plugin_ids.items():
+                invalidate_placeholder(self.placeholder, language, plugin_ids)
+
+    def _on_commit(self, pending_plugin_ids):
+        for language, plugin_ids in pending_plugin_ids.items():
+            self.committed_plugin_ids.setdefault(language, []).extend(plugin_ids)
+        if not self.defer_invalidation:
+            self.invalidate()
+
+    def _prefetch(self, plugins):
+        """
+        Call the prefetch methods of the deserializers with the values of
+        their types in the plugins, so they can fill the resolution cache
+        in one query per model.
+        """
+        if not self.prefetch_map:
+            return
+
+        values = {}
+        for record in plugins:
+            for field_value in record.fields.values():
+                if is_special_field(field_value) and field_value['_type'] in self.prefetch_map:
+                    values.setdefault(field_value['_type'], []).append(field_value)
+
+        for value_type, type_values in values.items():
+            self.prefetch_map[value_type](type_values, self.resolver)
+
+    def _build_plugin_tree(self, plugins):
+        with use_database(self.using):
+            # The plugin contexts are built along with the plugins, in the
+            # create phase. Only the prefetch of related objects comes first.
+            with self.memory.phase('prefetch') if self.prefetch_map else nullcontext():
+                self._prefetch(plugins)
+            with suppress_plugin_signals() if self.suppress_signals else nullcontext(), \
+                    self.metrics.phase('create'), self.memory.phase('create'):
+                return self._create_plugin_tree(plugins)
+
+    def _create_plugin_tree(self, sorted_plugins):
+        cancel_token = self.cancel_token
+        created_plugin_ids = {}
+        for record in sorted_plugins:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            plugin_context = self._create_plugin_context_from_record(record)
+            new_plugin = self._create_plugin_from_context(plugin_context)
+            self._update_plugin_map(plugin_context, new_plugin)
+            created_plugin_ids[record.source_id] = new_plugin.pk
+        return created_plugin_ids
+
+    def _update_plugin_map(self, plugin_context, new_plugin):
+        record = plugin_context.record
+        if not plugin_context.is_root_plugin:
+            self._child_created(record.parent_id)
+        # Plugins without children are never parents, and plugins with an
+        # unknown number of children are kept to the end.
+        if record.child_count != 0:
+            self.plugin_map[record.source_id] = new_plugin
+            if record.child_count:
+                self.remaining_children[record.source_id] = record.child_count
+        self.created_count += 1
+        self.pending_plugin_ids.setdefault(new_plugin.language, []).append(new_plugin.pk)
+        if self.metrics.enabled:
+            self.metrics.increment(f'plugins_created.{new_plugin.plugin_type}')
+
+    def _child_created(self, parent_id):
+        """
+        Forget a parent plugin once its last child is created.
+        """
+        remaining = self.remaining_children.get(parent_id)
+        if remaining is None:
+            return
+        if remaining > 1:
+            self.remaining_children[parent_id] = remaining - 1
+        else:
+            del self.remaining_children[parent_id]
+            del self.plugin_map[parent_id]
+
+    def _create_plugin_context_from_record(self, record):
+        return PluginContext(
+            record,
+            self.staging_placeholder or self.placeholder,
+            self.plugin_map,
+            self.root_target_plugin,
+            self.dummy_plugins_target,
+            staged=self.staging_placeholder is not None,
+        )
+
+    def _create_plugin_from_context(self, plugin_context):
+        if self._is_dummy_plugin(plugin_context):
+            return plugin_context.create_dummy_plugin()
+        return plugin_context.create_plugin(self.method_map, self.get_type_plan(plugin_context), self.metrics)
+
+    def get_type_plan(self, plugin_context):
+        """
+        Get the deserialization plan of the plugin type of a plugin, compiled
+        from the first plugin of the type.
+        """
+        type_plan = self.type_plans.get(plugin_context.plugin_type)
+        if type_plan is None:
+            type_plan = self.type_plans[plugin_context.plugin_type] = plugin_context.get_type_plan(
+                self.method_map, self.resolver)
+        return type_plan
+
+    def _is_dummy_plugin(self, plugin_context):
+        return plugin_context.plugin_type in self.dummy_plugins
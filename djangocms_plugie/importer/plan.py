@@ -0,0 +1,113 @@
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class PluginRecord:
+    """
+    A plugin of an import file, split once into the meta values the importer
+    needs and the fields of the plugin itself.
+
+    Imports can hold tens of thousands of records, so they have no instance
+    dict, their IDs are integers and their plugin types and languages are
+    interned strings, shared by all the records of the same type. Their
+    fields are the dict of the plugin in the import data, with its 'meta',
+    rather than a copy of it, as the import data is kept along with the plan.
+
+    The import plan sets the number of children of each record, so the
+    importer can forget a created plugin once its last child is created. It
+    is None while unknown, and the created plugin is then kept to the end.
+    """
+    __slots__ = ('source_id', 'parent_id', 'position', 'plugin_type', 'language', 'fields', 'child_count')
+
+    def __init__(self, source_id, parent_id, position, plugin_type, language, fields, child_count=None):
+        self.source_id = source_id
+        self.parent_id = parent_id
+        self.position = position
+        self.plugin_type = plugin_type
+        self.language = language
+        self.fields = fields
+        self.child_count = child_count
+
+    @classmethod
+    def from_plugin_fields(cls, plugin_fields: Dict[str, Any]) -> 'PluginRecord':
+        """
+        Build the record of a plugin from its fields in the import file.
+
+        :param plugin_fields: dict, the fields of the plugin, with its 'meta',
+        shared with the record
+
+        :return: PluginRecord object
+
+        Raises:
+            ValueError: If the IDs or the position of the plugin are not integers.
+        """
+        meta = plugin_fields["meta"]
+        parent_id = meta["parent"]
+        return cls(
+            source_id=int(meta["id"]),
+            parent_id=None if parent_id is None else int(parent_id),
+            position=int(meta.get("position") or 0),
+            plugin_type=sys.intern(meta["plugin_type"]),
+            language=sys.intern(meta.get("language", 'en')),
+            fields=plugin_fields,
+        )
+
+    def __repr__(self):
+        return f"<PluginRecord {self.source_id} ({self.plugin_type})>"
+
+
+class ImportPlan:
+    """
+    The plugins of an import file, validated and in the order they are
+    created: every plugin comes after its parent, and the children of a
+    parent come in the order of their positions.
+    """
+    def __init__(self, plugins: List[PluginRecord]):
+        self.plugins = plugins
+
+    @classmethod
+    def from_records(cls, records: List[PluginRecord], child_counts: Optional[Dict[int, int]] = None) -> 'ImportPlan':
+        """
+        Order the records in creation order, and count the children of each
+        one. Plugins whose parent is not in the records are the roots of the
+        imported tree.
+
+        :param records: list of PluginRecord objects, in any order
+        :param child_counts: dict, the number of children of each plugin by
+        source ID, for records that are one chunk of a bigger tree, whose
+        children may come in later chunks. By default, the children are
+        counted in the records
+
+        :return: ImportPlan object
+        """
+        source_ids = {record.source_id for record in records}
+        children = defaultdict(list)
+        roots = []
+
+        for record in records:
+            if record.parent_id in source_ids:
+                children[record.parent_id].append(record)
+            else:
+                roots.append(record)
+
+        plugins = sorted(roots, key=lambda record: record.position)
+        # Appending to the list while walking it gives a breadth-first order.
+        for record in plugins:
+            record_children = sorted(children.pop(record.source_id, ()), key=lambda child: child.position)
+            plugins.extend(record_children)
+            if child_counts is None:
+                record.child_count = len(record_children)
+            else:
+                record.child_count = child_counts.get(record.source_id)
+
+        if len(plugins) != len(records):
+            raise ValueError("the parents of some plugins form a cycle")
+
+        return cls(plugins)
+
+    def __iter__(self) -> Iterator[PluginRecord]:
+        return iter(self.plugins)
+
+    def __len__(self) -> int:
+        return len(self.plugins)
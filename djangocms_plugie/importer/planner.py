@@ -0,0 +1,132 @@
+from collections import Counter
+from typing import Any, Dict
+from cms.models import CMSPlugin
+from cms.plugin_pool import plugin_pool
+from djangocms_plugie.importer.plugin_context import PluginContext
+from djangocms_plugie.importer.type_plan import RELATED_MANAGER_TYPES
+from djangocms_plugie.importer.utils import is_special_field
+
+
+class PlannedPlugin:
+    """
+    Stand-in for a plugin the import would create, used as the parent of its
+    children while planning, so the child rules can be checked without
+    creating anything.
+    """
+    def __init__(self, plugin_type):
+        self.plugin_type = plugin_type
+
+    def get_plugin_class(self):
+        return plugin_pool.get_plugin(self.plugin_type)
+
+
+def plan_import(importer) -> Dict[str, Any]:
+    """
+    Plan the import of the importer data without touching the database. The
+    plugins are walked as for a real import: a PluginContext is built for
+    each of them, the parent and child rules are validated, the plugin types
+    are resolved and the deserializer of every special field is looked up,
+    but no plugin is created and no deserializer is called.
+
+    The errors a real import would raise for the plugins are raised as well.
+
+    :param importer: Importer object
+
+    :return: dict, the number of plugins, per type as well, of related rows
+    and the expected number of row writes
+    """
+    plugin_map = {}
+    plugins_per_type = Counter()
+    related_rows = 0
+    row_writes = 0
+
+    for record in importer.get_sorted_plugins():
+        plugin_context = PluginContext(
+            record, importer.placeholder, plugin_map, importer.root_target_plugin, importer.dummy_plugins_target)
+
+        if importer._is_dummy_plugin(plugin_context):
+            plugin_type = plugin_context.dummy_plugins_target
+            relation_fields = {}
+            row_writes += plan_plugin_rows(plugin_context, plugin_type)
+        else:
+            plugin_type = plugin_context.plugin_type
+            non_relation_fields, relation_fields = plugin_context._filter_fields(importer.get_type_plan(plugin_context))
+            related_rows += plan_special_plugin_fields(non_relation_fields, importer.method_map)
+            related_rows += plan_special_plugin_fields(relation_fields, importer.method_map)
+            row_writes += plan_plugin_rows(plugin_context, plugin_type, bool(relation_fields))
+
+        plugins_per_type[plugin_type] += 1
+        plugin_map[plugin_context.source_id] = PlannedPlugin(plugin_type)
+
+    return {
+        'plugins': sum(plugins_per_type.values()),
+        'plugins_per_type': dict(plugins_per_type),
+        'related_rows': related_rows,
+        'row_writes': row_writes + related_rows,
+    }
+
+
+def plan_plugin_rows(plugin_context, plugin_type, has_relation_fields=False) -> int:
+    """
+    Get the number of row writes of `add_plugin` and the importer for a
+    plugin: the CMSPlugin row is inserted, then saved with the plugin model,
+    which inserts its own row too if it is not CMSPlugin. A plugin added
+    under a parent is moved there, which updates its path and position and
+    the number of children of the parent.
+
+    :param plugin_context: PluginContext object
+    :param plugin_type: str, the type of the created plugin
+    :param has_relation_fields: bool, True if the plugin is saved again to set
+    its relation fields
+
+    :return: int, the number of row writes
+    """
+    plugin_model = plugin_pool.get_plugin(plugin_type).model
+    row_writes = 2
+
+    if plugin_model is not CMSPlugin:
+        row_writes += 1
+    if plugin_context.target_plugin is not None:
+        row_writes += 3
+    if has_relation_fields:
+        row_writes += 1 if plugin_model is CMSPlugin else 2
+
+    return row_writes
+
+
+def plan_special_plugin_fields(plugin_fields, method_map) -> int:
+    """
+    Check that a deserializer exists for every special field, including the
+    fields of the related instances, without calling it.
+
+    :param plugin_fields: dict, the fields of a plugin or a related instance
+    :param method_map: dict, the deserializers by type name
+
+    :return: int, the number of related rows the deserializers would write
+
+    Raises:
+        ValueError: If no deserializer exists for a special field.
+    """
+    related_rows = 0
+
+    for field_value in plugin_fields.values():
+        if not is_special_field(field_value):
+            continue
+
+        value_type = field_value['_type']
+        if method_map.get(value_type) is None:
+            raise ValueError(f'No deserialize method found for type "{value_type}"')
+
+        if value_type not in RELATED_MANAGER_TYPES:
+            continue
+
+        items = field_value.get('_list') or []
+        related_rows += len(items)
+        for item in items:
+            if value_type == 'relatedmanager':
+                fields = {key: value for key, value in item.items() if key != 'meta'}
+            else:
+                fields = {'key': item}
+            related_rows += plan_special_plugin_fields(fields, method_map)
+
+    return related_rows
@@ -2,12 +2,15 @@ import logging
 from cms.api import add_plugin, _verify_plugin_type
 from django.db import transaction
 from cms.plugin_pool import plugin_pool
-from djangocms_plugie.importer.version0.utils import handle_special_plugin_fields
+from djangocms_plugie.importer.type_plan import TypePlan
 from djangocms_plugie.config import Config
+from djangocms_plugie.db import get_current_database
+from djangocms_plugie.metrics import NULL_METRICS
 
 logger = logging.getLogger(__name__)
 ALL_CHILDREN_ALLOWED = object()
 ALL_PARENTS_ALLOWED = object()
+_UNSET = object()
 
 
 class InvalidPluginError(Exception):
@@ -25,12 +28,25 @@ class PluginCreationError(Exception):
 
 
 class PluginContext:
-    def __init__(self, plugin_fields, placeholder, plugin_map, root_target_plugin=None):
+    __slots__ = (
+        'placeholder', 'record', 'plugin_type', 'is_root_plugin', 'target_plugin', 'dummy_plugins_target', 'staged'
+    )
+
+    def __init__(self, record, placeholder, plugin_map, root_target_plugin=None, dummy_plugins_target=_UNSET,
+                 staged=False):
         self.placeholder = placeholder
-        self.plugin_fields = plugin_fields
+        # A staged root plugin is validated against the target plugin, but
+        # created as a root of the staging placeholder, until it is attached.
+        self.staged = staged
+        self.record = record
+        self.plugin_type = record.plugin_type
         self.is_root_plugin = self._is_root_plugin(plugin_map)
         self.target_plugin = self._get_target_plugin(root_target_plugin, plugin_map)
-        self.dummy_plugins_target = Config().get_dummy_plugins_target()
+        # The importer reads the config once for all the plugins and passes
+        # its target, which is None when there is no dummy plugin target.
+        if dummy_plugins_target is _UNSET:
+            dummy_plugins_target = Config().get_dummy_plugins_target()
+        self.dummy_plugins_target = dummy_plugins_target
         self._validate()
 
     @property
@@ -44,35 +60,20 @@ class PluginContext:
                 f"A plugin doesn't exist. Plugin: {self.plugin_type}")
 
     @property
-    def plugin_type(self):
-        return self.meta.get("plugin_type")
-
-    @plugin_type.setter
-    def plugin_type(self, plugin_type):
-        self.meta['plugin_type'] = plugin_type
-
-    @property
-    def meta(self):
-        return self.plugin_fields.get("meta")
-
-    @property
-    def non_meta_fields(self):
-        return {
-            key: value for key, value in self.plugin_fields.items()
-            if key != "meta"
-        }
+    def fields(self):
+        return self.record.fields
 
     @property
     def parent_id(self):
-        return self.meta.get("parent")
+        return self.record.parent_id
 
     @property
     def position(self):
-        return self.meta.get("position")
+        return self.record.position
 
     @property
     def source_id(self):
-        return self.meta.get("id")
+        return self.record.source_id
 
     def _get_target_plugin(self, root_target_plugin, plugin_map):
         return root_target_plugin if self.is_root_plugin else plugin_map[self.parent_id]
@@ -142,57 +143,58 @@ class PluginContext:
             raise PluginCreationError(msg)
         return self._add_plugin()
 
-    def create_plugin(self, method_map):
+    def create_plugin(self, method_map, type_plan=None, metrics=NULL_METRICS):
         """
         Creates a plugin instance from the given fields and returns it.
         First, the non-relation fields are added to the plugin instance. Then, the plugin is updated 
         with the relation fields, since it requires the plugin to be created first to establish the relation.
 
+        The importer passes the deserialization plan it compiled for the plugin type, shared by all the
+        plugins of the type, and its metrics, which time the relation pass.
         """
-        non_relation_fields, relation_fields = self._filter_fields()
-        processed_initial_fields = handle_special_plugin_fields(non_relation_fields, None, method_map)
+        if type_plan is None:
+            type_plan = self.get_type_plan(method_map)
+        non_relation_fields, relation_fields = type_plan.split_fields(self.fields)
+        processed_initial_fields = type_plan.deserialize(non_relation_fields, None)
 
-        with transaction.atomic():
+        # Inside the transaction of the import, no savepoint is needed per plugin.
+        with transaction.atomic(using=get_current_database(), savepoint=False):
             new_plugin = self._add_plugin(**processed_initial_fields)
 
             if relation_fields:
-                new_plugin = self._update_new_plugin(new_plugin, relation_fields, method_map)
+                with metrics.phase('relation'):
+                    new_plugin = self._update_new_plugin(new_plugin, relation_fields, type_plan)
 
             return new_plugin
 
-    def _filter_fields(self):
+    def get_type_plan(self, method_map, resolver=None):
+        """
+        Compiles a new deserialization plan for the plugin type.
+        """
+        return TypePlan(self.plugin_type, self.plugin_model, method_map, resolver)
+
+    def _filter_fields(self, type_plan=None):
         """
         Filters the fields from the import file between relation and non-relation fields.
         Relation fields are handled after the plugin creation to ensure the relation can be made.
 
         - Fields that do not exist in the plugin are logged and ignored.
         """
-        non_relation_fields = {}
-        relation_fields = {}
-        model_existing_fields = [field.name for field in self.plugin_model._meta.get_fields(include_parents=False)]
-        non_meta_fields = self.non_meta_fields.items()
-
-        for key, value in non_meta_fields:
-            if self._is_relation_field(value):
-                relation_fields[key] = value
-                continue
-            if not self._key_exists_in_model(key, model_existing_fields):
-                logger.warning(f"Field '{key}' does not exist in plugin type {self.plugin_type} and will be ignored.")
-                continue
-            non_relation_fields[key] = value
-        return non_relation_fields, relation_fields
+        if type_plan is None:
+            type_plan = self.get_type_plan({})
+        return type_plan.split_fields(self.fields)
 
     def _add_plugin(self, **kwargs):
         """
         Adds a plugin to the placeholder / target plugin and returns it.
         """
-        language = self.meta.get("language", 'en')
+        language = self.record.language
         try:
             return add_plugin(
                 placeholder=self.placeholder,
                 plugin_type=self.plugin_type,
                 language=language,
-                target=self.target_plugin,
+                target=None if self.staged and self.is_root_plugin else self.target_plugin,
                 **kwargs
             )
         except Exception as e:
@@ -200,26 +202,8 @@ class PluginContext:
             logger.exception(msg)
             raise PluginCreationError(msg)
 
-    def _is_relation_field(self, value):
-        """
-        Checks if the given value is a related manager.
-
-        Related managers are not needed for the creation of the instance and 
-        are handled after the instance creation to ensure a relation can be made.
-        """
-        related_types = ['relatedmanager', 'manyrelatedmanager']
-        return isinstance(value, dict) and value.get('_type') in related_types
-
-    def _key_exists_in_model(self, key, model_fields):
-        """
-        Checks if the key is present in the model fields.
-
-        Extra fields that are not present in the model fields are ignored.
-        """
-        return key in model_fields
-
-    def _update_new_plugin(self, instance, fields, method_map):
-        deserialized_fields = handle_special_plugin_fields(fields, instance.id, method_map)
+    def _update_new_plugin(self, instance, fields, type_plan):
+        deserialized_fields = type_plan.deserialize(fields, instance.id)
         updated_instance = self._update_plugin_fields(instance, deserialized_fields)
         return updated_instance
 
@@ -0,0 +1,77 @@
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple, Type
+from django.db import models
+
+
+class ResolutionCache:
+    """
+    Import-scoped cache of the objects that deserializers look up by a key,
+    e.g. the filer images or the pages referenced by the plugins. Each object
+    is fetched once per import, however many plugins reference it, and
+    missing objects are cached as None.
+
+    The importer passes it to the deserializers that accept it, as the
+    `_resolver` keyword argument:
+
+        @staticmethod
+        def deserialize(**kwargs):
+            return kwargs['_resolver'].get(Image, kwargs['_id'])
+
+    A deserializer class can also define a `prefetch(values, resolver)`
+    static method, called with the exported values of its types before a
+    batch of plugins is created, to fetch all of them in one query:
+
+        @staticmethod
+        def prefetch(values, resolver):
+            resolver.prefetch(Image, [value['_id'] for value in values])
+    """
+    def __init__(self, using: Optional[str] = None):
+        self.using = using
+        self._cache: Dict[Tuple[Type[models.Model], str], Dict[Hashable, Any]] = {}
+
+    def get(self, model: Type[models.Model], key: Hashable, field: str = 'pk') -> Optional[models.Model]:
+        """
+        Get the object of a model with the given key.
+
+        :param model: the model class
+        :param key: the value of the field to look up
+        :param field: str, the name of the field, e.g. a natural key. If several
+        objects have the key, the first one is returned.
+
+        :return: the object, or None if it does not exist
+        """
+        cache = self._get_cache(model, field)
+        if key not in cache:
+            cache[key] = self._get_queryset(model).filter(**{field: key}).order_by('pk').first()
+        return cache[key]
+
+    def prefetch(self, model: Type[models.Model], keys: Iterable[Hashable], field: str = 'pk') -> None:
+        """
+        Fetch the objects of a model with the given keys in one query, except
+        the ones already cached.
+
+        :param model: the model class
+        :param keys: the values of the field to look up
+        :param field: str, the name of the field
+        """
+        cache = self._get_cache(model, field)
+        missing = {key for key in keys if key not in cache}
+        if not missing:
+            return
+
+        if field == 'pk':
+            field = model._meta.pk.name
+        attname = model._meta.get_field(field).attname
+        objects = {}
+        for obj in self._get_queryset(model).filter(**{f'{field}__in': missing}).order_by('pk'):
+            objects.setdefault(getattr(obj, attname), obj)
+
+        for key in missing:
+            cache[key] = objects.get(key)
+
+    def _get_cache(self, model, field) -> Dict[Hashable, Any]:
+        if field == 'pk':
+            field = model._meta.pk.name
+        return self._cache.setdefault((model, field), {})
+
+    def _get_queryset(self, model):
+        return model._default_manager.using(self.using) if self.using else model._default_manager.all()
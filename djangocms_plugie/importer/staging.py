@@ -0,0 +1,147 @@
+import logging
+import time
+import uuid
+from typing import Optional
+from cms.models import CMSPlugin, Placeholder
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, F
+from treebeard.mp_tree import MP_Node
+from djangocms_plugie.config import Config
+
+logger = logging.getLogger(__name__)
+
+STAGING_SLOT_PREFIX = 'plugie-staging-'
+
+
+def create_staging_placeholder() -> Placeholder:
+    """
+    Create the hidden placeholder a staged import builds its plugin tree in.
+    It belongs to no page or static placeholder, so no page shows it, and
+    the rows the import locks are not the ones of a live placeholder. Its
+    slot holds its creation time, so it can be told apart from the ones of
+    running imports if it is left behind.
+
+    :return: Placeholder object
+    """
+    return Placeholder.objects.create(slot=f"{STAGING_SLOT_PREFIX}{int(time.time())}-{uuid.uuid4().hex}")
+
+
+def in_caller_transaction(using: Optional[str] = None) -> bool:
+    """
+    Check whether the caller of an import already opened a transaction on its
+    database. Staging does not shorten the locks of such an import, which
+    are held until the transaction of the caller commits. As for durable
+    atomic blocks, the transactions of Django test cases do not count.
+
+    :param using: str, the database alias, or None for the default database
+
+    :return: bool, True if the import runs in a transaction of its caller
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    return connection.in_atomic_block and not getattr(connection.atomic_blocks[-1], '_from_testcase', False)
+
+
+def attach_staged_plugins(
+        staging: Placeholder,
+        placeholder: Placeholder,
+        target_plugin: Optional[CMSPlugin] = None
+) -> int:
+    """
+    Attach the plugin tree built in a staging placeholder to the target
+    placeholder, or to the target plugin as its last children, and delete the
+    staging placeholder. Run it in a transaction: it only rewrites the
+    positions of the root plugins of the tree, their paths if they move under
+    a target plugin, and the placeholder of all of them.
+
+    :param staging: Placeholder object, the staging placeholder
+    :param placeholder: Placeholder object, the target placeholder
+    :param target_plugin: CMSPlugin object, the target plugin, if any
+
+    :return: int, the number of attached plugins
+    """
+    staged_plugins = CMSPlugin.objects.filter(placeholder=staging)
+    roots = list(staged_plugins.filter(parent__isnull=True).order_by('path'))
+
+    if target_plugin is None:
+        siblings = CMSPlugin.objects.filter(placeholder=placeholder, parent__isnull=True)
+    else:
+        siblings = CMSPlugin.objects.filter(parent=target_plugin)
+    offsets = dict(siblings.order_by().values_list('language').annotate(count=Count('pk')))
+
+    if target_plugin is not None:
+        # The root plugins of a placeholder are root nodes of the tree as
+        # well, so their paths only change when they move under a plugin.
+        for root in roots:
+            MP_Node.move(root, target_plugin, 'last-child')
+
+    root_ids = {}
+    for root in roots:
+        root_ids.setdefault(root.language, []).append(root.pk)
+    for language, language_root_ids in root_ids.items():
+        CMSPlugin.objects.filter(pk__in=language_root_ids).update(
+            parent=target_plugin,
+            position=F('position') + offsets.get(language, 0),
+        )
+    count = staged_plugins.update(placeholder=placeholder)
+    staging.delete()
+    return count
+
+
+def discard_staging_placeholder(staging: Placeholder) -> bool:
+    """
+    Delete a staging placeholder and the plugins built in it, e.g. after the
+    import failed. A staging placeholder that cannot be deleted is logged
+    and left to `delete_stale_staging_placeholders`.
+
+    :param staging: Placeholder object, the staging placeholder
+
+    :return: bool, True if it was deleted
+    """
+    try:
+        CMSPlugin.objects.filter(placeholder=staging, parent__isnull=True).delete()
+        staging.delete()
+    except Exception as e:
+        logger.exception(f"Failed to delete the staging placeholder {staging.slot}: {e}")
+        return False
+    return True
+
+
+def get_staging_created_at(staging: Placeholder) -> Optional[int]:
+    """
+    Get the creation time of a staging placeholder from its slot.
+
+    :param staging: Placeholder object, the staging placeholder
+
+    :return: int, the creation time as a Unix timestamp, or None if the slot
+    does not hold one
+    """
+    created_at, _, _ = staging.slot[len(STAGING_SLOT_PREFIX):].partition('-')
+    try:
+        return int(created_at)
+    except ValueError:
+        return None
+
+
+def delete_stale_staging_placeholders(max_age: Optional[float] = None) -> int:
+    """
+    Delete the staging placeholders left behind by imports whose process
+    died mid-import, with the plugins built in them. The ones younger than
+    `max_age` may belong to running imports and are kept.
+
+    :param max_age: float, the age in seconds above which a staging
+    placeholder is deleted. Default is the staging timeout of the config
+
+    :return: int, the number of deleted staging placeholders
+    """
+    if max_age is None:
+        max_age = Config().get_staging_timeout()
+    stale_before = time.time() - max_age
+
+    deleted = 0
+    for staging in Placeholder.objects.filter(slot__startswith=STAGING_SLOT_PREFIX):
+        created_at = get_staging_created_at(staging)
+        if created_at is not None and created_at > stale_before:
+            continue
+        if discard_staging_placeholder(staging):
+            deleted += 1
+    return deleted
@@ -0,0 +1,144 @@
+import logging
+from djangocms_plugie.importer.utils import accepts_resolver, is_special_field
+
+logger = logging.getLogger(__name__)
+
+RELATED_MANAGER_TYPES = ('relatedmanager', 'manyrelatedmanager')
+META_KEY = 'meta'
+
+
+class FieldPlan:
+    """
+    How a field of a plugin type is deserialized: kept as it is, deserialized
+    by the method of its special type, or dropped if the plugin model has no
+    such field. The plan holds for the values with the same shape as the one
+    it was compiled from.
+    """
+    __slots__ = ('value_type', 'value_keys', 'kwarg_keys', 'deserializer', 'accepts_resolver', 'is_relation', 'is_known')
+
+    def __init__(self, value_type=None, value_keys=None, kwarg_keys=(), deserializer=None,
+                 accepts_resolver=False, is_relation=False, is_known=True):
+        self.value_type = value_type
+        self.value_keys = value_keys
+        self.kwarg_keys = kwarg_keys
+        self.deserializer = deserializer
+        self.accepts_resolver = accepts_resolver
+        self.is_relation = is_relation
+        self.is_known = is_known
+
+    def matches(self, value) -> bool:
+        """
+        Check that a value has the shape the plan was compiled from.
+        """
+        if self.value_type is None:
+            return not is_special_field(value)
+        return isinstance(value, dict) and value.keys() == self.value_keys and value['_type'] == self.value_type
+
+
+class TypePlan:
+    """
+    Deserialization plan of the plugins of one type, compiled field by field
+    from the first plugin of the type and followed by the next ones, so the
+    model fields, the special types, the deserializers and the extra kwargs
+    of the fields are looked up once per import rather than once per plugin.
+
+    A value that does not have the shape of the plan of its field, e.g. a
+    None where the first plugin had a special value, recompiles the plan of
+    the field.
+    """
+    def __init__(self, plugin_type, plugin_model, method_map, resolver=None):
+        self.plugin_type = plugin_type
+        self.model_fields = frozenset(field.name for field in plugin_model._meta.get_fields(include_parents=False))
+        self.method_map = method_map
+        self.resolver = resolver
+        self.fields = {}
+
+    def split_fields(self, fields):
+        """
+        Split the fields of a plugin between relation and non-relation fields,
+        dropping its 'meta' and the fields the plugin model does not have.
+        Relation fields are set after the plugin creation, so the relation can
+        be made.
+
+        :param fields: dict, the fields of the plugin
+
+        :return: tuple of the non-relation and the relation fields
+        """
+        non_relation_fields = {}
+        relation_fields = {}
+
+        for key, value in fields.items():
+            if key == META_KEY:
+                continue
+            field_plan = self.fields.get(key)
+            if field_plan is None or not field_plan.matches(value):
+                field_plan = self.fields[key] = self._compile_field(key, value)
+
+            if field_plan.is_relation:
+                relation_fields[key] = value
+            elif field_plan.is_known:
+                non_relation_fields[key] = value
+
+        return non_relation_fields, relation_fields
+
+    def deserialize(self, fields, plugin_id):
+        """
+        Deserialize the fields returned by `split_fields`.
+
+        :param fields: dict, the fields to deserialize
+        :param plugin_id: int, ID of the created plugin, or None before its creation
+
+        :return: dict, the deserialized fields
+
+        Raises:
+            ValueError: If no deserializer exists for a special field.
+            NotImplementedError: If the deserializer is not implemented.
+        """
+        deserialized_fields = {}
+
+        for key, value in fields.items():
+            field_plan = self.fields[key]
+            if field_plan.value_type is None:
+                deserialized_fields[key] = value
+                continue
+
+            kwargs = {kwarg_key: value[kwarg_key] for kwarg_key in field_plan.kwarg_keys}
+            kwargs['_plugin_id'] = plugin_id
+            if field_plan.accepts_resolver:
+                kwargs['_resolver'] = self.resolver
+            deserialized_fields[key] = self._call_deserializer(field_plan, kwargs)
+
+        return deserialized_fields
+
+    def _compile_field(self, key, value) -> FieldPlan:
+        if not is_special_field(value):
+            return FieldPlan(is_known=self._is_known(key))
+
+        value_type = value['_type']
+        is_relation = value_type in RELATED_MANAGER_TYPES
+        deserializer = self.method_map.get(value_type)
+        return FieldPlan(
+            value_type=value_type,
+            value_keys=frozenset(value),
+            kwarg_keys=tuple(kwarg_key for kwarg_key in value if kwarg_key.startswith('_') and kwarg_key != '_type'),
+            deserializer=deserializer,
+            accepts_resolver=self.resolver is not None and deserializer is not None and accepts_resolver(deserializer),
+            is_relation=is_relation,
+            is_known=is_relation or self._is_known(key),
+        )
+
+    def _is_known(self, key) -> bool:
+        if key in self.model_fields:
+            return True
+        logger.warning(f"Field '{key}' does not exist in plugin type {self.plugin_type} and will be ignored.")
+        return False
+
+    def _call_deserializer(self, field_plan, kwargs):
+        if field_plan.deserializer is None:
+            raise ValueError(f'No deserialize method found for type "{field_plan.value_type}"')
+        try:
+            return field_plan.deserializer(**kwargs)
+        except NotImplementedError as e:
+            msg = f'Error deserializing type "{field_plan.value_type}": {e}'
+            logger.error(msg)
+            raise NotImplementedError(msg)
@@ -1,9 +1,11 @@
+import inspect
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 
-def handle_special_plugin_fields(plugin_fields, plugin_id, method_map):
+def handle_special_plugin_fields(plugin_fields, plugin_id, method_map, resolver=None):
     fields = {}
     for field_name, field_value in plugin_fields.items():
         if not is_special_field(field_value):
@@ -11,6 +13,8 @@ def handle_special_plugin_fields(plugin_fields, plugin_id, method_map):
             continue
 
         extra_kwargs = extract_extra_kwargs(field_value, plugin_id)
+        if resolver is not None:
+            extra_kwargs['_resolver'] = resolver
         value = get_deserialized_value(field_value, method_map, **extra_kwargs)
         fields[field_name] = value
 
@@ -51,9 +55,34 @@ def get_deserialized_value(field_value, method_map, **kwargs):
     serialize_method = method_map.get(value_type)
     if serialize_method is None:
         raise ValueError(f'No deserialize method found for type "{value_type}"')
+    if '_resolver' in kwargs and not accepts_resolver(serialize_method):
+        kwargs.pop('_resolver')
     try:
         return serialize_method(**kwargs)
     except NotImplementedError as e:
         msg = f'Error deserializing type "{value_type}": {e}'
         logger.error(msg)
         raise NotImplementedError(msg)
+
+
+@lru_cache(maxsize=1024)
+def accepts_resolver(method):
+    """
+    Checks if a deserializer accepts the `_resolver` keyword argument, either
+    by name or through **kwargs. Deserializers written before the resolution
+    cache existed may not.
+
+    Args:
+        method: The deserializer.
+
+    Returns:
+        bool: True if the resolver can be passed to the deserializer.
+    """
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        parameter.kind == parameter.VAR_KEYWORD or parameter.name == '_resolver'
+        for parameter in parameters
+    )
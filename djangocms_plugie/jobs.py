@@ -0,0 +1,534 @@
+import logging
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, Literal, Optional
+from django.core.files import File
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from djangocms_plugie.cancellation import CancellationToken, ImportCancelledError
+from djangocms_plugie.config import Config
+from djangocms_plugie.memory import get_memory_tracker
+from cms.models import CMSPlugin
+from djangocms_plugie.models import ExportJob, ImportJob, ImportJobPlugin
+from djangocms_plugie.utils import get_importer, parse_and_plan_import_file
+
+logger = logging.getLogger(__name__)
+
+CANCEL_POLL_INTERVAL = 1.0
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool running the background jobs of the web process.
+
+    :return: ThreadPoolExecutor object
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=Config().get_job_threads(),
+                thread_name_prefix='plugie-job',
+            )
+    return _executor
+
+
+def enqueue_job(run_job: Callable[[int], Any], job_id: int) -> None:
+    """
+    Run a job in the thread pool once the transaction that created it is
+    committed. With the "worker" runner, the job is left to the plugie_worker
+    management command instead.
+
+    :param run_job: Callable, the function running the job
+    :param job_id: int, ID of the job
+    """
+    if Config().get_job_runner() != 'thread':
+        return
+    transaction.on_commit(lambda: get_executor().submit(run_in_thread, run_job, job_id))
+
+
+def run_in_thread(run_job: Callable[[int], Any], job_id: int) -> None:
+    """
+    Run a job in a thread of the pool, closing the database connection of the
+    thread once it is done.
+
+    :param run_job: Callable, the function running the job
+    :param job_id: int, ID of the job
+    """
+    try:
+        run_job(job_id)
+    except Exception as e:
+        logger.exception(f"Background job {job_id} failed: {e}")
+    finally:
+        connection.close()
+
+
+class ImportJobLostError(Exception):
+    """Raised when a stale import job was resumed by another runner."""
+
+    def __init__(self, message):
+        super().__init__(message)
+
+
+def claim_job(model, job_id: int, **fields) -> bool:
+    """
+    Mark a queued job as running. Only one runner can claim a job.
+
+    :param model: the model of the job
+    :param job_id: int, ID of the job
+    :param fields: other fields of the job to update
+
+    :return: bool, True if the job was claimed
+    """
+    claimed = model.objects.filter(pk=job_id, status=model.STATUS_QUEUED).update(
+        status=model.STATUS_RUNNING,
+        started_at=timezone.now(),
+        **fields
+    )
+    return claimed == 1
+
+
+def finish_job(model, job_id: int, status: str, **fields) -> None:
+    """
+    Mark a running job as finished.
+
+    :param model: the model of the job
+    :param job_id: int, ID of the job
+    :param status: str, the final status of the job
+    :param fields: other fields of the job to update
+    """
+    model.objects.filter(pk=job_id).update(status=status, finished_at=timezone.now(), **fields)
+
+
+class JobCancellationToken(CancellationToken):
+    """
+    Cancellation token of an import job, cancelled once the cancellation of
+    the job is requested, e.g. from the admin. The job is read at most once
+    every `poll_interval` seconds, so checking the token between plugins
+    costs no query most of the time.
+    """
+    def __init__(self, job_id: int, poll_interval: Optional[float] = None):
+        super().__init__()
+        self.job_id = job_id
+        self.poll_interval = CANCEL_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._next_poll = 0.0
+
+    @property
+    def is_cancelled(self) -> bool:
+        if not super().is_cancelled and time.monotonic() >= self._next_poll:
+            self._next_poll = time.monotonic() + self.poll_interval
+            if ImportJob.objects.filter(pk=self.job_id, cancel_requested=True).exists():
+                self.cancel()
+        return super().is_cancelled
+
+
+def create_import_job(data: Dict[str, Any], import_file, user=None) -> ImportJob:
+    """
+    Create an import job for a validated import file and queue it.
+
+    :param data: dict, the cleaned data of the import form
+    :param import_file: the uploaded import file, stored with the job
+    :param user: the user starting the import, if any
+
+    :return: ImportJob object
+    """
+    delete_expired_import_files()
+    target_plugin = data.get("plugin")
+    placeholder = target_plugin.placeholder if target_plugin else data.get("placeholder")
+
+    job = ImportJob.objects.create(
+        placeholder=placeholder,
+        plugin=target_plugin,
+        import_file=import_file,
+        total_plugins=len(data["import_data"]["all_plugins"]),
+        created_by=user,
+    )
+    enqueue_job(run_import_job, job.pk)
+    return job
+
+
+def run_import_job(job_id: int) -> Optional[ImportJob]:
+    """
+    Run a queued import job. The plugins are created in batches, each one in
+    its own transaction along with a checkpoint mapping the source IDs of its
+    plugins to the created ones. A job resumed after a failure starts from the
+    last checkpoint and skips the plugins that were already created.
+
+    A cancelled job rolls back the batch it was creating, and deletes the
+    plugins of the previous batches. With `rollback_cancelled` off in the
+    jobs settings, it keeps them so it can be resumed or cleaned up with
+    `delete_imported_plugins`. A job whose runner died is left running until
+    its heartbeat is stale, and can then be resumed as well.
+
+    :param job_id: int, ID of the job
+
+    :return: ImportJob object, or None if the job was not queued
+    """
+    if not claim_job(ImportJob, job_id, heartbeat_at=timezone.now()):
+        return None
+
+    job = ImportJob.objects.get(pk=job_id)
+    memory = get_memory_tracker('import', f'job {job_id}')
+
+    try:
+        with job.import_file.open('rb') as import_file:
+            import_data, import_plan = parse_and_plan_import_file(import_file, memory)
+
+        importer = get_importer({
+            'plugin': job.plugin,
+            'placeholder': job.placeholder,
+            'import_data': import_data,
+            'import_plan': import_plan,
+            'cancel_token': JobCancellationToken(job_id),
+            'defer_invalidation': True,
+            'memory': memory,
+        })
+        plugins = importer.resume(importer.get_sorted_plugins(), load_checkpoint(job))
+        interval = Config().get_checkpoint_interval()
+
+        try:
+            for start in range(0, len(plugins), interval):
+                batch = plugins[start:start + interval]
+                with transaction.atomic():
+                    created_plugin_ids = importer.import_plugins(batch)
+                    save_checkpoint(job, created_plugin_ids, importer.created_count, memory.as_dict())
+        finally:
+            # The committed batches are kept if the job fails or is cancelled.
+            importer.invalidate()
+            importer.report()
+    except ImportJobLostError as e:
+        # The job belongs to the runner that resumed it now.
+        logger.warning(f"Import job {job_id} stopped: {e}")
+        return None
+    except ImportCancelledError:
+        logger.info(f"Import job {job_id} was cancelled.")
+        finish_job(ImportJob, job_id, ImportJob.STATUS_CANCELLED, memory=memory.as_dict())
+        rollback_cancelled_job(job_id)
+    except Exception as e:
+        logger.exception(f"Import job {job_id} failed: {e}")
+        finish_job(ImportJob, job_id, ImportJob.STATUS_FAILED, error=str(e), memory=memory.as_dict())
+    else:
+        finish_job(ImportJob, job_id, ImportJob.STATUS_DONE, memory=memory.as_dict())
+        delete_import_file(job)
+
+    job.refresh_from_db()
+    return job
+
+
+def load_checkpoint(job: ImportJob) -> Dict[int, int]:
+    """
+    Load the IDs of the plugins created by the previous runs of an import job.
+
+    :param job: ImportJob object
+
+    :return: dict, mapping the source plugin IDs to the IDs of the created plugins
+    """
+    return dict(job.imported_plugins.values_list('source_id', 'plugin_id'))
+
+
+def save_checkpoint(
+        job: ImportJob,
+        created_plugin_ids: Dict[int, int],
+        created_count: int,
+        memory: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Save the plugins created from a batch of an import job, the progress of
+    the job and its heartbeat. Run it in the transaction of the batch.
+
+    :param job: ImportJob object, as claimed by the current run
+    :param created_plugin_ids: dict, mapping the source plugin IDs of the
+    batch to the IDs of the created plugins
+    :param created_count: int, the number of plugins the job created so far
+    :param memory: dict, the peak memory of the phases so far, saved so it is
+    kept if the runner is killed before the job ends
+
+    Raises:
+        ImportJobLostError: If the job was resumed by another runner since
+        the current run claimed it, so the batch must be rolled back.
+    """
+    fields = {'created_plugins': created_count, 'heartbeat_at': timezone.now()}
+    if memory:
+        fields['memory'] = memory
+    saved = ImportJob.objects.filter(pk=job.pk, status=ImportJob.STATUS_RUNNING, started_at=job.started_at).update(
+        **fields
+    )
+    if not saved:
+        raise ImportJobLostError("the job was resumed by another runner, or deleted with its target plugin.")
+    ImportJobPlugin.objects.bulk_create([
+        ImportJobPlugin(job=job, source_id=source_id, plugin_id=plugin_id)
+        for source_id, plugin_id in created_plugin_ids.items()
+    ])
+
+
+def get_stale_filter() -> Q:
+    """
+    Get the filter of the running import jobs whose heartbeat is older than
+    the stale job timeout of the jobs settings, e.g. because their worker
+    was killed.
+
+    :return: Q object
+    """
+    stale_before = timezone.now() - timedelta(seconds=Config().get_stale_job_timeout())
+    return Q(status=ImportJob.STATUS_RUNNING) & (
+        Q(heartbeat_at__lt=stale_before) | Q(heartbeat_at__isnull=True, started_at__lt=stale_before)
+    )
+
+
+def resume_import_job(job_id: int) -> bool:
+    """
+    Queue a failed, cancelled or stale import job again, to resume it from
+    its last checkpoint. Jobs whose import file was deleted cannot be resumed.
+
+    :param job_id: int, ID of the job
+
+    :return: bool, True if the job was queued
+    """
+    resumed = ImportJob.objects.filter(
+        Q(status__in=(ImportJob.STATUS_FAILED, ImportJob.STATUS_CANCELLED)) | get_stale_filter(),
+        pk=job_id,
+    ).exclude(import_file='').update(
+        status=ImportJob.STATUS_QUEUED,
+        cancel_requested=False,
+        error='',
+        started_at=None,
+        finished_at=None,
+    )
+    if resumed:
+        enqueue_job(run_import_job, job_id)
+    return resumed == 1
+
+
+def cancel_import_job(job_id: int) -> bool:
+    """
+    Cancel an import job. A queued or stale job is cancelled right away, and
+    a running job stops at the next plugin it creates. The plugins the job
+    created are then deleted, see `rollback_cancelled_job`.
+
+    :param job_id: int, ID of the job
+
+    :return: bool, True if the job was not finished yet
+    """
+    cancelled = ImportJob.objects.filter(Q(status=ImportJob.STATUS_QUEUED) | get_stale_filter(), pk=job_id).update(
+        status=ImportJob.STATUS_CANCELLED,
+        cancel_requested=True,
+        finished_at=timezone.now(),
+    )
+    if cancelled:
+        # A resumed job may have created plugins before it was queued again.
+        rollback_cancelled_job(job_id)
+        return True
+    return ImportJob.objects.filter(pk=job_id, status=ImportJob.STATUS_RUNNING).update(cancel_requested=True) == 1
+
+
+def delete_imported_plugins(job_id: int) -> int:
+    """
+    Delete the plugins created by a cancelled or failed import job, along
+    with its checkpoint, and mark the placeholder as dirty.
+
+    :param job_id: int, ID of the job
+
+    :return: int, the number of deleted plugins
+    """
+    job = ImportJob.objects.get(pk=job_id, status__in=(ImportJob.STATUS_FAILED, ImportJob.STATUS_CANCELLED))
+    plugin_ids = set(job.imported_plugins.values_list('plugin_id', flat=True))
+
+    with transaction.atomic():
+        # Deleting the topmost plugins deletes their descendants as well.
+        plugins = CMSPlugin.objects.filter(pk__in=plugin_ids)
+        languages = set(plugins.values_list('language', flat=True))
+        top_plugins = plugins.exclude(parent_id__in=plugin_ids)
+        for plugin in top_plugins:
+            plugin.delete()
+        job.imported_plugins.all().delete()
+        ImportJob.objects.filter(pk=job_id).update(created_plugins=0)
+        for language in languages:
+            job.placeholder.mark_as_dirty(language)
+
+    return len(plugin_ids)
+
+
+def rollback_cancelled_job(job_id: int) -> int:
+    """
+    Delete the plugins created by a cancelled import job, unless
+    `rollback_cancelled` is off in the jobs settings. Errors are logged, and
+    the plugins are then left for the "Delete the plugins" admin action.
+
+    :param job_id: int, ID of the job
+
+    :return: int, the number of deleted plugins
+    """
+    if not Config().get_rollback_cancelled():
+        return 0
+    try:
+        return delete_imported_plugins(job_id)
+    except Exception as e:
+        logger.exception(f"Failed to delete the plugins of the cancelled import job {job_id}: {e}")
+        return 0
+
+
+def delete_import_file(job: ImportJob) -> bool:
+    """
+    Delete the import file of an import job. The job is kept, but can no
+    longer be resumed.
+
+    :param job: ImportJob object
+
+    :return: bool, True if the job had an import file
+    """
+    if not job.import_file:
+        return False
+    job.import_file.delete(save=False)
+    ImportJob.objects.filter(pk=job.pk).update(import_file='')
+    return True
+
+
+def delete_expired_import_files() -> int:
+    """
+    Delete the import files of the import jobs that finished longer ago than
+    the import retention of the jobs settings.
+
+    :return: int, the number of deleted files
+    """
+    retention = Config().get_import_retention()
+    if retention is None:
+        return 0
+
+    expired = ImportJob.objects.filter(finished_at__lt=timezone.now() - timedelta(hours=retention)).exclude(import_file='')
+    count = 0
+    for job in expired:
+        try:
+            count += delete_import_file(job)
+        except Exception as e:
+            logger.exception(f"Failed to delete the import file of import job {job.pk}: {e}")
+    return count
+
+
+def create_export_job(
+        component_type: Literal['plugin', 'placeholder'],
+        component_id: int,
+        total_plugins: int = 0,
+        user=None
+) -> ExportJob:
+    """
+    Create an export job for the plugin tree of a component and queue it.
+
+    :param component_type: str, 'plugin' or 'placeholder'
+    :param component_id: int, ID of the component
+    :param total_plugins: int, the number of plugins in the plugin tree
+    :param user: the user starting the export, if any
+
+    :return: ExportJob object
+    """
+    delete_expired_export_files()
+    job = ExportJob.objects.create(
+        component_type=component_type,
+        component_id=component_id,
+        total_plugins=total_plugins,
+        created_by=user,
+    )
+    enqueue_job(run_export_job, job.pk)
+    return job
+
+
+def run_export_job(job_id: int) -> Optional[ExportJob]:
+    """
+    Run a queued export job. The export file is encoded piece by piece to a
+    temporary file, which is then saved to the default storage under a random
+    name, so its URL cannot be guessed from the ID of the job.
+
+    :param job_id: int, ID of the job
+
+    :return: ExportJob object, or None if the job was not queued
+    """
+    # The exporter is loaded on first use, so that the admin and the import
+    # views, which import this module, do not load it.
+    from djangocms_plugie.exporter import Exporter, get_plugin_tree
+
+    if not claim_job(ExportJob, job_id):
+        return None
+
+    job = ExportJob.objects.get(pk=job_id)
+    memory = get_memory_tracker('export', f'job {job_id}')
+
+    try:
+        exporter = Exporter(memory=memory)
+        plugin_tree = get_plugin_tree(job.component_type, job.component_id, using=exporter.using)
+
+        with tempfile.TemporaryFile() as export_file:
+            for chunk in exporter.iter_export_json(plugin_tree.iterator()):
+                export_file.write(chunk.encode('utf-8'))
+            export_file.seek(0)
+            job.export_file.save(f'plugins_{uuid.uuid4().hex}.json', File(export_file), save=False)
+    except Exception as e:
+        logger.exception(f"Export job {job_id} failed: {e}")
+        finish_job(ExportJob, job_id, ExportJob.STATUS_FAILED, error=str(e), memory=memory.as_dict())
+    else:
+        finish_job(
+            ExportJob, job_id, ExportJob.STATUS_DONE,
+            export_file=job.export_file.name,
+            memory=memory.as_dict(),
+        )
+
+    job.refresh_from_db()
+    return job
+
+
+def delete_export_file(job: ExportJob) -> bool:
+    """
+    Delete the export file of an export job. The job is kept, without a file
+    to download.
+
+    :param job: ExportJob object
+
+    :return: bool, True if the job had an export file
+    """
+    if not job.export_file:
+        return False
+    job.export_file.delete(save=False)
+    ExportJob.objects.filter(pk=job.pk).update(export_file='')
+    return True
+
+
+def delete_expired_export_files() -> int:
+    """
+    Delete the export files of the export jobs that finished longer ago than
+    the export retention of the jobs settings.
+
+    :return: int, the number of deleted files
+    """
+    retention = Config().get_export_retention()
+    if retention is None:
+        return 0
+
+    expired = ExportJob.objects.filter(finished_at__lt=timezone.now() - timedelta(hours=retention)).exclude(export_file='')
+    count = 0
+    for job in expired:
+        try:
+            count += delete_export_file(job)
+        except Exception as e:
+            logger.exception(f"Failed to delete the export file of export job {job.pk}: {e}")
+    return count
+
+
+def run_queued_jobs() -> int:
+    """
+    Run all queued jobs, oldest first.
+
+    :return: int, the number of jobs run
+    """
+    count = 0
+
+    for model, run_job in ((ImportJob, run_import_job), (ExportJob, run_export_job)):
+        job_ids = model.objects.filter(status=model.STATUS_QUEUED).order_by('created_at').values_list('pk', flat=True)
+        count += sum(run_job(job_id) is not None for job_id in list(job_ids))
+
+    return count
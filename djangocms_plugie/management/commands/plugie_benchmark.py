@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+from djangocms_plugie.benchmark import PHASES, compare_results, load_baseline, run_benchmark, save_baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the export, the parsing and the import of synthetic plugin "
+        "trees, reporting wall time, query count and peak memory. Everything "
+        "the benchmark creates is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000], help='The numbers of plugins to benchmark')
+        parser.add_argument('--depth', type=int, default=3, help='The number of levels of each root subtree')
+        parser.add_argument('--fan-out', type=int, default=4, help='The number of children per plugin')
+        parser.add_argument(
+            '--types', nargs='+', default=['PlugiePlugin'],
+            help='The plugin types of the mix, with an optional weight, e.g. TextPlugin=3',
+        )
+        parser.add_argument('--database', default='default', help='The database alias to run on')
+        parser.add_argument('--no-memory', action='store_true', help='Do not measure the peak memory')
+        parser.add_argument('--output', help='Save the results as a baseline JSON file')
+        parser.add_argument('--compare', help='A baseline JSON file to compare the results with')
+
+    def handle(self, *args, **options):
+        plugin_types = self.parse_plugin_types(options['types'])
+        baseline = None
+        if options['compare']:
+            try:
+                baseline = load_baseline(options['compare'])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot load the baseline {options['compare']}: {e}")
+        results = []
+
+        for size in options['sizes']:
+            result = run_benchmark(
+                size,
+                using=options['database'],
+                memory=not options['no_memory'],
+                depth=options['depth'],
+                fan_out=options['fan_out'],
+                plugin_types=plugin_types,
+            )
+            results.append(result)
+            self.write_result(result)
+
+        if options['output']:
+            save_baseline(results, options['output'], using=options['database'])
+            self.stdout.write(f"Saved the results to {options['output']}.")
+
+        if baseline is not None:
+            for comparison in compare_results(results, baseline):
+                ratios = ", ".join(
+                    f"{key} x{value}" for key, value in comparison.items()
+                    if key not in ('plugins', 'phase') and value is not None
+                )
+                self.stdout.write(f"{comparison['plugins']} plugins, {comparison['phase']}: {ratios}")
+
+    def parse_plugin_types(self, types):
+        """
+        Parse the plugin types of the --types option.
+
+        :param types: list of str, the plugin types, as TYPE or TYPE=WEIGHT
+
+        :return: dict, the weights by plugin type
+        """
+        plugin_types = {}
+        for plugin_type in types:
+            name, _, weight = plugin_type.partition('=')
+            try:
+                plugin_types[name] = int(weight or 1)
+            except ValueError:
+                raise CommandError(f"Invalid weight for plugin type '{name}': {weight}")
+        return plugin_types
+
+    def write_result(self, result):
+        self.stdout.write(f"{result['plugins']} plugins, {result['export_bytes']} bytes exported:")
+        for phase in PHASES:
+            measurement = result['phases'][phase]
+            line = f"    {phase}: {measurement['seconds']:.3f}s, {measurement['queries']} queries"
+            if measurement['peak_memory'] is not None:
+                line += f", {measurement['peak_memory'] / 1024 / 1024:.1f} MiB peak"
+            self.stdout.write(line)
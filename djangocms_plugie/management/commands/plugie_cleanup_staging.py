@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from djangocms_plugie.importer.staging import delete_stale_staging_placeholders
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the staging placeholders left behind by staged imports whose "
+        "process died mid-import, with the plugins built in them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=float, default=None,
+            help='Only delete the staging placeholders older than this many seconds. '
+                 'Default is the staging timeout of the config',
+        )
+
+    def handle(self, *args, **options):
+        deleted = delete_stale_staging_placeholders(options['older_than'])
+        self.stdout.write(f"Deleted {deleted} staging placeholders.")
@@ -0,0 +1,179 @@
+import json
+import os
+import time
+from functools import partial
+from typing import Any, Dict, List
+from cms.models import Placeholder
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from djangocms_plugie import __version__
+from djangocms_plugie.config import Config
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.management.workers import run_in_workers
+
+MANIFEST_FILENAME = 'manifest.json'
+
+_exporter = None
+
+
+def get_exporter() -> Exporter:
+    """
+    Get the exporter of the current process. Each worker process builds its
+    own exporter once and reuses it for all the placeholders it exports.
+
+    :return: Exporter object
+    """
+    global _exporter
+    if _exporter is None:
+        _exporter = Exporter()
+    return _exporter
+
+
+def get_export_filename(placeholder_id: int) -> str:
+    """
+    Get the name of the export file of a placeholder.
+
+    :param placeholder_id: int, ID of the placeholder
+
+    :return: str, the file name
+    """
+    return f'placeholder_{placeholder_id}.json'
+
+
+def export_placeholder(placeholder_id: int, output_dir: str) -> Dict[str, Any]:
+    """
+    Export the plugin tree of a placeholder to its own file in the output
+    directory. Errors are returned instead of raised, so that one broken
+    placeholder does not stop the whole export.
+
+    :param placeholder_id: int, ID of the placeholder
+    :param output_dir: str, the directory to write the export file to
+
+    :return: dict, the manifest entry of the placeholder
+    """
+    filename = get_export_filename(placeholder_id)
+
+    try:
+        exporter = get_exporter()
+        plugin_tree = get_plugin_tree('placeholder', placeholder_id, using=exporter.using)
+        data = exporter.get_export_data(plugin_tree)
+
+        with open(os.path.join(output_dir, filename), 'w') as file:
+            json.dump(data, file, indent=4, sort_keys=True)
+    except Exception as e:
+        return {'placeholder': placeholder_id, 'error': str(e)}
+
+    return {
+        'placeholder': placeholder_id,
+        'file': filename,
+        'plugins': len(data['all_plugins']),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the plugins of pages, placeholders or sites to one JSON file "
+        "per placeholder, along with a manifest of all exported files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help='The directory to write the export files to')
+        parser.add_argument('--pages', nargs='+', type=int, default=[], help='IDs of the pages to export')
+        parser.add_argument('--placeholders', nargs='+', type=int, default=[], help='IDs of the placeholders to export')
+        parser.add_argument('--sites', nargs='+', type=int, default=[], help='IDs of the sites whose draft pages are exported')
+        parser.add_argument('--all', action='store_true', help='Export every placeholder that has plugins')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='The number of worker processes')
+        parser.add_argument('--chunksize', type=int, default=16, help='The number of placeholders sent to a worker at once')
+
+    def handle(self, *args, **options):
+        placeholders = self.get_placeholders(options)
+        output_dir = options['output_dir']
+        os.makedirs(output_dir, exist_ok=True)
+
+        start = time.monotonic()
+        results = run_in_workers(
+            partial(export_placeholder, output_dir=output_dir),
+            list(placeholders),
+            workers=options['workers'],
+            chunksize=options['chunksize'],
+        )
+        entries, errors = self.collect_results(results, placeholders)
+        elapsed = time.monotonic() - start
+
+        self.write_manifest(output_dir, entries, errors)
+
+        total_plugins = sum(entry['plugins'] for entry in entries)
+        self.stdout.write(
+            f"Exported {total_plugins} plugins from {len(entries)} placeholders "
+            f"in {elapsed:.2f}s to '{output_dir}'."
+        )
+
+        if errors:
+            for error in errors:
+                self.stderr.write(f"Placeholder {error['placeholder']}: {error['error']}")
+            raise CommandError(f"{len(errors)} placeholders could not be exported.")
+
+    def get_placeholders(self, options) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the placeholders to export, with the slot and page of each one.
+
+        :param options: dict, the command options
+
+        :return: dict, mapping the placeholder IDs to their slot and page
+        """
+        using = Config().get_export_database()
+        queryset = Placeholder.objects.using(using).filter(cmsplugin__isnull=False)
+
+        if not options['all']:
+            criteria = Q()
+            if options['placeholders']:
+                criteria |= Q(pk__in=options['placeholders'])
+            if options['pages']:
+                criteria |= Q(page__in=options['pages'])
+            if options['sites']:
+                criteria |= Q(page__node__site__in=options['sites'], page__publisher_is_draft=True)
+            if not criteria:
+                raise CommandError("Provide --pages, --placeholders, --sites or --all.")
+            queryset = queryset.filter(criteria)
+
+        return {
+            placeholder_id: {'slot': slot, 'page': page_id}
+            for placeholder_id, slot, page_id in queryset.order_by('pk').values_list('pk', 'slot', 'page').distinct()
+        }
+
+    def collect_results(self, results, placeholders):
+        """
+        Split the results of the workers in manifest entries and errors.
+
+        :param results: iterable of dicts returned by export_placeholder
+        :param placeholders: dict, the slot and page of each placeholder
+
+        :return: tuple of the list of manifest entries and the list of errors
+        """
+        entries: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+
+        for result in results:
+            if 'error' in result:
+                errors.append(result)
+                continue
+            entries.append({**result, **placeholders[result['placeholder']]})
+
+        return entries, errors
+
+    def write_manifest(self, output_dir, entries, errors) -> None:
+        """
+        Write the manifest listing every export file of the run.
+
+        :param output_dir: str, the directory of the export files
+        :param entries: list of the manifest entries
+        :param errors: list of the placeholders that failed to export
+        """
+        manifest = {
+            'version': __version__,
+            'placeholders': entries,
+            'errors': errors,
+        }
+
+        with open(os.path.join(output_dir, MANIFEST_FILENAME), 'w') as file:
+            json.dump(manifest, file, indent=4, sort_keys=True)
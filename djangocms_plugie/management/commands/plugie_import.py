@@ -0,0 +1,230 @@
+import glob
+import json
+import os
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+from cms.models import Placeholder
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+from djangocms_plugie.db import lock_plugin_tree
+from djangocms_plugie.management.commands.plugie_export import MANIFEST_FILENAME
+from djangocms_plugie.management.workers import run_in_workers
+from djangocms_plugie.memory import get_memory_tracker
+from djangocms_plugie.utils import parse_and_plan_import_file, initialize_and_run_importer
+
+RETRY_DELAY = 0.5
+
+
+def get_database_error(error: BaseException) -> Optional[DatabaseError]:
+    """
+    Get the database error that caused an import error, if any. The importer
+    re-raises errors as different types, so the whole chain is inspected.
+
+    :param error: the raised exception
+
+    :return: the DatabaseError in the exception chain, or None
+    """
+    while error is not None:
+        if isinstance(error, DatabaseError):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def import_files(placeholder_id: int, paths: List[str]) -> int:
+    """
+    Import export files into a target placeholder, in a single transaction.
+    The files are parsed and validated first, in parallel with the other
+    workers, and the transaction then holds the lock of the plugin tree, so
+    the workers create their plugins one after the other instead of failing
+    on the paths of each other's root plugins.
+
+    :param placeholder_id: int, ID of the target placeholder
+    :param paths: list of the paths of the files to import, in order
+
+    :return: int, the number of created plugins
+    """
+    imports = []
+    for path in paths:
+        memory = get_memory_tracker('import', os.path.basename(path))
+        with open(path, 'rb') as import_file:
+            import_data, import_plan = parse_and_plan_import_file(import_file, memory)
+        imports.append((import_data, import_plan, memory))
+
+    created = 0
+    with lock_plugin_tree(), transaction.atomic():
+        placeholder = Placeholder.objects.get(pk=placeholder_id)
+        for import_data, import_plan, memory in imports:
+            importer = initialize_and_run_importer({
+                'plugin': None,
+                'placeholder': placeholder,
+                'import_data': import_data,
+                'import_plan': import_plan,
+                'memory': memory,
+            })
+            created += importer.created_count
+
+    return created
+
+
+def import_placeholder(task: Tuple[int, List[str]], retries: int = 0) -> Dict[str, Any]:
+    """
+    Import the export files of a task into their target placeholder. Errors
+    are returned instead of raised, so that one broken placeholder does not
+    stop the whole import.
+
+    All root plugins of django CMS share one tree, which `import_files`
+    locks. On databases without the lock, parallel transactions adding root
+    plugins can conflict with each other. Such database errors roll back the
+    placeholder, which is then retried.
+
+    :param task: tuple of the target placeholder ID and the paths of the
+    files to import into it, in order
+    :param retries: int, how many times a database error is retried
+
+    :return: dict, the result of the import of the placeholder
+    """
+    placeholder_id, paths = task
+
+    for attempt in range(retries + 1):
+        try:
+            created = import_files(placeholder_id, paths)
+            return {'placeholder': placeholder_id, 'files': len(paths), 'plugins': created}
+        except Exception as e:
+            if attempt < retries and get_database_error(e) is not None:
+                time.sleep(RETRY_DELAY * (attempt + 1))
+                continue
+            return {'placeholder': placeholder_id, 'error': str(e)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import export files, e.g. written by plugie_export, into target "
+        "placeholders. Each target placeholder is imported in its own "
+        "transaction, and independent placeholders are imported in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='A directory of export files or the path to a manifest')
+        parser.add_argument(
+            '--mapping',
+            help='Path to a JSON object mapping export file names or source placeholder IDs to target placeholder IDs',
+        )
+        parser.add_argument(
+            '--map', nargs='+', default=[], metavar='SOURCE=TARGET',
+            help='Map an export file name or source placeholder ID to a target placeholder ID',
+        )
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='The number of worker processes')
+        parser.add_argument('--retries', type=int, default=3, help='How many times a placeholder is retried after a database error')
+
+    def handle(self, *args, **options):
+        mapping = self.get_mapping(options)
+        export_files = self.get_export_files(options['source'])
+        tasks = self.get_tasks(export_files, mapping)
+
+        if not tasks:
+            raise CommandError("None of the export files is mapped to a target placeholder.")
+
+        start = time.monotonic()
+        results = list(run_in_workers(
+            partial(import_placeholder, retries=options['retries']),
+            tasks,
+            workers=options['workers'],
+        ))
+        elapsed = time.monotonic() - start
+
+        errors = [result for result in results if 'error' in result]
+        imported = [result for result in results if 'error' not in result]
+        total_plugins = sum(result['plugins'] for result in imported)
+        throughput = total_plugins / elapsed if elapsed else 0
+
+        self.stdout.write(
+            f"Imported {total_plugins} plugins from {sum(result['files'] for result in imported)} files "
+            f"into {len(imported)} placeholders in {elapsed:.2f}s ({throughput:.1f} plugins/s)."
+        )
+
+        if errors:
+            for error in errors:
+                self.stderr.write(f"Placeholder {error['placeholder']}: {error['error']}")
+            raise CommandError(f"{len(errors)} placeholders could not be imported.")
+
+    def get_mapping(self, options) -> Dict[str, int]:
+        """
+        Get the mapping of export file names or source placeholder IDs to
+        target placeholder IDs, from the --mapping file and the --map pairs.
+
+        :param options: dict, the command options
+
+        :return: dict, mapping the source keys to the target placeholder IDs
+        """
+        mapping = {}
+
+        if options['mapping']:
+            try:
+                with open(options['mapping']) as file:
+                    mapping.update(json.load(file))
+            except (OSError, json.JSONDecodeError) as e:
+                raise CommandError(f"Mapping file is not valid: {e}")
+
+        for pair in options['map']:
+            source, separator, target = pair.partition('=')
+            if not separator:
+                raise CommandError(f"Invalid --map value '{pair}', expected SOURCE=TARGET.")
+            mapping[source] = target
+
+        try:
+            return {str(source): int(target) for source, target in mapping.items()}
+        except (TypeError, ValueError) as e:
+            raise CommandError(f"Target placeholder IDs must be integers: {e}")
+
+    def get_export_files(self, source: str) -> List[Tuple[str, Any]]:
+        """
+        Get the export files to import, with the source placeholder of each
+        one when it is known from a manifest.
+
+        :param source: str, a directory of export files or a manifest path
+
+        :return: list of tuples of the file path and the source placeholder ID
+        """
+        manifest_path = os.path.join(source, MANIFEST_FILENAME) if os.path.isdir(source) else source
+
+        if os.path.isfile(manifest_path) and os.path.basename(manifest_path) == MANIFEST_FILENAME:
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+            export_dir = os.path.dirname(manifest_path)
+            return [
+                (os.path.join(export_dir, entry['file']), entry['placeholder'])
+                for entry in manifest.get('placeholders', [])
+            ]
+
+        if os.path.isdir(source):
+            return [(path, None) for path in sorted(glob.glob(os.path.join(source, '*.json')))]
+
+        if os.path.isfile(source):
+            return [(source, None)]
+
+        raise CommandError(f"Source '{source}' does not exist.")
+
+    def get_tasks(self, export_files, mapping) -> List[Tuple[int, List[str]]]:
+        """
+        Group the export files by target placeholder. Files imported into the
+        same placeholder run in order, in the same worker.
+
+        :param export_files: list of tuples of the file path and the source
+        placeholder ID
+        :param mapping: dict, mapping the source keys to the target placeholder IDs
+
+        :return: list of tuples of the target placeholder ID and the file paths
+        """
+        tasks: Dict[int, List[str]] = {}
+
+        for path, source_placeholder in export_files:
+            filename = os.path.basename(path)
+            target = mapping.get(filename, mapping.get(str(source_placeholder)))
+            if target is None:
+                self.stdout.write(f"Skipping '{filename}': no target placeholder is mapped.")
+                continue
+            tasks.setdefault(target, []).append(path)
+
+        return list(tasks.items())
@@ -0,0 +1,63 @@
+import json
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from djangocms_plugie.utils import get_importer, parse_and_plan_import_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Dry run the import of export files: validate their plugins and count "
+        "what an import would create, without touching the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='The export files to plan')
+        parser.add_argument('--json', action='store_true', help='Write the plans as JSON')
+
+    def handle(self, *args, **options):
+        plans = {}
+        errors = {}
+
+        for path in options['files']:
+            try:
+                plans[path] = self.plan_file(path)
+            except Exception as e:
+                errors[path] = str(e)
+
+        if options['json']:
+            self.stdout.write(json.dumps({'plans': plans, 'errors': errors}, indent=4, sort_keys=True))
+        else:
+            for path, plan in plans.items():
+                self.stdout.write(
+                    f"{path}: {plan['plugins']} plugins, {plan['related_rows']} related rows, "
+                    f"{plan['row_writes']} row writes."
+                )
+                for plugin_type, count in sorted(plan['plugins_per_type'].items()):
+                    self.stdout.write(f"    {plugin_type}: {count}")
+
+        if errors:
+            for path, error in errors.items():
+                self.stderr.write(f"{path}: {error}")
+            raise CommandError(f"{len(errors)} files would not import.")
+
+    def plan_file(self, path):
+        """
+        Plan the import of an export file into an empty placeholder.
+
+        :param path: str, the path of the export file
+
+        :return: dict, the plan of the import
+        """
+        with open(path, 'rb') as import_file:
+            try:
+                import_data, import_plan = parse_and_plan_import_file(import_file)
+            except ValidationError as e:
+                raise CommandError(" ".join(e.messages))
+
+        importer = get_importer({
+            'plugin': None,
+            'placeholder': None,
+            'import_data': import_data,
+            'import_plan': import_plan,
+        })
+        return importer.plan_import()
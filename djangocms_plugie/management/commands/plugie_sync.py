@@ -0,0 +1,130 @@
+import time
+from itertools import islice
+from typing import Dict
+from cms.models import CMSPlugin, Placeholder
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.utils import build_import_plan, get_importer
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the plugins of placeholders from one database to another, "
+        "streaming them in chunks from the exporter to the importer without "
+        "an intermediate file. Requires the PlugieRouter in DATABASE_ROUTERS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source-db', required=True, help='The database alias to read the plugins from')
+        parser.add_argument('--target-db', default=DEFAULT_DB_ALIAS, help='The database alias to write the plugins to')
+        parser.add_argument(
+            '--map', nargs='+', required=True, metavar='SOURCE=TARGET',
+            help='Map a source placeholder ID to a target placeholder ID',
+        )
+        parser.add_argument('--chunk-size', type=int, default=500, help='The number of plugins held in memory at once')
+
+    def handle(self, *args, **options):
+        source_db = options['source_db']
+        target_db = options['target_db']
+
+        for alias in (source_db, target_db):
+            if alias not in connections:
+                raise CommandError(f"Database '{alias}' is not configured.")
+
+        if source_db == target_db:
+            raise CommandError("Source and target databases must be different.")
+
+        start = time.monotonic()
+        total_plugins = 0
+
+        for source_id, target_id in self.get_placeholder_pairs(options['map']):
+            created = self.sync_placeholder(source_id, target_id, source_db, target_db, options['chunk_size'])
+            total_plugins += created
+            self.stdout.write(f"Copied {created} plugins from placeholder {source_id} to placeholder {target_id}.")
+
+        self.stdout.write(f"Copied {total_plugins} plugins in {time.monotonic() - start:.2f}s.")
+
+    def get_placeholder_pairs(self, pairs):
+        """
+        Parse the --map values.
+
+        :param pairs: list of str, 'SOURCE=TARGET' placeholder ID pairs
+
+        :return: list of tuples of the source and target placeholder IDs
+        """
+        placeholder_pairs = []
+
+        for pair in pairs:
+            source, separator, target = pair.partition('=')
+            try:
+                if not separator:
+                    raise ValueError
+                placeholder_pairs.append((int(source), int(target)))
+            except ValueError:
+                raise CommandError(f"Invalid --map value '{pair}', expected SOURCE=TARGET placeholder IDs.")
+
+        return placeholder_pairs
+
+    def sync_placeholder(self, source_id, target_id, source_db, target_db, chunk_size) -> int:
+        """
+        Copy the plugins of a source placeholder to a target placeholder, in a
+        single transaction of the target database. The source plugins are read
+        in tree order, so that parents are imported before their children, and
+        the importer only holds the plugins that still have children to come.
+
+        :param source_id: int, ID of the source placeholder
+        :param target_id: int, ID of the target placeholder
+        :param source_db: str, the source database alias
+        :param target_db: str, the target database alias
+        :param chunk_size: int, the number of plugins held in memory at once
+
+        :return: int, the number of created plugins
+        """
+        try:
+            placeholder = Placeholder.objects.using(target_db).get(pk=target_id)
+        except Placeholder.DoesNotExist:
+            raise CommandError(f"Placeholder {target_id} does not exist in database '{target_db}'.")
+
+        exporter = Exporter(using=source_db)
+        importer = get_importer({
+            'plugin': None,
+            'placeholder': placeholder,
+            'import_data': {'version': exporter.version, 'all_plugins': []},
+            'using': target_db,
+        })
+        plugins = get_plugin_tree('placeholder', source_id, using=source_db).order_by('path').iterator(chunk_size=chunk_size)
+
+        with transaction.atomic(using=target_db):
+            while chunk := list(islice(plugins, chunk_size)):
+                child_counts = self.count_children(chunk, source_db)
+                plan = build_import_plan(exporter.serialize_plugins(chunk), child_counts)
+                importer.import_plugins(plan.plugins)
+
+        exporter.report()
+        importer.report()
+
+        return importer.created_count
+
+    def count_children(self, plugins, source_db) -> Dict[int, int]:
+        """
+        Count the children of plugins in the source database. The children
+        of a plugin may come in later chunks, so they are counted in the
+        source tree rather than in the chunk, and from the plugins themselves
+        rather than from the `numchild` column of the tree, which can drift.
+        The importer forgets a parent once that many children are created.
+
+        :param plugins: list of the CMSPlugin objects of a chunk
+        :param source_db: str, the source database alias
+
+        :return: dict, mapping the plugin IDs to their number of children
+        """
+        child_counts = dict(
+            CMSPlugin.objects.using(source_db)
+            .filter(parent_id__in=[plugin.pk for plugin in plugins])
+            .order_by()
+            .values_list('parent_id')
+            .annotate(count=Count('pk'))
+        )
+        return {plugin.pk: child_counts.get(plugin.pk, 0) for plugin in plugins}
@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from djangocms_plugie.importer.staging import delete_stale_staging_placeholders
+from djangocms_plugie.jobs import delete_expired_export_files, delete_expired_import_files, run_queued_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the queued plugie background jobs. Use it with the \"worker\" "
+        "job runner, or to pick up jobs left queued by a restarted web process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the queued jobs and exit')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to wait between polls for new jobs')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            count = run_queued_jobs()
+            if count:
+                self.stdout.write(f"Ran {count} jobs.")
+            deleted = delete_expired_export_files()
+            if deleted:
+                self.stdout.write(f"Deleted {deleted} expired export files.")
+            deleted = delete_expired_import_files()
+            if deleted:
+                self.stdout.write(f"Deleted {deleted} expired import files.")
+            deleted = delete_stale_staging_placeholders()
+            if deleted:
+                self.stdout.write(f"Deleted {deleted} stale staging placeholders.")
+            if options['once']:
+                return
+            time.sleep(options['interval'])
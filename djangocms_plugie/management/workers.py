@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
+import django
+from django.apps import apps
+from django.db import connections
+
+
+def init_worker() -> None:
+    """
+    Initialize a worker process of a bulk management command.
+
+    Django is set up when the process was spawned instead of forked, and any
+    database connection is dropped so that the worker opens its own.
+    """
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def run_in_workers(func: Callable[[Any], Any], items: Iterable[Any], workers: int, chunksize: int = 1) -> Iterator[Any]:
+    """
+    Call a function for each item, fanning the calls out across a process pool.
+
+    With a single worker the calls run in the current process, which is also
+    the only option for databases that cannot be shared between processes,
+    such as an in-memory SQLite database.
+
+    :param func: Callable, a module level function, so it can be pickled
+    :param items: iterable of the arguments to call the function with
+    :param workers: int, the number of worker processes
+    :param chunksize: int, the number of items sent to a worker at once
+
+    :return: iterator of the results, in the order of the items
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+
+    # Connections must not be shared with the forked workers.
+    connections.close_all()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        yield from executor.map(func, items, chunksize=chunksize)
@@ -0,0 +1,208 @@
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+from djangocms_plugie.config import Config
+
+logger = logging.getLogger(__name__)
+
+MIB = 1024 * 1024
+
+_tracing_lock = threading.Lock()
+_tracing_depth = 0
+_started_tracing = False
+
+
+def start_tracing() -> None:
+    """
+    Start tracemalloc for a phase, unless it is already tracing, e.g. with
+    the PYTHONTRACEMALLOC environment variable.
+    """
+    global _tracing_depth, _started_tracing
+    with _tracing_lock:
+        if _tracing_depth == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_depth += 1
+
+
+def stop_tracing() -> None:
+    """
+    Stop tracemalloc once the last phase ends, if a phase started it.
+    """
+    global _tracing_depth, _started_tracing
+    with _tracing_lock:
+        _tracing_depth -= 1
+        if _tracing_depth == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def get_top_allocations(snapshot, baseline, top: int) -> List[Dict[str, Any]]:
+    """
+    Get the allocation sites that grew the most between two snapshots.
+
+    :param snapshot: tracemalloc.Snapshot, taken at the end of the phase
+    :param baseline: tracemalloc.Snapshot, taken at the start of the phase
+    :param top: int, the number of allocation sites
+
+    :return: list of dicts with the site, its size and its count of blocks
+    """
+    ignored = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    )
+    statistics = snapshot.filter_traces(ignored).compare_to(baseline.filter_traces(ignored), 'lineno')
+    return [
+        {
+            'site': f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}",
+            'size_bytes': statistic.size_diff,
+            'count': statistic.count_diff,
+        }
+        for statistic in statistics[:top]
+        if statistic.size_diff > 0
+    ]
+
+
+class MemoryTracker:
+    """
+    Peak memory and top allocation sites of the phases of one export or
+    import, tracked with tracemalloc.
+
+    The peak of a phase is the most memory traced above what was traced when
+    the phase started. tracemalloc traces the whole process, so the phases of
+    concurrent exports and imports count each other's allocations. A phase run
+    several times, e.g. once per batch, keeps its highest peak.
+
+    The start of each phase is logged with the label of the tracker, so the
+    phase a killed process was in shows in its logs.
+    """
+    enabled = True
+
+    def __init__(self, operation: str, top: int = 10, limits: Optional[Dict[str, float]] = None,
+                 label: Optional[str] = None):
+        """
+        :param operation: str, 'export', 'parse' or 'import'
+        :param top: int, the number of allocation sites kept for each phase
+        :param limits: dict, the peak memory limits of the phases in MiB
+        :param label: str, what is exported or imported, e.g. 'job 12' or the
+        name of the import file
+        """
+        self.operation = operation
+        self.top = top
+        self.limits = limits or {}
+        self.label = label
+        self.phases: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def description(self) -> str:
+        return f"{self.operation} of {self.label}" if self.label else self.operation
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Track the peak memory of a phase, e.g. 'parse'. The first start of
+        each phase is logged at the INFO level, the next ones at DEBUG.
+        """
+        logger.log(
+            logging.DEBUG if name in self.phases else logging.INFO,
+            f"{self.description} {name} phase started",
+        )
+        start_tracing()
+        try:
+            baseline = tracemalloc.take_snapshot() if self.top else None
+            start_size = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            try:
+                yield
+            finally:
+                peak = max(tracemalloc.get_traced_memory()[1] - start_size, 0)
+                previous = self.phases.get(name)
+                if previous is None or peak > previous['peak_bytes']:
+                    self.phases[name] = {
+                        'peak_bytes': peak,
+                        'top': get_top_allocations(tracemalloc.take_snapshot(), baseline, self.top) if self.top else [],
+                    }
+                self.check_limit(name, peak)
+        finally:
+            stop_tracing()
+
+    def check_limit(self, name: str, peak: int) -> None:
+        """
+        Log a warning if the peak memory of a phase exceeds its limit. The
+        warning is logged when the phase ends, so a process killed during the
+        phase never logs it. The log of the start of the phase tells which one
+        it was, and import jobs save their peaks with each checkpoint.
+        """
+        limit = self.limits.get(name)
+        if limit is not None and peak > limit * MIB:
+            logger.warning(
+                f"{self.description} {name} peak memory of {peak / MIB:.1f} MiB exceeds the limit of {limit} MiB"
+            )
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the peak memory and the top allocation sites by phase, e.g. to
+        save them with an import job.
+
+        :return: dict, by phase name
+        """
+        return {name: dict(stats) for name, stats in self.phases.items()}
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Log the peak memory and the top allocation sites of the phases.
+
+        :return: dict, by phase name
+        """
+        report = self.as_dict()
+        if report:
+            lines = []
+            for name, stats in report.items():
+                lines.append(f"    {name}: peak {stats['peak_bytes'] / MIB:.1f} MiB")
+                lines.extend(
+                    f"        {site['site']}: {site['size_bytes'] / 1024:.1f} KiB in {site['count']} blocks"
+                    for site in stats['top']
+                )
+            logger.info(f"{self.description} peak memory:\n" + "\n".join(lines))
+        return report
+
+
+class NullMemoryTracker:
+    """
+    Memory tracker used when the memory is not tracked: every method does
+    nothing.
+    """
+    enabled = False
+    _phase = nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def as_dict(self):
+        return {}
+
+    def report(self):
+        return {}
+
+
+NULL_MEMORY_TRACKER = NullMemoryTracker()
+
+
+def get_memory_tracker(operation: str, label: Optional[str] = None):
+    """
+    Get the memory tracker of a new export or import.
+
+    :param operation: str, 'export', 'parse' or 'import'
+    :param label: str, what is exported or imported, e.g. 'job 12' or the
+    name of the import file
+
+    :return: MemoryTracker object, or NULL_MEMORY_TRACKER if the memory is
+    not tracked
+    """
+    config = Config()
+    if not config.get_memory_tracking():
+        return NULL_MEMORY_TRACKER
+    return MemoryTracker(operation, config.get_memory_top(), config.get_memory_limits(), label)
@@ -1,5 +1,5 @@
 from django.apps import apps
-from djangocms_plugie.importer.version0.utils import handle_special_plugin_fields
+from djangocms_plugie.importer.utils import handle_special_plugin_fields
 
 
 def deserialize_relatedmanager(importer, **kwargs):
@@ -12,7 +12,7 @@ def deserialize_relatedmanager(importer, **kwargs):
         for instance_data in instance:
             instance_data.pop('meta', None)
             processed_fields = handle_special_plugin_fields(
-                instance_data, plugin, importer.method_map)
+                instance_data, plugin, importer.method_map, kwargs.get('_resolver'))
             model_instance = model_class.objects.create(**processed_fields)
             model_instance.save()
             created_instances.append(model_instance)
@@ -27,7 +27,7 @@ def deserialize_manyrelatedmanager(importer, **kwargs):
     for instance_data in instance:
         fields = {'key': instance_data}
         processed_fields = handle_special_plugin_fields(
-            fields, plugin_id, importer.method_map)
+            fields, plugin_id, importer.method_map, kwargs.get('_resolver'))
         instances.append(processed_fields['key'])
     return instances
 
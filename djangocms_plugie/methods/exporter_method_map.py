@@ -28,6 +28,7 @@ class ExporterMethodMap(MethodMapBase):
         self.exporter = exporter
         self.load_builtin_methods()
         self.load_custom_methods()
+        self.wrap_methods()
 
     def load_builtin_methods(self) -> None:
         """
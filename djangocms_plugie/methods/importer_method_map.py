@@ -22,6 +22,7 @@ class ImporterMethodMap(MethodMapBase):
         super().__init__(method_name='deserialize')
         self.load_custom_methods()
         self.load_builtin_methods()
+        self.wrap_methods()
 
     def load_builtin_methods(self):
         """
@@ -9,6 +9,11 @@ class MethodBase:
     def deserialize(value: any, **kwargs) -> any:
         raise NotImplementedError("Must implement deserialize method")
 
+    # Optional static method prefetch(values, resolver), called by the importer
+    # with the exported values of the types of the class before a batch of
+    # plugins is deserialized. See djangocms_plugie.importer.resolver.
+    prefetch = None
+
     @property
     def type(self):
         return self.type_name
@@ -2,10 +2,11 @@ import os
 import importlib.util
 import inspect
 import logging
-from typing import Any, Literal, Type, List, Optional
+from typing import Any, Dict, Literal, Type, List, Optional
 from types import ModuleType
 from djangocms_plugie.config import Config
 from djangocms_plugie.methods.method_base import MethodBase
+from djangocms_plugie.methods.method_timer import MethodTimer
 from djangocms_plugie.methods.exceptions import (
     CustomMethodsDirectoryNotFoundError,
     BadMethodNameError,
@@ -28,12 +29,16 @@ class MethodMapBase:
     
     Attributes:
     - method_map: dict, the map of method names to the method functions
+    - prefetch_map: dict, the map of type names to the prefetch methods of the deserializers
     - method_name: str, the method name to load: 'serialize' or 'deserialize'
     - custom_methods_path: str, the path to the custom methods directory
+    - timer: MethodTimer, times the methods if method timing is on in the configuration, else None
     
     Methods:
     - load_custom_methods: Load the custom methods from the custom methods directory
     - load_builtin_methods: Load the built-in methods
+    - wrap_methods: Wrap the loaded methods with the timer
+    - report_method_timings: Log and return the timings of the methods
     - _validate_inputs: Validate the inputs
     - _validate_method_name: Validate the method name
     - _validate_custom_methods_path: Validate the custom methods path
@@ -49,17 +54,23 @@ class MethodMapBase:
     def __init__(
             self,
             method_name: Literal['serialize', 'deserialize'],
-            custom_methods_path: Optional[str]=Config().get_custom_methods_path()
+            custom_methods_path: Optional[str]=None
     ):
         """
         Initialize the MethodMapBase.
 
         :param method_name: str, the method name to load: 'serialize' or 'deserialize'
-        :param custom_methods_path: Optional[str], the path to the custom methods directory
+        :param custom_methods_path: Optional[str], the path to the custom methods directory.
+        Defaults to the 'custom_methods_path' setting
         """
+        config = Config()
         self.method_map = {}
+        self.prefetch_map = {}
         self.method_name = method_name
-        self.custom_methods_path: str = custom_methods_path
+        self.custom_methods_path: str = (
+            custom_methods_path if custom_methods_path is not None else config.get_custom_methods_path()
+        )
+        self.timer = MethodTimer(method_name) if config.get_method_timing() else None
 
     def load_custom_methods(self) -> None:
         """"
@@ -85,6 +96,31 @@ class MethodMapBase:
         """
         raise NotImplementedError
 
+    def wrap_methods(self) -> None:
+        """
+        Wrap the loaded methods, custom and built-in, with the timer, to record
+        their calls, latency and queries per type name. Nothing happens if
+        method timing is off.
+        """
+        if self.timer is None:
+            return
+
+        for type_name, method in self.method_map.items():
+            if getattr(method, 'method_timer', None) is not self.timer:
+                self.method_map[type_name] = self.timer.wrap(type_name, method)
+
+    def report_method_timings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Log the timings of the methods called since the last report, and
+        reset them.
+
+        :return: dict, the calls, total and max latency and queries by type
+        name, or an empty dict if method timing is off
+        """
+        if self.timer is None:
+            return {}
+        return self.timer.log_report()
+
     def _validate_inputs(self) -> None:
         """
         Validate the inputs.
@@ -206,6 +242,8 @@ class MethodMapBase:
         for type_name in cls().type_names:
             self._log_override_if_exists(type_name, module)
             self.method_map[type_name] = getattr(cls, self.method_name)
+            if self.method_name == 'deserialize' and cls.prefetch is not None:
+                self.prefetch_map[type_name] = cls.prefetch
 
     def _log_override_if_exists(self, type_name: str, module: ModuleType) -> None:
         """
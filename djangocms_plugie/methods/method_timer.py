@@ -0,0 +1,99 @@
+import logging
+import time
+from functools import wraps
+from typing import Any, Callable, Dict
+from djangocms_plugie.db import QueryCounter
+
+logger = logging.getLogger(__name__)
+
+
+class MethodStats:
+    """
+    Calls, latency and queries of the method of one type name.
+    """
+    __slots__ = ('calls', 'total_seconds', 'max_seconds', 'queries')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.queries = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'total_seconds': round(self.total_seconds, 6),
+            'max_seconds': round(self.max_seconds, 6),
+            'queries': self.queries,
+        }
+
+
+class MethodTimer:
+    """
+    Times the serialize or deserialize methods of a method map, per type name.
+    The time and the queries of a method include the ones of the methods it
+    calls, e.g. the serializers of the items of a related manager.
+    """
+    def __init__(self, method_name: str):
+        self.method_name = method_name
+        self.stats: Dict[str, MethodStats] = {}
+
+    def wrap(self, type_name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a method to record its calls, latency and queries.
+
+        :param type_name: str, the type name the method is registered for
+        :param method: the method
+
+        :return: the wrapped method
+        """
+        stats = self.stats.setdefault(type_name, MethodStats())
+
+        @wraps(method)
+        def timed_method(*args, **kwargs):
+            queries = QueryCounter()
+            start = time.perf_counter()
+            try:
+                with queries:
+                    return method(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                stats.queries += queries.count
+                stats.calls += 1
+                stats.total_seconds += seconds
+                stats.max_seconds = max(stats.max_seconds, seconds)
+
+        timed_method.method_timer = self
+        return timed_method
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the stats of the methods called since the last report, slowest
+        first, and reset them.
+
+        :return: dict, the stats by type name
+        """
+        report = {
+            type_name: stats.as_dict()
+            for type_name, stats in sorted(self.stats.items(), key=lambda item: -item[1].total_seconds)
+            if stats.calls
+        }
+        for stats in self.stats.values():
+            stats.__init__()
+        return report
+
+    def log_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Log the report of the methods called since the last report.
+
+        :return: dict, the stats by type name
+        """
+        report = self.report()
+        if report:
+            lines = [
+                f"    {type_name}: {stats['calls']} calls, {stats['total_seconds']:.4f}s total, "
+                f"{stats['max_seconds']:.4f}s max, {stats['queries']} queries"
+                for type_name, stats in report.items()
+            ]
+            logger.info(f"{self.method_name} method timings:\n" + "\n".join(lines))
+        return report
@@ -0,0 +1,199 @@
+import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from importlib import import_module
+from typing import Dict, Iterator, List, Optional
+from django.db import DEFAULT_DB_ALIAS
+from djangocms_plugie.config import Config
+from djangocms_plugie.db import QueryCounter
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+_sink = _UNSET
+
+
+class MetricsSink:
+    """
+    Base class of the sinks the metrics of the exports and the imports are
+    reported to. Subclass it and set the dotted path of the subclass as the
+    `metrics.sink` setting of plugie_config.json to send the metrics to a
+    monitoring system.
+    """
+    def report(self, operation: str, counters: Dict[str, int], histograms: Dict[str, List[float]]) -> None:
+        """
+        Report the metrics of one export or import.
+
+        :param operation: str, 'export', 'parse' or 'import'
+        :param counters: dict, the counters by name
+        :param histograms: dict, the observed values by name, e.g. the
+        duration of each batch in a phase
+        """
+        raise NotImplementedError
+
+
+class LoggingSink(MetricsSink):
+    """
+    Log the metrics of each export or import in one line.
+    """
+    def report(self, operation, counters, histograms):
+        summaries = [
+            f"{name}: count={len(values)} total={sum(values):.4f} max={max(values):.4f}"
+            for name, values in sorted(histograms.items())
+        ]
+        logger.info(f"{operation} metrics: {dict(sorted(counters.items()))}; {'; '.join(summaries)}")
+
+
+class InMemorySink(MetricsSink):
+    """
+    Keep the metrics in memory, added up over the reports, e.g. for tests or
+    to expose them from a view.
+    """
+    def __init__(self):
+        self.reports = Counter()
+        self.counters = defaultdict(Counter)
+        self.histograms = defaultdict(lambda: defaultdict(list))
+
+    def report(self, operation, counters, histograms):
+        self.reports[operation] += 1
+        self.counters[operation].update(counters)
+        for name, values in histograms.items():
+            self.histograms[operation][name].extend(values)
+
+    def clear(self):
+        self.reports.clear()
+        self.counters.clear()
+        self.histograms.clear()
+
+
+SINKS = {
+    'logging': LoggingSink,
+    'memory': InMemorySink,
+}
+
+
+class Metrics:
+    """
+    Counters and histograms of one export or import, reported to the sink
+    by `report` when it ends.
+    """
+    enabled = True
+
+    def __init__(self, operation: str, sink: MetricsSink, using: Optional[str] = None):
+        self.operation = operation
+        self.sink = sink
+        self.using = using or DEFAULT_DB_ALIAS
+        self.counters = Counter()
+        self.histograms = defaultdict(list)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        self.histograms[name].append(value)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure the time and the queries of a phase, e.g. 'serialize'.
+        """
+        queries = QueryCounter(self.using)
+        start = time.perf_counter()
+        try:
+            with queries:
+                yield
+        finally:
+            self.observe(f'{name}.seconds', time.perf_counter() - start)
+            self.increment(f'{name}.queries', queries.count)
+
+    def report(self) -> None:
+        """
+        Report the metrics collected since the last report to the sink.
+        """
+        if not self.counters and not self.histograms:
+            return
+        counters, self.counters = dict(self.counters), Counter()
+        histograms, self.histograms = dict(self.histograms), defaultdict(list)
+        try:
+            self.sink.report(self.operation, counters, histograms)
+        except Exception as e:
+            logger.exception(f"Failed to report the {self.operation} metrics: {e}")
+
+
+class NullMetrics:
+    """
+    Metrics used when no sink is configured: every method does nothing.
+    """
+    enabled = False
+    _phase = nullcontext()
+
+    def increment(self, name, value=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+    def phase(self, name):
+        return self._phase
+
+    def report(self):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+def load_sink(path: Optional[str]) -> Optional[MetricsSink]:
+    """
+    Create the sink of a `metrics.sink` setting.
+
+    :param path: str, 'logging', 'memory' or the dotted path of a MetricsSink
+    subclass, or None
+
+    :return: MetricsSink object, or None
+    """
+    if not path:
+        return None
+    sink_class = SINKS.get(path)
+    if sink_class is None:
+        module_name, _, class_name = path.rpartition('.')
+        try:
+            sink_class = getattr(import_module(module_name), class_name)
+        except (ImportError, AttributeError, ValueError) as e:
+            logger.error(f"Cannot load the metrics sink '{path}': {e}")
+            return None
+    return sink_class()
+
+
+def get_sink() -> Optional[MetricsSink]:
+    """
+    Get the sink of the metrics, created from the configuration on first use.
+    """
+    global _sink
+    if _sink is _UNSET:
+        _sink = load_sink(Config().get_metrics_sink())
+    return _sink
+
+
+def set_sink(sink: Optional[MetricsSink]) -> None:
+    """
+    Replace the sink of the metrics, or turn the metrics off with None.
+    """
+    global _sink
+    _sink = sink
+
+
+def get_metrics(operation: str, using: Optional[str] = None):
+    """
+    Get the metrics of a new export or import.
+
+    :param operation: str, 'export', 'parse' or 'import'
+    :param using: str, the database alias to count the queries of
+
+    :return: Metrics object, or NULL_METRICS if no sink is configured
+    """
+    sink = get_sink()
+    if sink is None:
+        return NULL_METRICS
+    return Metrics(operation, sink, using)
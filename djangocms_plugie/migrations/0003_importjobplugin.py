@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0022_auto_20180620_1551'),
+        ('djangocms_plugie', '0002_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJobPlugin',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_id', models.BigIntegerField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imported_plugins', to='djangocms_plugie.importjob')),
+                ('plugin', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cms.cmsplugin')),
+            ],
+            options={
+                'unique_together': {('job', 'source_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_plugie', '0004_importjob_cancellation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='memory',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='memory',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:58
+
+import django.db.models.deletion
+import djangocms_plugie.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0022_auto_20180620_1551'),
+        ('djangocms_plugie', '0006_importjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='import_file',
+            field=models.FileField(upload_to=djangocms_plugie.models.import_file_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='plugin',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cms.cmsplugin'),
+        ),
+    ]
@@ -0,0 +1,140 @@
+import uuid
+from cms.models import CMSPlugin, Placeholder
+from django.conf import settings
+from django.db import models
+
+
+def import_file_upload_to(instance, filename: str) -> str:
+    """
+    Get a random name for the file of an import job, so the uploaded file
+    cannot be found from its original name.
+
+    :param instance: ImportJob object
+    :param filename: str, the name of the uploaded file
+
+    :return: str, the path of the file in the default storage
+    """
+    return f'plugie/imports/import_{uuid.uuid4().hex}.json'
+
+
+class ImportJob(models.Model):
+    """
+    An import of plugins running in the background.
+
+    The uploaded file is stored with the job, and the import is run by a
+    thread of the web process or by the plugie_worker management command.
+    The number of created plugins is updated while the import runs, so the
+    progress can be polled. A running job stops at the next plugin once its
+    cancellation is requested. Its heartbeat is refreshed at every
+    checkpoint, so a job whose runner died can be told from a slow one. With
+    memory tracking on, the peak memory of each phase of the job is saved
+    with it at every checkpoint.
+
+    The import file is deleted once the job is done, or once the import
+    retention is over for the jobs that could still be resumed. Deleting
+    the target plugin deletes the job, so it never imports the plugins to
+    the placeholder instead.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_CANCELLED, 'Cancelled'),
+    ]
+    FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    cancel_requested = models.BooleanField(default=False)
+    placeholder = models.ForeignKey(Placeholder, on_delete=models.CASCADE, related_name='+')
+    plugin = models.ForeignKey(CMSPlugin, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    import_file = models.FileField(upload_to=import_file_upload_to)
+    total_plugins = models.PositiveIntegerField(default=0)
+    created_plugins = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    memory = models.JSONField(default=dict, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Import job {self.pk} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED_STATUSES
+
+
+class ImportJobPlugin(models.Model):
+    """
+    A plugin created by an import job, mapped to the ID it had in the import
+    file. The rows are the checkpoints of the job: they are saved in the same
+    transaction as the plugins they map, so a failed job can be resumed
+    without creating the same plugins twice.
+    """
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name='imported_plugins')
+    source_id = models.BigIntegerField()
+    plugin = models.ForeignKey(CMSPlugin, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = [('job', 'source_id')]
+
+    def __str__(self):
+        return f"Plugin {self.source_id} of import job {self.job_id}"
+
+
+class ExportJob(models.Model):
+    """
+    An export of plugins running in the background, for plugin trees too big
+    to be exported within a request.
+
+    The export file is written to the default storage under a random name,
+    served by the export job download view once the job is done, and deleted
+    once the export retention is over. With memory tracking on,
+    the peak memory of the encoding is saved with the job.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    component_type = models.CharField(max_length=16, choices=[('plugin', 'Plugin'), ('placeholder', 'Placeholder')])
+    component_id = models.PositiveIntegerField()
+    export_file = models.FileField(upload_to='plugie/exports/', blank=True)
+    total_plugins = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    memory = models.JSONField(default=dict, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Export job {self.pk} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED_STATUSES
@@ -0,0 +1,88 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+from functools import wraps
+from typing import Callable, Tuple
+from django.http import HttpRequest, HttpResponse
+from djangocms_plugie.config import Config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAMETER = 'plugie_profile'
+
+
+def should_profile(request: HttpRequest) -> bool:
+    """
+    Check whether a request is profiled: profiling must be enabled in the
+    configuration, and a staff user must ask for it with the `plugie_profile`
+    query parameter.
+
+    :param request: HttpRequest object
+
+    :return: bool, True if the request is profiled
+    """
+    if PROFILE_PARAMETER not in request.GET:
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_staff and Config().get_profiling_enabled())
+
+
+def save_profile(profiler: cProfile.Profile, name: str) -> Tuple[str, str]:
+    """
+    Save a profile, and a summary of its top functions by cumulative time,
+    to the profiling directory of the configuration.
+
+    :param profiler: the cProfile.Profile object
+    :param name: str, the name of the profiled view, used in the file names
+
+    :return: tuple of the paths of the profile and of the summary
+    """
+    config = Config()
+    directory = config.get_profiling_directory()
+    os.makedirs(directory, exist_ok=True)
+    basename = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(profiler)}")
+
+    profile_path = f"{basename}.prof"
+    profiler.dump_stats(profile_path)
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(config.get_profiling_top())
+    summary_path = f"{basename}.txt"
+    with open(summary_path, 'w') as summary_file:
+        summary_file.write(summary.getvalue())
+
+    return profile_path, summary_path
+
+
+def profile_view(view: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+    """
+    Profile a view with cProfile when `should_profile` allows it, and save
+    the profile with `save_profile`. Other requests run the view as it is.
+    """
+    @wraps(view)
+    def profiled_view(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if not should_profile(request):
+            return view(request, *args, **kwargs)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiler is already active in this thread.
+            logger.warning(f"Cannot profile {view.__name__}: {e}")
+            return view(request, *args, **kwargs)
+
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            profiler.disable()
+            try:
+                profile_path, summary_path = save_profile(profiler, view.__name__)
+                logger.info(f"Saved the profile of {view.__name__} to {profile_path} and {summary_path}")
+            except OSError as e:
+                logger.error(f"Failed to save the profile of {view.__name__}: {e}")
+
+    return profiled_view
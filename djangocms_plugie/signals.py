@@ -0,0 +1,87 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, List
+from django.dispatch import Signal
+from cms.models import CMSPlugin, Placeholder
+
+# Sent once per placeholder and language when an import commits, with the
+# arguments `placeholder`, `language` and `plugin_ids`, the IDs of the
+# created plugins. Handlers that index or cache plugin content can listen to
+# it, and wrap their save signal receivers with `skip_during_import`.
+post_import = Signal()
+
+_local = threading.local()
+
+
+def is_suppressed(sender) -> bool:
+    """
+    Check whether the receivers wrapped with `skip_during_import` skip the
+    save signals of a model in the current thread.
+
+    :param sender: the model class sending the signal
+
+    :return: bool, True for the plugin models inside `suppress_plugin_signals`
+    """
+    return (
+        getattr(_local, 'depth', 0) > 0
+        and isinstance(sender, type)
+        and issubclass(sender, CMSPlugin)
+    )
+
+
+def skip_during_import(receiver: Callable) -> Callable:
+    """
+    Wrap a receiver of the pre_save or post_save signal, so it does not run
+    for the plugins an import creates, e.g. a handler indexing each plugin
+    that can handle the post_import signal instead:
+
+        @receiver(post_save)
+        @skip_during_import
+        def index_plugin(sender, instance, **kwargs):
+            ...
+
+    The receiver still runs for the other models, for the plugins saved
+    outside of imports, and for all the plugins if `suppress_plugin_signals`
+    is off in the configuration.
+
+    :param receiver: the receiver function
+
+    :return: the wrapped receiver
+    """
+    @wraps(receiver)
+    def wrapper(sender, **kwargs):
+        if is_suppressed(sender):
+            return None
+        return receiver(sender, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def suppress_plugin_signals() -> Iterator[None]:
+    """
+    Skip the receivers wrapped with `skip_during_import` for the plugin models
+    saved in the current thread, e.g. while an import creates thousands of
+    plugins. The signals themselves are sent as usual, so the receivers that
+    are not wrapped, and the ones of other threads, run for every plugin.
+    """
+    _local.depth = getattr(_local, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+
+
+def invalidate_placeholder(placeholder: Placeholder, language: str, plugin_ids: List[int]) -> None:
+    """
+    Invalidate a placeholder once for all the plugins imported into it:
+    clear its cache, mark its page or static placeholder as dirty, and send
+    the post_import signal.
+
+    :param placeholder: Placeholder object
+    :param language: str, the language of the plugins
+    :param plugin_ids: list of the IDs of the imported plugins
+    """
+    placeholder.mark_as_dirty(language)
+    post_import.send(sender=Placeholder, placeholder=placeholder, language=language, plugin_ids=plugin_ids)
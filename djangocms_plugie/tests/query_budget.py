@@ -0,0 +1,64 @@
+import os
+from djangocms_plugie.db import QueryCounter
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IGNORED_DIRS = (os.path.join(PACKAGE_DIR, 'tests'),)
+IGNORED_FILES = (os.path.join(PACKAGE_DIR, 'db.py'),)
+
+
+def get_code_path(frame):
+    """
+    Get the code path responsible for a query: the innermost function of the
+    package in the stack, e.g. 'exporter.plugin_serializer.serialize_plugin'.
+    """
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if (
+            filename.startswith(PACKAGE_DIR)
+            and not filename.startswith(IGNORED_DIRS)
+            and filename not in IGNORED_FILES
+        ):
+            module = os.path.splitext(os.path.relpath(filename, PACKAGE_DIR))[0].replace(os.sep, '.')
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return '<outside djangocms_plugie>'
+
+
+def count_queries_per_path():
+    """
+    Count the queries of a block per code path.
+
+        with count_queries_per_path() as queries:
+            exporter.serialize_plugins(plugins)
+        queries.per_key  # Counter of the queries per code path
+    """
+    return QueryCounter(key=get_code_path)
+
+
+def check_query_budget(small, large, small_plugins, large_plugins, per_plugin_paths=()):
+    """
+    Compare the queries per code path of two runs over trees of different
+    sizes but the same plugin types. The queries of a code path must not grow
+    with the number of plugins, except for the paths of `per_plugin_paths`,
+    which may grow at most linearly.
+
+    :param small: Counter, the queries per code path of the small tree
+    :param large: Counter, the queries per code path of the large tree
+    :param small_plugins: int, the number of plugins of the small tree
+    :param large_plugins: int, the number of plugins of the large tree
+    :param per_plugin_paths: the code paths allowed to query once per plugin
+
+    :return: list of str, a message per code path over budget
+    """
+    errors = []
+    for path in sorted(set(small) | set(large)):
+        if path in per_plugin_paths:
+            budget = small[path] * large_plugins / small_plugins
+        else:
+            budget = small[path]
+        if large[path] > budget:
+            errors.append(
+                f"{path}: {small[path]} queries for {small_plugins} plugins, "
+                f"{large[path]} for {large_plugins} plugins (budget {budget:g})"
+            )
+    return errors
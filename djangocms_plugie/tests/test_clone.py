@@ -0,0 +1,68 @@
+from unittest.mock import patch
+from django.test import TestCase
+from cms.api import add_plugin
+from cms.models import CMSPlugin, Placeholder
+from djangocms_plugie.clone import clone_plugin_tree
+from djangocms_plugie.forms import CloneForm
+
+
+PLUGIN_TYPE = 'PlugiePlugin'
+LANGUAGE = 'en'
+
+
+class TestClonePluginTree(TestCase):
+    def setUp(self):
+        self.source = Placeholder.objects.create(slot="source")
+        self.parent = add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(self.source, PLUGIN_TYPE, LANGUAGE, target=self.parent)
+        self.target = Placeholder.objects.create(slot="target")
+
+    def test_clone_placeholder(self):
+        importer = clone_plugin_tree('placeholder', self.source.id, placeholder=self.target)
+        self.assertEqual(importer.created_count, 2)
+
+        cloned = CMSPlugin.objects.filter(placeholder=self.target)
+        self.assertEqual(cloned.count(), 2)
+        self.assertEqual(cloned.filter(parent__isnull=True).count(), 1)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.source).count(), 2)
+
+    def test_clone_skips_meta_validation(self):
+        with patch('djangocms_plugie.utils.validate_plugin_meta') as validate_plugin_meta:
+            clone_plugin_tree('placeholder', self.source.id, placeholder=self.target)
+        validate_plugin_meta.assert_not_called()
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+    def test_clone_plugin(self):
+        clone_plugin_tree('plugin', self.parent.id, placeholder=self.target)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+    def test_clone_without_target(self):
+        with self.assertRaises(ValueError):
+            clone_plugin_tree('placeholder', self.source.id)
+
+
+class TestCloneForm(TestCase):
+    def setUp(self):
+        self.source = Placeholder.objects.create(slot="source")
+        add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+        self.target = Placeholder.objects.create(slot="target")
+
+    def setup_form(self, source_type, source_id):
+        data = {
+            'placeholder': self.target.id,
+            'source_type': source_type,
+            'source_id': source_id,
+        }
+        return CloneForm(data=data, initial={'placeholder': self.target, 'plugin': None})
+
+    def test_clone_form(self):
+        form = self.setup_form('placeholder', self.source.id)
+        self.assertTrue(form.is_valid())
+        form.run_clone()
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 1)
+
+    def test_clone_form_empty_source(self):
+        form = self.setup_form('placeholder', self.target.id)
+        self.assertFalse(form.is_valid())
+        error_message = "The source placeholder has no plugins to clone."
+        self.assertTrue(any(error_message in error for error in form.errors.values()))
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from cms.api import add_plugin
+from cms.models import Placeholder
+from djangocms_plugie.cms_plugin import PlugiePlugin, allows_children, plugin_menu_item
+
+
+PLUGIN_TYPE = 'PlugiePlugin'
+LANGUAGE = 'en'
+
+
+class TestMenuItems(TestCase):
+    def setUp(self):
+        allows_children.cache_clear()
+        self.request = RequestFactory().get('/')
+        self.placeholder = Placeholder.objects.create(slot="test")
+
+    def test_menu_item_urls(self):
+        for operation in ('export', 'import'):
+            for component_type in ('plugin', 'placeholder'):
+                url = reverse(f"{operation}_component_data",
+                              kwargs={"component_type": component_type, "component_id": 42})
+                self.assertEqual(plugin_menu_item(operation, component_type, 42).url, url)
+
+    def test_plugin_menu_items(self):
+        plugins = [add_plugin(self.placeholder, PLUGIN_TYPE, LANGUAGE) for _ in range(3)]
+        with patch('djangocms_plugie.cms_plugin.reverse', wraps=reverse) as reverse_mock:
+            menus = [PlugiePlugin.get_extra_plugin_menu_items(self.request, plugin) for plugin in plugins]
+
+        # PlugiePlugin does not allow children, so only the export item is added.
+        self.assertEqual([[item.url for item in menu] for menu in menus], [
+            [reverse("export_component_data", kwargs={"component_type": "plugin", "component_id": plugin.pk})]
+            for plugin in plugins
+        ])
+        self.assertEqual(reverse_mock.call_count, 1)
+        self.assertEqual(allows_children.cache_info().currsize, 1)
+
+    def test_menu_items_follow_url_changes(self):
+        plugin = add_plugin(self.placeholder, PLUGIN_TYPE, LANGUAGE)
+        PlugiePlugin.get_extra_plugin_menu_items(self.request, plugin)
+        with patch('djangocms_plugie.cms_plugin.reverse', return_value="/moved/__component_id__/"):
+            menu = PlugiePlugin.get_extra_plugin_menu_items(RequestFactory().get('/'), plugin)
+        self.assertEqual(menu[0].url, f"/moved/{plugin.pk}/")
+
+    def test_placeholder_menu_items(self):
+        menu = PlugiePlugin.get_extra_placeholder_menu_items(self.request, self.placeholder)
+        self.assertEqual([item.name for item in menu], ["Export Plugins", "Import Plugins"])
+        self.assertEqual([item.action for item in menu], ["none", "modal"])
+        self.assertTrue(menu[1].url.endswith(f"import_placeholder/{self.placeholder.pk}/"))
@@ -0,0 +1,261 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from unittest import skipUnless
+from django.conf import settings
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
+from cms.api import add_plugin
+from cms.models import CMSPlugin, Placeholder
+from djangocms_plugie.benchmark import generate_import_data
+from djangocms_plugie.db import ROUTER_PATH, use_database
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.importer.staging import STAGING_SLOT_PREFIX, create_staging_placeholder
+from djangocms_plugie.management.commands.plugie_import import import_placeholder
+from djangocms_plugie.management.workers import run_in_workers
+from djangocms_plugie.utils import build_import_plan, initialize_and_run_importer
+
+
+PLUGIN_TYPE = 'PlugiePlugin'
+LANGUAGE = 'en'
+
+
+def square_in_process(number):
+    return number * number, os.getpid()
+
+
+class TestRunInWorkers(SimpleTestCase):
+    def test_run_in_worker_processes(self):
+        # The task does not use the database, which is in memory in the tests
+        # and cannot be shared with the worker processes.
+        results = list(run_in_workers(square_in_process, range(6), workers=2))
+        self.assertEqual([square for square, _ in results], [0, 1, 4, 9, 16, 25])
+        self.assertNotIn(os.getpid(), {pid for _, pid in results})
+
+    def test_run_in_current_process(self):
+        results = list(run_in_workers(square_in_process, range(3), workers=1))
+        self.assertEqual(results, [(0, os.getpid()), (1, os.getpid()), (4, os.getpid())])
+
+
+class TestPlugieExportCommand(TestCase):
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot="test")
+        parent = add_plugin(self.placeholder, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(self.placeholder, PLUGIN_TYPE, LANGUAGE, target=parent)
+        self.empty_placeholder = Placeholder.objects.create(slot="empty")
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def call_export(self, *args):
+        call_command('plugie_export', self.output_dir, *args, '--workers', '1', stdout=StringIO())
+        with open(os.path.join(self.output_dir, 'manifest.json')) as file:
+            return json.load(file)
+
+    def test_export_placeholders(self):
+        manifest = self.call_export('--placeholders', str(self.placeholder.id))
+        self.assertEqual(len(manifest['placeholders']), 1)
+        entry = manifest['placeholders'][0]
+        self.assertEqual(entry['placeholder'], self.placeholder.id)
+        self.assertEqual(entry['slot'], "test")
+        self.assertEqual(entry['plugins'], 2)
+
+        with open(os.path.join(self.output_dir, entry['file'])) as file:
+            data = json.load(file)
+        self.assertEqual(data['version'], manifest['version'])
+        self.assertEqual(len(data['all_plugins']), 2)
+
+    def test_export_all_skips_empty_placeholders(self):
+        manifest = self.call_export('--all')
+        exported = [entry['placeholder'] for entry in manifest['placeholders']]
+        self.assertIn(self.placeholder.id, exported)
+        self.assertNotIn(self.empty_placeholder.id, exported)
+
+    def test_export_requires_a_selection(self):
+        with self.assertRaises(CommandError):
+            self.call_export()
+
+
+class TestPlugieImportCommand(TestCase):
+    def setUp(self):
+        self.source = Placeholder.objects.create(slot="source")
+        parent = add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(self.source, PLUGIN_TYPE, LANGUAGE, target=parent)
+        self.target = Placeholder.objects.create(slot="target")
+        self.export_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.export_dir)
+        call_command('plugie_export', self.export_dir, '--placeholders', str(self.source.id),
+                     '--workers', '1', stdout=StringIO())
+
+    def call_import(self, *args):
+        stdout = StringIO()
+        call_command('plugie_import', *args, '--workers', '1', stdout=stdout)
+        return stdout.getvalue()
+
+    def test_import_manifest_by_source_placeholder(self):
+        output = self.call_import(self.export_dir, '--map', f"{self.source.id}={self.target.id}")
+        self.assertIn("Imported 2 plugins", output)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+        child = CMSPlugin.objects.get(placeholder=self.target, parent__isnull=False)
+        self.assertEqual(child.parent.placeholder, self.target)
+
+    def test_import_file_by_name(self):
+        path = os.path.join(self.export_dir, f"placeholder_{self.source.id}.json")
+        self.call_import(path, '--map', f"placeholder_{self.source.id}.json={self.target.id}")
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+    @patch('djangocms_plugie.config.Config.get_memory_tracking', return_value=True)
+    def test_import_reports_memory_per_file(self, _):
+        filename = f"placeholder_{self.source.id}.json"
+        with self.assertLogs('djangocms_plugie.memory', 'INFO') as logs:
+            self.call_import(self.export_dir, '--map', f"{filename}={self.target.id}")
+        self.assertIn(f"INFO:djangocms_plugie.memory:import of {filename} parse phase started", logs.output)
+        self.assertIn(f"import of {filename} peak memory:", logs.output[-1])
+
+    def test_conflicting_import_is_retried(self):
+        # A concurrent worker took the tree path of the first root plugin.
+        calls = []
+
+        def conflict_once(data):
+            calls.append(data)
+            if len(calls) == 1:
+                raise IntegrityError("duplicate key value violates unique constraint on path")
+            return initialize_and_run_importer(data)
+
+        task = (self.target.id, [os.path.join(self.export_dir, f"placeholder_{self.source.id}.json")])
+        with patch('djangocms_plugie.management.commands.plugie_import.RETRY_DELAY', 0), \
+                patch('djangocms_plugie.management.commands.plugie_import.initialize_and_run_importer',
+                      side_effect=conflict_once):
+            self.assertIn("error", import_placeholder(task, retries=0))
+            calls.clear()
+            result = import_placeholder(task, retries=1)
+
+        self.assertEqual(result, {'placeholder': self.target.id, 'files': 1, 'plugins': 2})
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+    def test_import_without_mapping(self):
+        with self.assertRaises(CommandError):
+            self.call_import(self.export_dir)
+
+
+@skipUnless('other' in settings.DATABASES, "requires an 'other' database")
+@override_settings(DATABASE_ROUTERS=[ROUTER_PATH])
+class TestPlugieSyncCommand(TestCase):
+    databases = {'default', 'other'}
+
+    def setUp(self):
+        self.source = Placeholder.objects.using('other').create(slot="source")
+        with use_database('other'):
+            parent = add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+            child = add_plugin(self.source, PLUGIN_TYPE, LANGUAGE, target=parent)
+            add_plugin(self.source, PLUGIN_TYPE, LANGUAGE, target=child)
+            add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+        self.target = Placeholder.objects.create(slot="target")
+
+    def call_sync(self, *args):
+        stdout = StringIO()
+        call_command('plugie_sync', '--source-db', 'other', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def get_tree(self, placeholder, using):
+        plugins = CMSPlugin.objects.using(using).filter(placeholder=placeholder).order_by('path')
+        return [(plugin.depth, plugin.position) for plugin in plugins]
+
+    def test_sync_placeholder(self):
+        # With one plugin per chunk, every parent is imported in an earlier
+        # chunk than its children.
+        output = self.call_sync('--map', f"{self.source.id}={self.target.id}", '--chunk-size', '1')
+
+        self.assertIn(f"Copied 4 plugins from placeholder {self.source.id} to placeholder {self.target.id}.", output)
+        self.assertEqual(self.get_tree(self.target, 'default'), self.get_tree(self.source, 'other'))
+        self.assertEqual(self.get_tree(self.target, 'default'), [(1, 0), (2, 0), (3, 0), (1, 1)])
+        self.assertEqual(CMSPlugin.objects.using('other').count(), 4)
+        self.assertEqual(CMSPlugin.find_problems(), ([], [], [], [], []))
+
+    def test_sync_with_wrong_numchild(self):
+        CMSPlugin.objects.using('other').filter(placeholder=self.source).update(numchild=0)
+        self.call_sync('--map', f"{self.source.id}={self.target.id}", '--chunk-size', '1')
+
+        self.assertEqual(self.get_tree(self.target, 'default'), [(1, 0), (2, 0), (3, 0), (1, 1)])
+
+    def test_sync_missing_target(self):
+        with self.assertRaisesRegex(CommandError, "does not exist in database 'default'"):
+            self.call_sync('--map', f"{self.source.id}=0")
+
+    def test_sync_same_database(self):
+        with self.assertRaisesRegex(CommandError, "must be different"):
+            self.call_sync('--target-db', 'other', '--map', f"{self.source.id}={self.target.id}")
+
+
+class TestPlugiePlanCommand(TestCase):
+    def setUp(self):
+        placeholder = Placeholder.objects.create(slot="test")
+        parent = add_plugin(placeholder, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(placeholder, PLUGIN_TYPE, LANGUAGE, target=parent)
+        self.import_data = Exporter().get_export_data(get_plugin_tree('placeholder', placeholder.id))
+        self.source_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source_dir)
+
+    def write_file(self, name, data):
+        path = os.path.join(self.source_dir, name)
+        with open(path, 'w') as file:
+            json.dump(data, file)
+        return path
+
+    def test_plan(self):
+        path = self.write_file('plugins.json', self.import_data)
+        stdout = StringIO()
+        call_command('plugie_plan', path, '--json', stdout=stdout)
+        plan = json.loads(stdout.getvalue())['plans'][path]
+        self.assertEqual(plan['plugins_per_type'], {PLUGIN_TYPE: 2})
+
+    def test_plan_invalid_plugin(self):
+        self.import_data['all_plugins'][0]['meta']['plugin_type'] = 'inexisting_plugin'
+        path = self.write_file('plugins.json', self.import_data)
+        with self.assertRaisesRegex(CommandError, "1 files would not import"):
+            call_command('plugie_plan', path, stdout=StringIO(), stderr=StringIO())
+
+
+class TestPlugieCleanupStagingCommand(TestCase):
+    def test_cleanup_staging(self):
+        Placeholder.objects.create(slot=f"{STAGING_SLOT_PREFIX}1-{'0' * 32}")
+        running = create_staging_placeholder()
+        stdout = StringIO()
+        call_command('plugie_cleanup_staging', '--older-than', '3600', stdout=stdout)
+        self.assertIn("Deleted 1 staging placeholders.", stdout.getvalue())
+        self.assertEqual(list(Placeholder.objects.filter(slot__startswith=STAGING_SLOT_PREFIX)), [running])
+
+
+class TestPlugieBenchmarkCommand(TestCase):
+    def test_generate_import_data(self):
+        all_plugins = generate_import_data(10, depth=2, fan_out=3)["all_plugins"]
+        self.assertEqual(len(all_plugins), 10)
+        self.assertEqual([plugin["meta"]["parent"] for plugin in all_plugins], [None, 1, 1, 1, None, 5, 5, 5, None, 9])
+        self.assertEqual(len(build_import_plan(all_plugins)), 10)
+
+    def test_benchmark(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'baseline.json')
+        stdout = StringIO()
+        call_command('plugie_benchmark', '--sizes', '5', '--output', output, stdout=StringIO())
+        call_command('plugie_benchmark', '--sizes', '5', '--no-memory', '--compare', output, stdout=stdout)
+
+        with open(output) as file:
+            baseline = json.load(file)
+        phases = baseline["runs"][0]["phases"]
+        self.assertEqual(set(phases), {"export", "parse", "import"})
+        self.assertEqual(phases["parse"]["queries"], 0)
+        self.assertGreater(phases["import"]["peak_memory"], 0)
+        self.assertIn("5 plugins, import: seconds x", stdout.getvalue())
+        self.assertFalse(CMSPlugin.objects.exists())
+        self.assertFalse(Placeholder.objects.exists())
+
+    def test_benchmark_missing_baseline(self):
+        with self.assertRaisesRegex(CommandError, "Cannot load the baseline"):
+            call_command('plugie_benchmark', '--sizes', '5', '--compare', '/nonexistent.json', stdout=StringIO())
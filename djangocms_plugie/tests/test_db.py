@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock, call, patch
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase
+from cms.api import add_plugin
+from cms.models import Placeholder
+from djangocms_plugie.db import PLUGIN_TREE_LOCK_ID, get_current_database, lock_plugin_tree, use_database
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+
+
+class TestUseDatabase(TestCase):
+    def test_use_database_none(self):
+        with use_database(None):
+            self.assertIsNone(get_current_database())
+
+    def test_use_database_restores_previous_alias(self):
+        with use_database(DEFAULT_DB_ALIAS):
+            self.assertEqual(get_current_database(), DEFAULT_DB_ALIAS)
+        self.assertIsNone(get_current_database())
+
+    def test_use_database_not_routed(self):
+        with self.assertRaises(ImproperlyConfigured):
+            with use_database('not_routed'):
+                pass
+        self.assertIsNone(get_current_database())
+
+
+class TestLockPluginTree(TestCase):
+    def test_lock_is_released_after_the_block(self):
+        connection = MagicMock(vendor='postgresql')
+        cursor = connection.cursor.return_value.__enter__.return_value
+        with patch('djangocms_plugie.db.connections', {DEFAULT_DB_ALIAS: connection}):
+            with self.assertRaises(RuntimeError):
+                with lock_plugin_tree():
+                    self.assertEqual(cursor.execute.call_args_list, [
+                        call('SELECT pg_advisory_lock(%s)', [PLUGIN_TREE_LOCK_ID]),
+                    ])
+                    raise RuntimeError
+        self.assertEqual(cursor.execute.call_args_list[1], call('SELECT pg_advisory_unlock(%s)', [PLUGIN_TREE_LOCK_ID]))
+
+    def test_sqlite_is_not_locked(self):
+        with self.assertNumQueries(0):
+            with lock_plugin_tree():
+                pass
+
+
+class TestExporterUsing(TestCase):
+    def test_serialize_plugins_using_default(self):
+        placeholder = Placeholder.objects.create(slot="test")
+        add_plugin(placeholder, 'PlugiePlugin', 'en')
+        exporter = Exporter(using=DEFAULT_DB_ALIAS)
+        plugin_tree = get_plugin_tree('placeholder', placeholder.id, using=exporter.using)
+        self.assertEqual(len(exporter.serialize_plugins(plugin_tree)), 1)
+
+    @patch('djangocms_plugie.exporter.exporter.Config')
+    def test_exporter_uses_export_database(self, config):
+        config.return_value.get_export_database.return_value = 'replica'
+        self.assertEqual(Exporter().using, 'replica')
+        self.assertEqual(Exporter(using=DEFAULT_DB_ALIAS).using, DEFAULT_DB_ALIAS)
@@ -1,7 +1,24 @@
 import json
+import threading
+from unittest.mock import MagicMock, patch
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_save
 from django.test import TestCase
-from cms.models import Placeholder
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from cms.api import add_plugin
+from cms.models import CMSPlugin, Placeholder
+from djangocms_plugie.cms_plugin import PlugiePlugin
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
 from djangocms_plugie.importer.version0.importer import Importer
+from djangocms_plugie.importer.plugin_context import InvalidPluginError
+from djangocms_plugie.importer.staging import (
+    STAGING_SLOT_PREFIX, create_staging_placeholder, delete_stale_staging_placeholders, discard_staging_placeholder
+)
+from djangocms_plugie.importer.type_plan import TypePlan
+from djangocms_plugie.importer.resolver import ResolutionCache
+from djangocms_plugie.signals import is_suppressed, post_import, skip_during_import, suppress_plugin_signals
+from djangocms_plugie.utils import build_import_plan
 from .filemetadata import FileMetadata
 
 
@@ -39,4 +56,351 @@ class TestImporterVersion0(TestCase):
     def test_import_plugins_non_existing_plugin(self):
         with self.assertRaisesRegex(TypeError, r"A plugin doesn't exist. Plugin: inexisting_plugin"):
             self.set_up_data("bad_data", "inexisting_plugin.json")
-            self.importer.import_plugins_to_target()
\ No newline at end of file
+            self.importer.import_plugins_to_target()
+
+    def test_plan_import_non_existing_plugin(self):
+        with self.assertRaisesRegex(TypeError, r"A plugin doesn't exist. Plugin: inexisting_plugin"):
+            self.set_up_data("bad_data", "inexisting_plugin.json")
+            self.importer.plan_import()
+
+    def test_plan_import(self):
+        source = Placeholder.objects.create(slot="source")
+        parent = add_plugin(source, "PlugiePlugin", "en")
+        child = add_plugin(source, "PlugiePlugin", "en", target=parent)
+        add_plugin(source, "PlugiePlugin", "en", target=child)
+        import_data = Exporter().get_export_data(get_plugin_tree("placeholder", source.id))
+
+        target = Placeholder.objects.create(slot=SLOT_NAME)
+        self.importer = Importer(data={"plugin": None, "placeholder": target, "import_data": import_data})
+
+        with self.assertNumQueries(0):
+            plan = self.importer.plan_import()
+
+        self.assertEqual(plan["plugins"], 3)
+        self.assertEqual(plan["plugins_per_type"], {"PlugiePlugin": 3})
+        self.assertEqual(plan["related_rows"], 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.importer.import_plugins_to_target()
+        row_writes = [query for query in queries.captured_queries if query["sql"].startswith(("INSERT", "UPDATE"))]
+        self.assertEqual(plan["row_writes"], len(row_writes))
+
+
+class TestPluginMap(TestCase):
+    def setUp(self):
+        self.all_plugins = [
+            {"meta": {"id": 1, "parent": None, "position": 0, "plugin_type": "PlugiePlugin", "language": "en"}},
+            {"meta": {"id": 2, "parent": 1, "position": 0, "plugin_type": "PlugiePlugin", "language": "en"}},
+            {"meta": {"id": 3, "parent": 1, "position": 1, "plugin_type": "PlugiePlugin", "language": "en"}},
+            {"meta": {"id": 4, "parent": None, "position": 1, "plugin_type": "PlugiePlugin", "language": "en"}},
+        ]
+        self.importer = Importer(data={
+            "plugin": None,
+            "placeholder": Placeholder.objects.create(slot=SLOT_NAME),
+            "import_data": {"version": "0.0.0", "all_plugins": self.all_plugins},
+        })
+
+    def test_parents_are_kept_until_their_last_child(self):
+        plugins = build_import_plan(self.all_plugins).plugins
+        self.assertEqual([record.source_id for record in plugins], [1, 4, 2, 3])
+
+        created_plugin_ids = self.importer.import_plugins(plugins[:3])
+        self.assertEqual(list(self.importer.plugin_map), [1])
+        self.assertEqual(self.importer.remaining_children, {1: 1})
+
+        created_plugin_ids.update(self.importer.import_plugins(plugins[3:]))
+        self.assertEqual((self.importer.plugin_map, self.importer.created_count), ({}, 4))
+        self.assertEqual(
+            CMSPlugin.objects.get(pk=created_plugin_ids[3]).parent_id,
+            created_plugin_ids[1],
+        )
+
+    def test_config_is_not_read_per_plugin(self):
+        plugins = build_import_plan(self.all_plugins).plugins
+        with patch('djangocms_plugie.importer.plugin_context.Config') as config:
+            self.importer.import_plugins(plugins)
+        config.assert_not_called()
+
+    def test_unknown_child_counts(self):
+        plugins = build_import_plan(self.all_plugins[:2], child_counts={}).plugins
+        self.importer.import_plugins(plugins)
+        self.assertEqual(list(self.importer.plugin_map), [1, 2])
+
+    def test_resume(self):
+        plugins = build_import_plan(self.all_plugins).plugins
+        created_plugin_ids = self.importer.import_plugins(plugins[:3])
+
+        importer = Importer(data=self.importer.data)
+        pending = importer.resume(plugins, created_plugin_ids)
+        self.assertEqual([record.source_id for record in pending], [3])
+        self.assertEqual(importer.plugin_map[1].pk, created_plugin_ids[1])
+        importer.import_plugins(pending)
+        self.assertEqual((importer.plugin_map, importer.created_count), ({}, 4))
+        self.assertEqual(CMSPlugin.objects.get(pk=created_plugin_ids[1]).get_children().count(), 2)
+
+
+class TestTypePlan(TestCase):
+    def setUp(self):
+        self.deserializer = MagicMock(return_value="deserialized")
+        self.type_plan = TypePlan("PlugiePlugin", CMSPlugin, {"custom": self.deserializer})
+
+    def test_split_and_deserialize(self):
+        fields = {
+            "language": "en",
+            "position": {"_type": "custom", "_value": 1, "other": 2},
+            "unknown": "dropped",
+            "children": {"_type": "relatedmanager", "_list": []},
+        }
+        with self.assertLogs("djangocms_plugie.importer.type_plan", level="WARNING") as logs:
+            for _ in range(3):
+                non_relation_fields, relation_fields = self.type_plan.split_fields(fields)
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(list(non_relation_fields), ["language", "position"])
+        self.assertEqual(list(relation_fields), ["children"])
+
+        deserialized = self.type_plan.deserialize(non_relation_fields, 7)
+        self.assertEqual(deserialized, {"language": "en", "position": "deserialized"})
+        self.deserializer.assert_called_once_with(_value=1, _plugin_id=7)
+
+    def test_recompile_on_shape_change(self):
+        self.type_plan.split_fields({"position": {"_type": "custom", "_value": 1}})
+        non_relation_fields, _ = self.type_plan.split_fields({"position": 3})
+        self.assertEqual(self.type_plan.deserialize(non_relation_fields, None), {"position": 3})
+        self.deserializer.assert_not_called()
+
+    def test_missing_deserializer(self):
+        non_relation_fields, _ = self.type_plan.split_fields({"position": {"_type": "missing"}})
+        with self.assertRaisesRegex(ValueError, 'No deserialize method found for type "missing"'):
+            self.type_plan.deserialize(non_relation_fields, None)
+
+
+class TestResolutionCache(TestCase):
+    def setUp(self):
+        self.placeholders = [Placeholder.objects.create(slot=f"slot{i}") for i in range(3)]
+
+    def test_get_is_memoized(self):
+        resolver = ResolutionCache()
+        with self.assertNumQueries(2):
+            for _ in range(3):
+                self.assertEqual(resolver.get(Placeholder, self.placeholders[0].pk), self.placeholders[0])
+                self.assertIsNone(resolver.get(Placeholder, 0))
+
+    def test_prefetch(self):
+        resolver = ResolutionCache()
+        with self.assertNumQueries(1):
+            resolver.prefetch(Placeholder, [placeholder.slot for placeholder in self.placeholders], field="slot")
+            for placeholder in self.placeholders:
+                self.assertEqual(resolver.get(Placeholder, placeholder.slot, field="slot"), placeholder)
+
+    def test_importer_prefetch(self):
+        slot = self.placeholders[0].slot
+        import_data = {"version": "0.0.0", "all_plugins": [
+            {
+                "meta": {"id": plugin_id, "parent": None, "position": plugin_id, "plugin_type": "PlugiePlugin"},
+                "creation_date": {"_type": "slot_date", "_slot": slot},
+            }
+            for plugin_id in range(1, 5)
+        ]}
+
+        resolved = []
+
+        def deserialize(**kwargs):
+            resolved.append(kwargs["_resolver"].get(Placeholder, kwargs["_slot"], field="slot"))
+            return timezone.now()
+
+        def prefetch(values, resolver):
+            resolver.prefetch(Placeholder, [value["_slot"] for value in values], field="slot")
+
+        target = Placeholder.objects.create(slot=SLOT_NAME)
+        importer = Importer(data={"plugin": None, "placeholder": target, "import_data": import_data})
+        importer.method_map["slot_date"] = deserialize
+        importer.prefetch_map["slot_date"] = prefetch
+
+        with CaptureQueriesContext(connection) as queries:
+            importer.import_plugins_to_target()
+        slot_queries = [query for query in queries.captured_queries if '"cms_placeholder"."slot"' in query["sql"]]
+        self.assertEqual(len(slot_queries), 1)
+        self.assertEqual(resolved, [self.placeholders[0]] * 4)
+
+
+class TestImportSignals(TestCase):
+    def setUp(self):
+        self.import_data = {"version": "0.0.0", "all_plugins": [
+            {"meta": {"id": 1, "parent": None, "position": 0, "plugin_type": "PlugiePlugin", "language": "en"}},
+            {"meta": {"id": 2, "parent": 1, "position": 0, "plugin_type": "PlugiePlugin", "language": "en"}},
+            {"meta": {"id": 3, "parent": None, "position": 1, "plugin_type": "PlugiePlugin", "language": "de"}},
+        ]}
+        self.target = Placeholder.objects.create(slot=SLOT_NAME)
+        self.saved = []
+        self.skippable_saved = []
+        self.imported = []
+        self.on_skippable_save = skip_during_import(self.on_save_skippable)
+        post_save.connect(self.on_save)
+        post_save.connect(self.on_skippable_save)
+        post_import.connect(self.on_import)
+        self.addCleanup(post_save.disconnect, self.on_save)
+        self.addCleanup(post_save.disconnect, self.on_skippable_save)
+        self.addCleanup(post_import.disconnect, self.on_import)
+
+    def on_save(self, sender, **kwargs):
+        if issubclass(sender, CMSPlugin):
+            self.saved.append(kwargs["instance"])
+
+    def on_save_skippable(self, sender, **kwargs):
+        self.skippable_saved.append(kwargs["instance"])
+
+    def on_import(self, sender, **kwargs):
+        self.imported.append((kwargs["placeholder"], kwargs["language"], kwargs["plugin_ids"]))
+
+    def test_signals_are_consolidated(self):
+        importer = Importer(data={"plugin": None, "placeholder": self.target, "import_data": self.import_data})
+        importer.suppress_signals = True
+        with self.captureOnCommitCallbacks(execute=True):
+            importer.import_plugins_to_target()
+            self.assertEqual(self.imported, [])
+
+        self.assertEqual(len(self.saved), 6)
+        self.assertEqual(self.skippable_saved, [])
+        plugin_ids = {
+            language: list(CMSPlugin.objects.filter(placeholder=self.target, language=language)
+                           .order_by("pk").values_list("pk", flat=True))
+            for language in ("en", "de")
+        }
+        self.assertCountEqual(self.imported, [(self.target, "en", plugin_ids["en"]), (self.target, "de", plugin_ids["de"])])
+
+    def test_skipped_receivers_run_outside_imports(self):
+        with suppress_plugin_signals():
+            self.target.save()
+        plugin = add_plugin(self.target, "PlugiePlugin", "en")
+        self.assertEqual(self.skippable_saved[0], self.target)
+        self.assertIn(plugin, self.skippable_saved)
+
+    def test_rolled_back_plugins_are_not_invalidated(self):
+        importer = Importer(data={"plugin": None, "placeholder": self.target, "import_data": self.import_data})
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    importer.import_plugins_to_target()
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+
+        self.assertEqual(self.imported, [])
+
+    def test_signals_are_not_suppressed_by_default(self):
+        importer = Importer(data={"plugin": None, "placeholder": self.target, "import_data": self.import_data})
+        self.assertFalse(importer.suppress_signals)
+        with self.captureOnCommitCallbacks(execute=True):
+            importer.import_plugins_to_target()
+        self.assertEqual((len(self.saved), len(self.skippable_saved)), (6, 6))
+        self.assertEqual(len(self.imported), 2)
+
+    def test_suppression_is_per_thread(self):
+        suppressed = []
+        with suppress_plugin_signals():
+            suppressed.append(is_suppressed(CMSPlugin))
+            thread = threading.Thread(target=lambda: suppressed.append(is_suppressed(CMSPlugin)))
+            thread.start()
+            thread.join()
+        suppressed.append(is_suppressed(CMSPlugin))
+        self.assertEqual(suppressed, [True, False, False])
+
+
+class TestStagedImport(TestCase):
+    def setUp(self):
+        self.import_data = {"version": "0.0.0", "all_plugins": [
+            {"meta": {"id": 1, "parent": None, "position": 0, "plugin_type": "PlugiePlugin", "language": "en"}},
+            {"meta": {"id": 2, "parent": 1, "position": 0, "plugin_type": "PlugiePlugin", "language": "en"}},
+            {"meta": {"id": 3, "parent": None, "position": 1, "plugin_type": "PlugiePlugin", "language": "en"}},
+        ]}
+        self.target = Placeholder.objects.create(slot=SLOT_NAME)
+        self.existing = add_plugin(self.target, "PlugiePlugin", "en")
+        self.imported = []
+        post_import.connect(self.on_import)
+        self.addCleanup(post_import.disconnect, self.on_import)
+
+    def on_import(self, sender, **kwargs):
+        self.imported.append((kwargs["placeholder"], kwargs["language"], len(kwargs["plugin_ids"])))
+
+    def import_staged(self, target_plugin=None):
+        importer = Importer(data={
+            "plugin": target_plugin,
+            "placeholder": self.target,
+            "import_data": self.import_data,
+            "staging": True,
+        })
+        with self.captureOnCommitCallbacks(execute=True):
+            importer.import_plugins_to_target()
+        return importer
+
+    def assert_tree_is_valid(self):
+        self.assertEqual(CMSPlugin.find_problems(), ([], [], [], [], []))
+        self.assertFalse(Placeholder.objects.filter(slot__startswith=STAGING_SLOT_PREFIX).exists())
+
+    def test_staged_import_to_placeholder(self):
+        importer = self.import_staged()
+
+        roots = list(CMSPlugin.objects.filter(placeholder=self.target, parent__isnull=True).order_by("position"))
+        self.assertEqual([(plugin.pk, plugin.position) for plugin in roots][:1], [(self.existing.pk, 0)])
+        self.assertEqual([plugin.position for plugin in roots], [0, 1, 2])
+        self.assertEqual([plugin.get_children().count() for plugin in roots], [0, 1, 0])
+        self.assertEqual((importer.created_count, importer.plugin_map), (3, {}))
+        self.assertEqual(self.imported, [(self.target, "en", 3)])
+        self.assert_tree_is_valid()
+
+    @patch.object(PlugiePlugin, "allow_children", True)
+    def test_staged_import_to_plugin(self):
+        add_plugin(self.target, "PlugiePlugin", "en", target=self.existing)
+        self.import_staged(self.existing)
+
+        children = CMSPlugin.objects.get(pk=self.existing.pk).get_children()
+        self.assertEqual([plugin.position for plugin in children], [0, 1, 2])
+        self.assertEqual({plugin.placeholder_id for plugin in children}, {self.target.pk})
+        grandchild = CMSPlugin.objects.get(depth=3)
+        self.assertEqual(grandchild.parent_id, children[1].pk)
+        self.assert_tree_is_valid()
+
+    def test_staged_import_is_validated_against_the_target(self):
+        with self.assertRaisesRegex(InvalidPluginError, "is not allowed as a child of PlugiePlugin"):
+            self.import_staged(self.existing)
+        self.assertEqual(CMSPlugin.objects.count(), 1)
+        self.assert_tree_is_valid()
+
+    def test_failed_staged_import(self):
+        self.import_data["all_plugins"][2]["meta"]["plugin_type"] = "inexisting_plugin"
+        with self.assertRaises(TypeError):
+            self.import_staged()
+
+        self.assertEqual(CMSPlugin.objects.count(), 1)
+        self.assertEqual(self.imported, [])
+        self.assert_tree_is_valid()
+
+    def test_import_in_caller_transaction_is_not_staged(self):
+        importer = Importer(data={"plugin": None, "placeholder": self.target, "import_data": self.import_data,
+                                  "staging": True})
+        with patch.object(importer, "import_plugins_staged") as import_plugins_staged, \
+                self.assertLogs("djangocms_plugie.importer.engine", "INFO") as logs:
+            with transaction.atomic():
+                importer.import_plugins_to_target()
+
+        import_plugins_staged.assert_not_called()
+        self.assertIn("so it is not staged", logs.output[0])
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 4)
+        self.assert_tree_is_valid()
+
+    def test_discard_failure_is_returned(self):
+        staging = create_staging_placeholder()
+        with patch.object(Placeholder, "delete", side_effect=DatabaseError("locked")), \
+                self.assertLogs("djangocms_plugie.importer.staging", "ERROR"):
+            self.assertFalse(discard_staging_placeholder(staging))
+        self.assertTrue(discard_staging_placeholder(staging))
+
+    def test_delete_stale_staging_placeholders(self):
+        stale = Placeholder.objects.create(slot=f"{STAGING_SLOT_PREFIX}1-{'0' * 32}")
+        add_plugin(stale, "PlugiePlugin", "en")
+        running = create_staging_placeholder()
+
+        self.assertEqual(delete_stale_staging_placeholders(3600), 1)
+        self.assertEqual(list(Placeholder.objects.filter(slot__startswith=STAGING_SLOT_PREFIX)), [running])
+        self.assertEqual(CMSPlugin.objects.count(), 1)
+        self.assertEqual(delete_stale_staging_placeholders(0), 1)
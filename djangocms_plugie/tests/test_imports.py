@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+from django.test import SimpleTestCase
+
+
+# Runs in a new interpreter, with the settings of the test run.
+IMPORT_SCRIPT = """
+import json, sys
+
+opened = []
+sys.addaudithook(lambda event, args: event == 'open' and opened.append(str(args[0])))
+
+import django
+django.setup()
+import djangocms_plugie.urls
+
+print(json.dumps({
+    'opened': [path for path in opened if 'plugie_config' in path],
+    'modules': sorted(name for name in sys.modules if name.startswith('djangocms_plugie')),
+}))
+"""
+
+
+class TestPackageImport(SimpleTestCase):
+    def test_import_is_lazy(self):
+        result = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], capture_output=True, text=True, check=True)
+        imported = json.loads(result.stdout.splitlines()[-1])
+
+        self.assertEqual(imported['opened'], [])
+        self.assertIn('djangocms_plugie.views', imported['modules'])
+        for module in ('djangocms_plugie.exporter', 'djangocms_plugie.methods', 'djangocms_plugie.importer.engine'):
+            self.assertNotIn(module, imported['modules'])
@@ -0,0 +1,349 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from cms.api import add_plugin
+from cms.models import CMSPlugin, Placeholder
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.jobs import (
+    ImportJobLostError, cancel_import_job, claim_job, create_export_job, create_import_job, delete_expired_export_files,
+    delete_expired_import_files, delete_imported_plugins, resume_import_job, run_export_job, run_import_job,
+    run_queued_jobs, save_checkpoint
+)
+from djangocms_plugie.models import ExportJob, ImportJob
+from djangocms_plugie.views import (
+    RangeNotSatisfiableError, export_job_download, export_job_status, import_job_cancel, import_job_status,
+    parse_range_header
+)
+
+
+PLUGIN_TYPE = 'PlugiePlugin'
+LANGUAGE = 'en'
+
+
+class TestImportJobs(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        source = Placeholder.objects.create(slot="source")
+        parent = add_plugin(source, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(source, PLUGIN_TYPE, LANGUAGE, target=parent)
+        self.import_data = Exporter().get_export_data(get_plugin_tree('placeholder', source.id))
+        self.target = Placeholder.objects.create(slot="target")
+
+    def create_job(self, import_data):
+        import_file = SimpleUploadedFile("plugins.json", json.dumps(import_data).encode("utf-8"))
+        data = {"plugin": None, "placeholder": self.target, "import_data": import_data}
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            return create_import_job(data, import_file)
+
+    def test_create_import_job(self):
+        job = self.create_job(self.import_data)
+        self.assertEqual(job.status, ImportJob.STATUS_QUEUED)
+        self.assertEqual(job.total_plugins, 2)
+
+    def test_run_import_job(self):
+        job = run_import_job(self.create_job(self.import_data).pk)
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual(job.created_plugins, 2)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+    def test_run_import_job_only_once(self):
+        job = self.create_job(self.import_data)
+        self.assertEqual(run_queued_jobs(), 1)
+        self.assertIsNone(run_import_job(job.pk))
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+    def test_run_import_job_failed(self):
+        self.import_data["all_plugins"][0]["meta"]["plugin_type"] = "inexisting_plugin"
+        job = run_import_job(self.create_job(self.import_data).pk)
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertIn("inexisting_plugin", job.error)
+
+    @patch('djangocms_plugie.config.Config.get_checkpoint_interval', return_value=1)
+    def test_resume_import_job(self, _):
+        def fail_second_checkpoint(job, created_plugin_ids, created_count, memory=None):
+            if created_count > 1:
+                raise RuntimeError("Worker died")
+            save_checkpoint(job, created_plugin_ids, created_count, memory)
+
+        job = self.create_job(self.import_data)
+        with patch('djangocms_plugie.jobs.save_checkpoint', side_effect=fail_second_checkpoint):
+            job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertEqual(job.created_plugins, 1)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 1)
+
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            self.assertTrue(resume_import_job(job.pk))
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual(job.created_plugins, 2)
+
+        parent, child = CMSPlugin.objects.filter(placeholder=self.target).order_by('path')
+        self.assertEqual(child.parent_id, parent.pk)
+        self.assertFalse(resume_import_job(job.pk))
+
+    def test_import_file_name_is_random(self):
+        job = self.create_job(self.import_data)
+        self.assertTrue(job.import_file.name.startswith('plugie/imports/import_'))
+        self.assertNotIn('plugins', job.import_file.name)
+        self.assertNotEqual(job.import_file.name, self.create_job(self.import_data).import_file.name)
+
+    def test_import_file_is_deleted_when_done(self):
+        job = self.create_job(self.import_data)
+        path = job.import_file.path
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertFalse(job.import_file)
+        self.assertFalse(os.path.exists(path))
+
+    def test_delete_expired_import_files(self):
+        self.import_data["all_plugins"][0]["meta"]["plugin_type"] = "inexisting_plugin"
+        job = run_import_job(self.create_job(self.import_data).pk)
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        path = job.import_file.path
+        self.assertEqual(delete_expired_import_files(), 0)
+
+        ImportJob.objects.filter(pk=job.pk).update(finished_at=timezone.now() - timedelta(hours=25))
+        self.assertEqual(delete_expired_import_files(), 1)
+        self.assertFalse(os.path.exists(path))
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            self.assertFalse(resume_import_job(job.pk))
+
+    def test_deleting_the_target_plugin_deletes_the_job(self):
+        parent = add_plugin(self.target, PLUGIN_TYPE, LANGUAGE)
+        data = {"plugin": parent, "placeholder": self.target, "import_data": self.import_data}
+        import_file = SimpleUploadedFile("plugins.json", json.dumps(self.import_data).encode("utf-8"))
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            job = create_import_job(data, import_file)
+
+        parent.delete()
+        self.assertFalse(ImportJob.objects.filter(pk=job.pk).exists())
+        self.assertIsNone(run_import_job(job.pk))
+        self.assertFalse(CMSPlugin.objects.filter(placeholder=self.target).exists())
+
+    def test_resume_stale_import_job(self):
+        job = self.create_job(self.import_data)
+        # The runner claimed the job and was killed before its first checkpoint.
+        self.assertTrue(claim_job(ImportJob, job.pk, heartbeat_at=timezone.now()))
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            self.assertFalse(resume_import_job(job.pk))
+            ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(seconds=601))
+            self.assertTrue(resume_import_job(job.pk))
+
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertGreater(job.heartbeat_at, job.started_at)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+    def test_cancel_stale_import_job(self):
+        job = self.create_job(self.import_data)
+        claim_job(ImportJob, job.pk, heartbeat_at=timezone.now() - timedelta(seconds=601))
+        self.assertTrue(cancel_import_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_CANCELLED)
+
+    def test_lost_import_job(self):
+        job = self.create_job(self.import_data)
+        claim_job(ImportJob, job.pk)
+        job.refresh_from_db()
+        # Another runner resumed the job and claimed it again.
+        ImportJob.objects.filter(pk=job.pk).update(started_at=timezone.now() + timedelta(seconds=1))
+        with self.assertRaises(ImportJobLostError):
+            save_checkpoint(job, {}, 0)
+
+        job = self.create_job(self.import_data)
+        with patch('djangocms_plugie.jobs.save_checkpoint', side_effect=ImportJobLostError("lost")):
+            self.assertIsNone(run_import_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_RUNNING)
+        self.assertFalse(CMSPlugin.objects.filter(placeholder=self.target).exists())
+
+    def test_import_job_views_of_another_user(self):
+        owner = User.objects.create(username="owner")
+        other = User.objects.create(username="other")
+        job = self.create_job(self.import_data)
+        ImportJob.objects.filter(pk=job.pk).update(created_by=owner)
+
+        for user in (other, AnonymousUser()):
+            request = RequestFactory().post('/')
+            request.user = user
+            with self.assertRaises(Http404):
+                import_job_cancel(request, job.pk)
+            with self.assertRaises(Http404):
+                import_job_status(request, job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_QUEUED)
+
+        request = RequestFactory().post('/')
+        request.user = owner
+        self.assertEqual(import_job_cancel(request, job.pk).status_code, 200)
+        request.user = User.objects.create(username="staff", is_staff=True)
+        self.assertEqual(json.loads(import_job_status(request, job.pk).content)["status"], ImportJob.STATUS_CANCELLED)
+
+    def test_cancel_queued_import_job(self):
+        job = self.create_job(self.import_data)
+        self.assertTrue(cancel_import_job(job.pk))
+        self.assertIsNone(run_import_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_CANCELLED)
+        self.assertFalse(cancel_import_job(job.pk))
+
+    def run_and_cancel_after_first_checkpoint(self):
+        def cancel_after_checkpoint(job, created_plugin_ids, created_count, memory=None):
+            save_checkpoint(job, created_plugin_ids, created_count, memory)
+            cancel_import_job(job.pk)
+
+        job = self.create_job(self.import_data)
+        with patch('djangocms_plugie.jobs.save_checkpoint', side_effect=cancel_after_checkpoint):
+            return run_import_job(job.pk)
+
+    @patch('djangocms_plugie.jobs.CANCEL_POLL_INTERVAL', 0)
+    @patch('djangocms_plugie.config.Config.get_checkpoint_interval', return_value=1)
+    def test_cancel_running_import_job(self, _):
+        job = self.run_and_cancel_after_first_checkpoint()
+        self.assertEqual(job.status, ImportJob.STATUS_CANCELLED)
+        self.assertEqual(job.created_plugins, 0)
+        self.assertFalse(job.imported_plugins.exists())
+        self.assertFalse(CMSPlugin.objects.filter(placeholder=self.target).exists())
+
+    @patch('djangocms_plugie.jobs.CANCEL_POLL_INTERVAL', 0)
+    @patch('djangocms_plugie.config.Config.get_rollback_cancelled', return_value=False)
+    @patch('djangocms_plugie.config.Config.get_checkpoint_interval', return_value=1)
+    def test_cancel_running_import_job_without_rollback(self, *_):
+        job = self.run_and_cancel_after_first_checkpoint()
+        self.assertEqual(job.status, ImportJob.STATUS_CANCELLED)
+        self.assertEqual(job.created_plugins, 1)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 1)
+
+        self.assertEqual(delete_imported_plugins(job.pk), 1)
+        self.assertFalse(CMSPlugin.objects.filter(placeholder=self.target).exists())
+
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            self.assertTrue(resume_import_job(job.pk))
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual(CMSPlugin.objects.filter(placeholder=self.target).count(), 2)
+
+
+class TestExportJobs(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.source = Placeholder.objects.create(slot="source")
+        parent = add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(self.source, PLUGIN_TYPE, LANGUAGE, target=parent)
+        self.user = User.objects.create(username="editor")
+
+    def create_job(self, component_type, component_id):
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            return create_export_job(component_type, component_id, total_plugins=2, user=self.user)
+
+    def get_request(self, user=None, **headers):
+        request = RequestFactory().get('/', **headers)
+        request.user = user or self.user
+        return request
+
+    def get_expected_export(self, placeholder):
+        data = Exporter().get_export_data(get_plugin_tree('placeholder', placeholder.id))
+        return json.dumps(data, indent=4, sort_keys=True).encode("utf-8")
+
+    def test_iter_export_json(self):
+        empty = Placeholder.objects.create(slot="empty")
+        for placeholder in (self.source, empty):
+            plugins = get_plugin_tree('placeholder', placeholder.id)
+            content = "".join(Exporter().iter_export_json(plugins)).encode("utf-8")
+            self.assertEqual(content, self.get_expected_export(placeholder))
+
+    def test_run_export_job(self):
+        job = run_export_job(self.create_job('placeholder', self.source.id).pk)
+        self.assertEqual(job.status, ExportJob.STATUS_DONE)
+        with job.export_file.open('rb') as export_file:
+            self.assertEqual(export_file.read(), self.get_expected_export(self.source))
+        self.assertIsNone(run_export_job(job.pk))
+
+    def test_run_export_job_failed(self):
+        job = run_export_job(self.create_job('plugin', 0).pk)
+        self.assertEqual(job.status, ExportJob.STATUS_FAILED)
+
+    def test_export_job_download_range(self):
+        job = run_export_job(self.create_job('placeholder', self.source.id).pk)
+        expected = self.get_expected_export(self.source)
+        request = self.get_request(HTTP_RANGE='bytes=10-')
+
+        response = export_job_download(request, job.pk)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-{len(expected) - 1}/{len(expected)}')
+        self.assertEqual(b"".join(response.streaming_content), expected[10:])
+
+        request = self.get_request(HTTP_RANGE=f'bytes={len(expected)}-')
+        self.assertEqual(export_job_download(request, job.pk).status_code, 416)
+
+        for range_header in ('bytes=0-1,5-6', 'bytes=abc', 'bytes=9-0'):
+            response = export_job_download(self.get_request(HTTP_RANGE=range_header), job.pk)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b"".join(response.streaming_content), expected)
+
+    def test_export_job_of_another_user(self):
+        job = run_export_job(self.create_job('placeholder', self.source.id).pk)
+        other = User.objects.create(username="other")
+        for view in (export_job_status, export_job_download):
+            with self.assertRaises(Http404):
+                view(self.get_request(other), job.pk)
+            with self.assertRaises(Http404):
+                view(self.get_request(AnonymousUser()), job.pk)
+
+        staff = User.objects.create(username="staff", is_staff=True)
+        self.assertEqual(export_job_download(self.get_request(staff), job.pk).status_code, 200)
+        response = export_job_status(self.get_request(), job.pk)
+        self.assertIsNotNone(json.loads(response.content)["download_url"])
+
+    def test_parse_range_header(self):
+        self.assertEqual(parse_range_header('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range_header('bytes=90-200', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=-10', 100), (90, 99))
+        self.assertIsNone(parse_range_header('bytes=0-1,5-6', 100))
+        self.assertIsNone(parse_range_header('bytes=9-0', 100))
+        self.assertIsNone(parse_range_header('bytes=-', 100))
+        self.assertIsNone(parse_range_header('items=0-9', 100))
+        for range_header in ('bytes=100-', 'bytes=-0'):
+            with self.assertRaises(RangeNotSatisfiableError):
+                parse_range_header(range_header, 100)
+
+    def test_export_file_name_is_random(self):
+        first = run_export_job(self.create_job('placeholder', self.source.id).pk)
+        second = run_export_job(self.create_job('placeholder', self.source.id).pk)
+        self.assertNotEqual(os.path.basename(first.export_file.name), f'plugins_{first.pk}.json')
+        self.assertNotEqual(first.export_file.name, second.export_file.name)
+
+    def test_delete_expired_export_files(self):
+        job = run_export_job(self.create_job('placeholder', self.source.id).pk)
+        path = job.export_file.path
+        self.assertEqual(delete_expired_export_files(), 0)
+
+        ExportJob.objects.filter(pk=job.pk).update(finished_at=timezone.now() - timedelta(hours=25))
+        self.assertEqual(delete_expired_export_files(), 1)
+        job.refresh_from_db()
+        self.assertFalse(job.export_file)
+        self.assertFalse(os.path.exists(path))
+        with self.assertRaises(Http404):
+            export_job_download(self.get_request(), job.pk)
+
+        with patch('djangocms_plugie.config.Config.get_export_retention', return_value=None):
+            self.assertEqual(delete_expired_export_files(), 0)
@@ -0,0 +1,136 @@
+import json
+import tracemalloc
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from cms.api import add_plugin
+from cms.models import Placeholder
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.jobs import create_import_job, run_import_job, save_checkpoint
+from djangocms_plugie.memory import NULL_MEMORY_TRACKER, MemoryTracker, get_memory_tracker
+from djangocms_plugie.models import ImportJob
+from djangocms_plugie.utils import get_importer
+
+
+PLUGIN_TYPE = 'PlugiePlugin'
+LANGUAGE = 'en'
+
+
+class TestMemoryTracker(SimpleTestCase):
+    def test_phase_peak(self):
+        tracker = MemoryTracker('import', top=3)
+        with tracker.phase('parse'):
+            data = [bytes(1024) for _ in range(1024)]
+        del data
+
+        stats = tracker.as_dict()['parse']
+        self.assertGreaterEqual(stats['peak_bytes'], 1024 * 1024)
+        self.assertIn(__file__, stats['top'][0]['site'])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_phase_keeps_highest_peak(self):
+        tracker = MemoryTracker('export', top=0)
+        with tracker.phase('encode'):
+            data = bytes(1024 * 1024)
+        del data
+        with tracker.phase('encode'):
+            pass
+
+        self.assertGreaterEqual(tracker.as_dict()['encode']['peak_bytes'], 1024 * 1024)
+        self.assertEqual(tracker.as_dict()['encode']['top'], [])
+
+    def test_limit(self):
+        tracker = MemoryTracker('import', top=0, limits={'create': 0.5, 'parse': 8})
+        with self.assertLogs('djangocms_plugie.memory', 'WARNING') as logs:
+            with tracker.phase('create'):
+                data = bytes(1024 * 1024)
+            with tracker.phase('parse'):
+                data = bytes(1024 * 1024)
+        del data
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("import create peak memory of 1.0 MiB exceeds the limit of 0.5 MiB", logs.output[0])
+
+    def test_report(self):
+        tracker = MemoryTracker('export', top=1)
+        with tracker.phase('encode'):
+            data = bytes(1024 * 1024)
+        del data
+        with self.assertLogs('djangocms_plugie.memory', 'INFO') as logs:
+            report = tracker.report()
+        self.assertEqual(list(report), ['encode'])
+        self.assertIn("export peak memory:\n    encode: peak 1.0 MiB", logs.output[0])
+
+    def test_phase_start_is_logged(self):
+        tracker = MemoryTracker('import', top=0, label='plugins.json')
+        with self.assertLogs('djangocms_plugie.memory', 'DEBUG') as logs:
+            with tracker.phase('create'):
+                pass
+            with tracker.phase('create'):
+                pass
+        self.assertEqual(logs.output, [
+            "INFO:djangocms_plugie.memory:import of plugins.json create phase started",
+            "DEBUG:djangocms_plugie.memory:import of plugins.json create phase started",
+        ])
+
+    def test_tracking_off(self):
+        self.assertIs(get_memory_tracker('import'), NULL_MEMORY_TRACKER)
+        with NULL_MEMORY_TRACKER.phase('parse'):
+            pass
+        self.assertEqual(NULL_MEMORY_TRACKER.report(), {})
+
+
+@patch('djangocms_plugie.config.Config.get_memory_tracking', return_value=True)
+class TestImportJobMemory(TestCase):
+    def test_import_job_memory(self, _):
+        source = Placeholder.objects.create(slot="source")
+        add_plugin(source, PLUGIN_TYPE, LANGUAGE)
+        import_data = Exporter().get_export_data(get_plugin_tree('placeholder', source.id))
+        import_file = SimpleUploadedFile("plugins.json", json.dumps(import_data).encode("utf-8"))
+        target = Placeholder.objects.create(slot="target")
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            job = create_import_job({"plugin": None, "placeholder": target, "import_data": import_data}, import_file)
+
+        with self.assertLogs('djangocms_plugie.memory', 'INFO') as logs:
+            job = run_import_job(job.pk)
+
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual(set(job.memory), {'parse', 'validate', 'create'})
+        self.assertGreater(job.memory['create']['peak_bytes'], 0)
+        self.assertIn(f"INFO:djangocms_plugie.memory:import of job {job.pk} parse phase started", logs.output)
+        self.assertIn(f"import of job {job.pk} peak memory:", logs.output[-1])
+
+    @patch('djangocms_plugie.config.Config.get_checkpoint_interval', return_value=1)
+    def test_import_job_memory_is_saved_at_checkpoints(self, *_):
+        source = Placeholder.objects.create(slot="source")
+        parent = add_plugin(source, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(source, PLUGIN_TYPE, LANGUAGE, target=parent)
+        import_data = Exporter().get_export_data(get_plugin_tree('placeholder', source.id))
+        import_file = SimpleUploadedFile("plugins.json", json.dumps(import_data).encode("utf-8"))
+        target = Placeholder.objects.create(slot="target")
+        with patch('djangocms_plugie.jobs.enqueue_job'):
+            job = create_import_job({"plugin": None, "placeholder": target, "import_data": import_data}, import_file)
+
+        def fail_second_batch(job, created_plugin_ids, created_count, memory=None):
+            if created_count > 1:
+                raise RuntimeError("Worker killed")
+            save_checkpoint(job, created_plugin_ids, created_count, memory)
+
+        with patch('djangocms_plugie.jobs.save_checkpoint', side_effect=fail_second_batch), \
+                patch('djangocms_plugie.jobs.finish_job'), self.assertLogs('djangocms_plugie', 'INFO'):
+            run_import_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_RUNNING)
+        self.assertEqual(set(job.memory), {'parse', 'validate', 'create'})
+
+    def test_prefetch_phase(self, _):
+        source = Placeholder.objects.create(slot="source")
+        add_plugin(source, PLUGIN_TYPE, LANGUAGE)
+        import_data = Exporter().get_export_data(get_plugin_tree('placeholder', source.id))
+        target = Placeholder.objects.create(slot="target")
+        memory = MemoryTracker('import', top=0)
+        importer = get_importer({"plugin": None, "placeholder": target, "import_data": import_data, "memory": memory})
+        importer.prefetch_map = {'page': lambda values, resolver: None}
+        with self.assertLogs('djangocms_plugie.memory', 'INFO'):
+            importer.import_plugins_to_target()
+        self.assertEqual(set(memory.as_dict()), {'prefetch', 'create'})
@@ -0,0 +1,132 @@
+import io
+import json
+from unittest.mock import patch
+from django.test import TestCase
+from django.utils import timezone
+from cms.api import add_plugin
+from cms.models import Placeholder
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.metrics import (
+    NULL_METRICS, InMemorySink, LoggingSink, get_metrics, get_sink, load_sink, set_sink
+)
+from djangocms_plugie.utils import get_importer, parse_and_plan_import_file
+
+
+PLUGIN_TYPE = 'PlugiePlugin'
+LANGUAGE = 'en'
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.addCleanup(set_sink, get_sink())
+        self.sink = InMemorySink()
+        set_sink(self.sink)
+
+        self.source = Placeholder.objects.create(slot="source")
+        parent = add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(self.source, PLUGIN_TYPE, LANGUAGE, target=parent)
+
+    def test_export_metrics(self):
+        export_file = "".join(Exporter().iter_export_json(get_plugin_tree('placeholder', self.source.pk)))
+
+        counters = self.sink.counters['export']
+        self.assertEqual(self.sink.reports['export'], 1)
+        self.assertEqual(counters[f'plugins_serialized.{PLUGIN_TYPE}'], 2)
+        self.assertEqual(counters['fetch.queries'], 1)
+        self.assertGreater(counters['bytes_out'], 0)
+        self.assertLess(counters['bytes_out'], len(export_file))
+        self.assertEqual(
+            set(self.sink.histograms['export']),
+            {'fetch.seconds', 'downcast.seconds', 'serialize.seconds', 'encode.seconds'},
+        )
+
+    def test_import_metrics(self):
+        export_data = Exporter().get_export_data(get_plugin_tree('placeholder', self.source.pk))
+        export_file = json.dumps(export_data).encode("utf-8")
+        import_data, import_plan = parse_and_plan_import_file(io.BytesIO(export_file))
+        target = Placeholder.objects.create(slot="target")
+        get_importer({
+            'plugin': None,
+            'placeholder': target,
+            'import_data': import_data,
+            'import_plan': import_plan,
+        }).import_plugins_to_target()
+
+        self.assertEqual(self.sink.counters['parse']['bytes_in'], len(export_file))
+        self.assertEqual(self.sink.counters['parse']['validate.queries'], 0)
+        self.assertEqual(self.sink.counters['import'][f'plugins_created.{PLUGIN_TYPE}'], 2)
+        self.assertGreater(self.sink.counters['import']['create.queries'], 0)
+        self.assertEqual(len(self.sink.histograms['import']['create.seconds']), 1)
+
+    def test_metrics_off(self):
+        set_sink(None)
+        self.assertIs(get_metrics('export'), NULL_METRICS)
+        self.assertIs(Exporter().metrics, NULL_METRICS)
+        with NULL_METRICS.phase('fetch'):
+            NULL_METRICS.increment('plugins_serialized')
+
+    def test_logging_sink(self):
+        metrics = get_metrics('export')
+        metrics.sink = LoggingSink()
+        metrics.increment('plugins_serialized.TextPlugin', 2)
+        metrics.observe('serialize.seconds', 0.5)
+        with self.assertLogs('djangocms_plugie.metrics', 'INFO') as logs:
+            metrics.report()
+        self.assertIn("export metrics: {'plugins_serialized.TextPlugin': 2}", logs.output[0])
+        self.assertIn("serialize.seconds: count=1 total=0.5000 max=0.5000", logs.output[0])
+
+    def test_load_sink(self):
+        self.assertIsInstance(load_sink('memory'), InMemorySink)
+        self.assertIsInstance(load_sink('djangocms_plugie.metrics.LoggingSink'), LoggingSink)
+        self.assertIsNone(load_sink(None))
+        with self.assertLogs('djangocms_plugie.metrics', 'ERROR'):
+            self.assertIsNone(load_sink('missing.Sink'))
+
+
+@patch('djangocms_plugie.config.Config.get_method_timing', return_value=True)
+class TestMethodTimings(TestCase):
+    def setUp(self):
+        self.source = Placeholder.objects.create(slot="source")
+        parent = add_plugin(self.source, PLUGIN_TYPE, LANGUAGE)
+        add_plugin(self.source, PLUGIN_TYPE, LANGUAGE, target=parent)
+
+    def test_serialize_timings(self, _):
+        exporter = Exporter()
+        exporter.serialize_plugins(get_plugin_tree('placeholder', self.source.pk))
+        with self.assertLogs('djangocms_plugie.methods.method_timer', 'INFO') as logs:
+            report = exporter.exporter_method_map.report_method_timings()
+
+        # The parent of the child plugin is serialized with the cmsplugin method.
+        self.assertEqual(report['cmsplugin']['calls'], 1)
+        self.assertEqual(report['cmsplugin']['queries'], 0)
+        self.assertIn("serialize method timings:", logs.output[0])
+        self.assertEqual(exporter.exporter_method_map.report_method_timings(), {})
+
+    def test_deserialize_timings(self, _):
+        import_data = {"version": "0.0.0", "all_plugins": [
+            {
+                "meta": {"id": 1, "parent": None, "position": 0, "plugin_type": PLUGIN_TYPE},
+                "changed_date": {"_type": "slot_date", "_slot": "source"},
+            },
+        ]}
+        target = Placeholder.objects.create(slot="target")
+        importer = get_importer({'plugin': None, 'placeholder': target, 'import_data': import_data})
+
+        def deserialize(**kwargs):
+            kwargs['_resolver'].get(Placeholder, kwargs['_slot'], field='slot')
+            return timezone.now()
+
+        importer.method_map['slot_date'] = deserialize
+        importer.importer_method_map.wrap_methods()
+        importer.import_plugins(importer.get_sorted_plugins())
+
+        report = importer.importer_method_map.report_method_timings()
+        self.assertEqual(report['slot_date']['calls'], 1)
+        self.assertEqual(report['slot_date']['queries'], 1)
+        self.assertGreater(report['slot_date']['max_seconds'], 0)
+
+    def test_timing_off(self, get_method_timing):
+        get_method_timing.return_value = False
+        exporter = Exporter()
+        self.assertIsNone(exporter.exporter_method_map.timer)
+        self.assertEqual(exporter.exporter_method_map.report_method_timings(), {})
@@ -0,0 +1,56 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import RequestFactory, TestCase
+from cms.api import add_plugin
+from cms.models import Placeholder
+from djangocms_plugie.views import export_component_data
+
+
+PLUGIN_TYPE = 'PlugiePlugin'
+LANGUAGE = 'en'
+
+
+@patch('djangocms_plugie.config.Config.get_profiling_enabled', return_value=True)
+class TestProfiling(TestCase):
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot="test")
+        add_plugin(self.placeholder, PLUGIN_TYPE, LANGUAGE)
+        self.staff = User.objects.create(username="staff", is_staff=True)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = patch('djangocms_plugie.config.Config.get_profiling_directory', return_value=self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def export(self, user, query=''):
+        request = RequestFactory().get(f'/export/{query}')
+        request.user = user
+        return export_component_data(request, 'placeholder', self.placeholder.pk)
+
+    def test_profile_export(self, _):
+        response = self.export(self.staff, '?plugie_profile=1')
+        self.assertEqual(len(json.loads(response.content)['all_plugins']), 1)
+
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual([os.path.splitext(name)[1] for name in files], ['.prof', '.txt'])
+        self.assertTrue(files[0].startswith('export_component_data-'))
+        with open(os.path.join(self.directory, files[1])) as summary:
+            self.assertIn('serialize_plugins', summary.read())
+
+    def test_no_profile_without_parameter(self, _):
+        self.export(self.staff)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_no_profile_for_non_staff(self, _):
+        self.export(AnonymousUser(), '?plugie_profile=1')
+        self.export(User.objects.create(username="editor"), '?plugie_profile=1')
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_no_profile_when_disabled(self, get_profiling_enabled):
+        get_profiling_enabled.return_value = False
+        self.export(self.staff, '?plugie_profile=1')
+        self.assertEqual(os.listdir(self.directory), [])
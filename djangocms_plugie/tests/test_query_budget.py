@@ -0,0 +1,61 @@
+from django.test import TestCase
+from cms.models import Placeholder
+from djangocms_plugie.benchmark import generate_import_data
+from djangocms_plugie.exporter import Exporter, get_plugin_tree
+from djangocms_plugie.utils import get_importer
+from .query_budget import check_query_budget, count_queries_per_path
+
+
+SMALL_TREE = 8
+LARGE_TREE = 32
+
+# The django CMS API inserts and moves each plugin in the tree.
+IMPORT_PER_PLUGIN_PATHS = (
+    'importer.plugin_context._add_plugin',
+)
+
+
+class TestQueryBudget(TestCase):
+    def import_tree(self, import_data):
+        placeholder = Placeholder.objects.create(slot="budget")
+        importer = get_importer({'plugin': None, 'placeholder': placeholder, 'import_data': import_data})
+        with count_queries_per_path() as queries:
+            importer.import_plugins_to_target()
+        return placeholder, queries.per_key
+
+    def export_tree(self, placeholder):
+        with count_queries_per_path() as queries:
+            export_data = Exporter().get_export_data(get_plugin_tree('placeholder', placeholder.pk))
+        return export_data, queries.per_key
+
+    def run_tree(self, size):
+        # The trees of both sizes are made of the same blocks of a parent and
+        # its children, with the same plugin types.
+        import_data = generate_import_data(size, depth=2, fan_out=3)
+        for index, plugin in enumerate(import_data['all_plugins']):
+            if index % 4 == 3:
+                plugin['meta']['plugin_type'] = 'AliasPlugin'
+        placeholder, import_queries = self.import_tree(import_data)
+        export_data, export_queries = self.export_tree(placeholder)
+        self.assertEqual(len(export_data['all_plugins']), size)
+        return import_queries, export_queries
+
+    def test_query_budget(self):
+        small_import, small_export = self.run_tree(SMALL_TREE)
+        large_import, large_export = self.run_tree(LARGE_TREE)
+
+        errors = check_query_budget(small_export, large_export, SMALL_TREE, LARGE_TREE)
+        self.assertEqual(errors, [], "The export queries grow with the number of plugins:\n" + "\n".join(errors))
+
+        errors = check_query_budget(small_import, large_import, SMALL_TREE, LARGE_TREE, IMPORT_PER_PLUGIN_PATHS)
+        self.assertEqual(errors, [], "The import queries grow with the number of plugins:\n" + "\n".join(errors))
+
+    def test_check_query_budget(self):
+        errors = check_query_budget(
+            {'exporter.plugin_serializer._get_plugin_instance': 8, 'importer.plugin_context._add_plugin': 80},
+            {'exporter.plugin_serializer._get_plugin_instance': 32, 'importer.plugin_context._add_plugin': 320},
+            8, 32, IMPORT_PER_PLUGIN_PATHS,
+        )
+        self.assertEqual(errors, [
+            "exporter.plugin_serializer._get_plugin_instance: 8 queries for 8 plugins, 32 for 32 plugins (budget 8)",
+        ])
@@ -1,8 +1,10 @@
 import unittest
 import json
 from io import BytesIO
+from unittest.mock import patch
 from django.core.exceptions import ValidationError
-from djangocms_plugie.utils import parse_import_file, extract_major_version, get_module_name, validate_parsed_data_structure, validate_all_plugins, validate_plugin_meta, REQUIRED_META_KEYS
+from djangocms_plugie.importer.engine import ImportEngine
+from djangocms_plugie.utils import parse_import_file, extract_major_version, get_module_name, get_version_importer_class, import_module, validate_parsed_data_structure, validate_all_plugins, validate_plugin_meta, build_import_plan, REQUIRED_META_KEYS
 
 class TestGetParsedData(unittest.TestCase):
 
@@ -56,6 +58,29 @@ class TestExtractMajorVersion(unittest.TestCase):
         with self.assertRaises(TypeError):
             get_module_name(1)
 
+class TestGetVersionImporterClass(unittest.TestCase):
+
+    def setUp(self):
+        get_version_importer_class.cache_clear()
+
+    def test_versions_share_the_engine(self):
+        importers = [get_version_importer_class(major_version) for major_version in ("0", "1")]
+        self.assertNotEqual(importers[0], importers[1])
+        for importer in importers:
+            self.assertTrue(issubclass(importer, ImportEngine))
+
+    def test_resolved_once(self):
+        with patch('djangocms_plugie.utils.import_module', wraps=import_module) as import_module_mock:
+            for _ in range(3):
+                get_version_importer_class("1")
+        import_module_mock.assert_called_once_with("djangocms_plugie.importer.version1.importer")
+
+    def test_unknown_version(self):
+        for _ in range(2):
+            with self.assertRaisesRegex(ImportError, "Error importing module djangocms_plugie.importer.version99.importer"):
+                get_version_importer_class("99")
+        self.assertEqual(get_version_importer_class.cache_info().currsize, 0)
+
 class TestValidateParsedDataStructure(unittest.TestCase):
 
     def test_valid_data(self):
@@ -108,6 +133,42 @@ class TestValidateAllPlugins(unittest.TestCase):
         with self.assertRaises(ValidationError):
             validate_all_plugins(all_plugins)
 
+class TestBuildImportPlan(unittest.TestCase):
+
+    def plugin(self, plugin_id, parent, position):
+        return {
+            "meta": {"parent": parent, "id": plugin_id, "position": position, "plugin_type": "TextPlugin"},
+            "body": f"plugin {plugin_id}",
+        }
+
+    def test_parents_before_children(self):
+        all_plugins = [
+            self.plugin(4, 3, 0),
+            self.plugin(3, 1, 1),
+            self.plugin(2, 1, 0),
+            self.plugin(1, None, 0),
+        ]
+        plan = build_import_plan(all_plugins)
+        self.assertEqual([record.source_id for record in plan], [1, 2, 3, 4])
+        self.assertIs(plan.plugins[0].fields, all_plugins[3])
+
+    def test_compact_records(self):
+        all_plugins = [self.plugin("1", None, 0), self.plugin("2", "1", 0)]
+        all_plugins[1]["meta"]["plugin_type"] = "".join(["Text", "Plugin"])
+        parent, child = build_import_plan(all_plugins)
+        self.assertEqual((child.source_id, child.parent_id), (2, 1))
+        self.assertIs(parent.plugin_type, child.plugin_type)
+        self.assertFalse(hasattr(child, "__dict__"))
+
+    def test_invalid_id(self):
+        with self.assertRaises(ValidationError):
+            build_import_plan([self.plugin("first", None, 0)])
+
+    def test_parent_cycle(self):
+        all_plugins = [self.plugin(1, 2, 0), self.plugin(2, 1, 0)]
+        with self.assertRaises(ValidationError):
+            build_import_plan(all_plugins)
+
 class TestValidatePluginMeta(unittest.TestCase):
 
     def test_valid_plugin_meta(self):
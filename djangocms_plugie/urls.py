@@ -1,5 +1,8 @@
 from django.urls import re_path
-from djangocms_plugie.views import export_component_data, import_component_data
+from djangocms_plugie.views import (
+    export_component_data, import_component_data, clone_component_data, import_job_status, import_job_cancel,
+    export_job_status, export_job_download
+)
 
 
 urlpatterns = [
@@ -13,4 +16,29 @@ urlpatterns = [
         import_component_data,
         name='import_component_data'
     ),
+    re_path(
+        r'clone_(?P<component_type>plugin|placeholder)/(?P<component_id>.+)/',
+        clone_component_data,
+        name='clone_component_data'
+    ),
+    re_path(
+        r'import_job/(?P<job_id>\d+)/status/',
+        import_job_status,
+        name='import_job_status'
+    ),
+    re_path(
+        r'import_job/(?P<job_id>\d+)/cancel/',
+        import_job_cancel,
+        name='import_job_cancel'
+    ),
+    re_path(
+        r'export_job/(?P<job_id>\d+)/status/',
+        export_job_status,
+        name='export_job_status'
+    ),
+    re_path(
+        r'export_job/(?P<job_id>\d+)/download/',
+        export_job_download,
+        name='export_job_download'
+    ),
 ]
@@ -1,9 +1,13 @@
 import json
 import importlib
+from functools import lru_cache
 from types import ModuleType
-from typing import Dict, IO, Any, Type
+from typing import Dict, IO, Any, Optional, Tuple, Type
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
+from djangocms_plugie.importer.plan import ImportPlan, PluginRecord
+from djangocms_plugie.memory import get_memory_tracker
+from djangocms_plugie.metrics import get_metrics
 
 REQUIRED_META_KEYS = {"parent", "id", "position", "plugin_type"}
 
@@ -92,14 +96,26 @@ def get_importer(data: Dict[str, Any]) -> object:
     """
     try:
         version = data["import_data"]["version"]
-        major_version = extract_major_version(version)
-        module_name = get_module_name(major_version)
-        module = import_module(module_name)
-        importer = get_importer_class(module)
+        importer = get_version_importer_class(extract_major_version(version))
 
         return importer(data=data)
     except Exception as e:
         raise ImporterLoadingError(f"Error loading importer: {e}")
+
+@lru_cache(maxsize=None)
+def get_version_importer_class(major_version: str) -> Type[Any]:
+    """
+    Get the Importer class of a major version of the export file format,
+    from the importer.version<major_version> package. A version is resolved
+    once, on first use, and then served from the cache. Unknown versions are
+    not cached, and raise ImportError on every call.
+
+    :param major_version: str, the major version of the export file
+
+    :return: Importer class
+    """
+    module = import_module(get_module_name(major_version))
+    return get_importer_class(module)
     
 def parse_import_file(import_file: IO[bytes]) -> Dict[str, Any]:
     """
@@ -150,21 +166,53 @@ def validate_version(version: str):
         raise ValidationError(
             "File is not valid: 'version' is not a string with format 'x.y.z'")
     
-def validate_all_plugins(all_plugins: list):
+def validate_all_plugins(all_plugins: list) -> ImportPlan:
     """
-    Validates the 'all_plugins' list.
+    Validates the 'all_plugins' list and plans the import in the same pass:
+    each plugin is validated and turned into a record of the import plan.
 
     Args:
         all_plugins: The list of all plugins.
 
+    Returns:
+        ImportPlan: The plugins in the order they are created.
+
     Raises:
         ValidationError: If the 'all_plugins' list is invalid.
     """
     if not all_plugins or not isinstance(all_plugins, list):
         raise ValidationError("File is not valid: missing 'all_plugins'")
 
+    return build_import_plan(all_plugins)
+
+def build_import_plan(all_plugins: list, child_counts: Optional[Dict[int, int]] = None) -> ImportPlan:
+    """
+    Validates the plugins and builds the import plan, e.g. for a chunk of
+    plugins streamed from the exporter.
+
+    Args:
+        all_plugins: The list of plugins, with their 'meta'.
+        child_counts: The number of children of each plugin by source ID,
+            when the plugins are a chunk of a bigger tree.
+
+    Returns:
+        ImportPlan: The plugins in the order they are created.
+
+    Raises:
+        ValidationError: If a plugin is invalid.
+    """
+    records = []
     for plugin in all_plugins:
         validate_plugin_meta(plugin, REQUIRED_META_KEYS)
+        try:
+            records.append(PluginRecord.from_plugin_fields(plugin))
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"File is not valid: invalid 'meta' values in a plugin: {e}")
+
+    try:
+        return ImportPlan.from_records(records, child_counts)
+    except ValueError as e:
+        raise ValidationError(f"File is not valid: {e}")
 
 def validate_plugin_meta(plugin: Dict[str, Any], required_meta_keys: set):
     """
@@ -202,19 +250,56 @@ def parse_and_validate_import_file(import_file) -> Dict[str, Any]:
     Raises:
         ValidationError: If the import file is invalid or contains invalid data.
     """
-    data = parse_import_file(import_file)
-    validate_parsed_data_structure(data)
-    validate_version(data.get("version"))
-    validate_all_plugins(data.get("all_plugins"))
+    data, _ = parse_and_plan_import_file(import_file)
     return data
 
-def initialize_and_run_importer(data: Dict[str, Any]) -> None:
+def parse_and_plan_import_file(import_file, memory=None) -> Tuple[Dict[str, Any], ImportPlan]:
+    """
+    Parses and validates the import file, and plans the import in the same
+    pass. Pass the plan as the 'import_plan' key of the importer data, so the
+    importer does not walk the plugins again.
+
+    Args:
+        import_file: The import file to be parsed and validated.
+        memory: The memory tracker of the import, if any. Without one, the
+            peak memory of the parse is tracked and reported on its own.
+
+    Returns:
+        tuple: The parsed and validated data, and the import plan.
+
+    Raises:
+        ValidationError: If the import file is invalid or contains invalid data.
+    """
+    metrics = get_metrics('parse')
+    tracker = memory or get_memory_tracker('parse')
+    with metrics.phase('parse'), tracker.phase('parse'):
+        data = parse_import_file(import_file)
+    if metrics.enabled:
+        try:
+            metrics.increment('bytes_in', import_file.tell())
+        except (AttributeError, OSError):
+            pass
+
+    with metrics.phase('validate'), tracker.phase('validate'):
+        validate_parsed_data_structure(data)
+        validate_version(data.get("version"))
+        plan = validate_all_plugins(data.get("all_plugins"))
+    metrics.report()
+    if memory is None:
+        tracker.report()
+    return data, plan
+
+def initialize_and_run_importer(data: Dict[str, Any]) -> object:
     """
     Initializes and runs the importer.
 
     Args:
         data: The cleaned and validated import data.
 
+    Returns:
+        The importer that ran, which counts the created plugins in its
+        'created_count'.
+
     Raises:
         TypeError: If an error occurs during the import process.
         Exception: If an unexpected error occurs.
@@ -227,6 +312,7 @@ def initialize_and_run_importer(data: Dict[str, Any]) -> None:
     try:
         importer = get_importer(data)
         importer.import_plugins_to_target()
+        return importer
     except (ImporterLoadingError, TypeError, IntegrityError, ValueError) as e:
         raise TypeError(f"Error importing plugin tree: {e}")
     except Exception as e:
@@ -1,16 +1,55 @@
-import json
-from typing import Literal
-from cms.models import CMSPlugin
+import re
+from typing import Literal, Optional, Tuple
 from django.contrib import messages
-from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
-from django.shortcuts import render
+from django.http import (
+    FileResponse, Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+)
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
-from djangocms_plugie.exporter import Exporter
-from djangocms_plugie.forms import PluginOrPlaceholderSelectionForm, ImportForm
+from django.views.decorators.http import require_POST
+from djangocms_plugie.config import Config
+from djangocms_plugie.forms import PluginOrPlaceholderSelectionForm, ImportForm, CloneForm
+from djangocms_plugie.jobs import cancel_import_job, create_export_job
+from djangocms_plugie.models import ExportJob, ImportJob
+from djangocms_plugie.profiling import profile_view
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiableError(Exception):
+    """Raised when a valid byte range starts after the end of the file."""
+
+    def __init__(self, message):
+        super().__init__(message)
+
+
+def get_user_job(request: HttpRequest, model, job_id: int, **filters):
+    """
+    Get a background job for the user of a request. Only staff users and the
+    user who created the job can see it, and the jobs of other users are not
+    found, so their IDs cannot be probed.
+
+    :param request: HttpRequest object
+    :param model: ImportJob or ExportJob
+    :param job_id: int, ID of the job
+    :param filters: other filters of the job, e.g. its status
+
+    :return: the job
+
+    Raises:
+        Http404: If the job does not exist or belongs to another user.
+    """
+    job = get_object_or_404(model, pk=job_id, **filters)
+    user = request.user
+    if not user.is_staff and (job.created_by_id is None or job.created_by_id != user.pk):
+        raise Http404("No job matches the given query.")
+    return job
 
 
 @csrf_exempt
+@profile_view
 def export_component_data(request: HttpRequest, component_type: Literal['plugin', 'placeholder'], component_id: int) -> HttpResponse:
     """"
     Export the plugin tree of a given component to a JSON file.
@@ -21,21 +60,26 @@ def export_component_data(request: HttpRequest, component_type: Literal['plugin'
 
     :return: HttpResponse object
     """
+    from djangocms_plugie.exporter import Exporter, get_plugin_tree
 
-    plugin_tree = get_plugin_tree(component_type, component_id)
+    threshold = Config().get_export_threshold()
+    if threshold is not None:
+        total_plugins = get_plugin_tree(component_type, component_id, using=Config().get_export_database()).count()
+        if total_plugins > threshold:
+            user = request.user if request.user.is_authenticated else None
+            job = create_export_job(component_type, component_id, total_plugins, user=user)
+            return render(request, "djangocms_plugie/export_job.html", {
+                "job": job,
+                "status_url": reverse("export_job_status", kwargs={"job_id": job.pk}),
+                "app_label": 'djangocms_plugie',
+            })
 
     try:
         serializer = Exporter()
-        version = serializer.version
-        all_plugins = serializer.serialize_plugins(plugin_tree)
+        plugin_tree = get_plugin_tree(component_type, component_id, using=serializer.using)
         filename = 'plugins.json'
 
-        data = {
-            'version': version,
-            'all_plugins': all_plugins,
-        }
-
-        response = HttpResponse(json.dumps(data, indent=4, sort_keys=True),
+        response = HttpResponse(''.join(serializer.iter_export_json(plugin_tree)),
                                 content_type="application/json")
     except Exception as e:
         filename = 'error.txt'
@@ -47,27 +91,7 @@ def export_component_data(request: HttpRequest, component_type: Literal['plugin'
         return response
 
 
-def get_plugin_tree(component_type: Literal['plugin', 'placeholder'], component_id: int) -> QuerySet:
-    """
-    Get the plugin tree of a given component.
-
-    :param component_type: str, 'plugin' or 'placeholder'
-    :param component_id: int, ID of the component
-
-    :return: QuerySet object of CMSPlugin
-    """
-
-    if not component_type or not component_id:
-        raise ValueError('Component type and ID must be provided.')
-
-    filter_criteria = {'id': component_id} if component_type == 'plugin' else {'placeholder_id': component_id}
-    parent_queryset = CMSPlugin.objects.filter(**filter_criteria)
-    descendants = parent_queryset[0].get_descendants() if component_type == 'plugin' else CMSPlugin.objects.none()
-    plugin_tree = parent_queryset | descendants
-
-    return plugin_tree
-
-
+@profile_view
 def import_component_data(request: HttpRequest, component_type: Literal['plugin', 'placeholder'], component_id: int) -> HttpResponse:
     """"
     Import the plugin tree from a JSON file to a given component.
@@ -100,11 +124,20 @@ def import_component_data(request: HttpRequest, component_type: Literal['plugin'
         "has_change_permission": True,
         "is_popup": True,
         "app_label": 'djangocms_plugie',
+        "form_action": request.get_full_path(),
     }
 
     if not import_form.is_valid():
         return render(request, "djangocms_plugie/import_plugins.html", context)
 
+    if Config().get_background_imports():
+        user = request.user if request.user.is_authenticated else None
+        job = import_form.queue_import(user=user)
+        context["job"] = job
+        context["status_url"] = reverse("import_job_status", kwargs={"job_id": job.pk})
+        context["cancel_url"] = reverse("import_job_cancel", kwargs={"job_id": job.pk})
+        return render(request, "djangocms_plugie/import_job.html", context)
+
     try:
         import_form.run_import()
         messages.success(request, 'Plugin tree imported successfully!')
@@ -113,3 +146,218 @@ def import_component_data(request: HttpRequest, component_type: Literal['plugin'
         return render(request, "djangocms_plugie/import_plugins.html", context)
 
     return render(request, "djangocms_plugie/refresh_page.html")
+
+
+def import_job_status(request: HttpRequest, job_id: int) -> JsonResponse:
+    """"
+    Get the status and progress of a background import job, for staff users
+    and the user who started it.
+
+    :param request: HttpRequest object
+    :param job_id: int, ID of the import job
+
+    :return: JsonResponse object
+    """
+
+    job = get_user_job(request, ImportJob, job_id)
+
+    return JsonResponse({
+        "status": job.status,
+        "created_plugins": job.created_plugins,
+        "total_plugins": job.total_plugins,
+        "error": job.error,
+    })
+
+
+@require_POST
+def import_job_cancel(request: HttpRequest, job_id: int) -> JsonResponse:
+    """"
+    Cancel a background import job, for staff users and the user who
+    started it. A running job stops at the next plugin, and the batch of
+    plugins it was creating is rolled back.
+
+    :param request: HttpRequest object
+    :param job_id: int, ID of the import job
+
+    :return: JsonResponse object
+    """
+
+    job = get_user_job(request, ImportJob, job_id)
+    cancelled = cancel_import_job(job.pk)
+    job.refresh_from_db()
+
+    return JsonResponse({
+        "status": job.status,
+        "cancelled": cancelled,
+    }, status=200 if cancelled else 409)
+
+
+def export_job_status(request: HttpRequest, job_id: int) -> JsonResponse:
+    """"
+    Get the status of a background export job, with the URL of the export
+    file once it is done, for staff users and the user who started it.
+
+    :param request: HttpRequest object
+    :param job_id: int, ID of the export job
+
+    :return: JsonResponse object
+    """
+
+    job = get_user_job(request, ExportJob, job_id)
+    download_url = None
+    if job.status == ExportJob.STATUS_DONE and job.export_file:
+        download_url = reverse("export_job_download", kwargs={"job_id": job.pk})
+
+    return JsonResponse({
+        "status": job.status,
+        "total_plugins": job.total_plugins,
+        "download_url": download_url,
+        "error": job.error,
+    })
+
+
+def export_job_download(request: HttpRequest, job_id: int) -> HttpResponse:
+    """"
+    Download the export file of a background export job, for staff users
+    and the user who started it. A single byte range
+    can be requested with the Range header, so that interrupted downloads of
+    big files can be resumed.
+
+    :param request: HttpRequest object
+    :param job_id: int, ID of the export job
+
+    :return: HttpResponse object
+    """
+
+    job = get_user_job(request, ExportJob, job_id, status=ExportJob.STATUS_DONE)
+    if not job.export_file:
+        raise Http404("The export file was deleted.")
+    size = job.export_file.size
+    filename = 'plugins.json'
+
+    range_header = request.headers.get('Range')
+    try:
+        byte_range = None if range_header is None else parse_range_header(range_header, size)
+    except RangeNotSatisfiableError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(job.export_file.open('rb'), as_attachment=True,
+                                filename=filename, content_type="application/json")
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        read_file_range(job.export_file.open('rb'), start, end),
+        status=206,
+        content_type="application/json",
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header asking for a single byte range. As RFC 9110 allows,
+    headers that are not a valid single byte range, e.g. several ranges, are
+    ignored, and the whole file is sent.
+
+    :param range_header: str, the value of the Range header
+    :param size: int, the size of the file in bytes
+
+    :return: tuple of the first and last byte positions, or None if the
+    header is ignored
+
+    Raises:
+        RangeNotSatisfiableError: If the range is valid but does not overlap
+        the file.
+    """
+    match = RANGE_RE.match(range_header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        if int(last) == 0 or size == 0:
+            raise RangeNotSatisfiableError(f"The suffix range {range_header} is empty.")
+        # A suffix range asks for the last bytes of the file.
+        return max(size - int(last), 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(f"The range {range_header} starts after the end of the file.")
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def read_file_range(file, start: int, end: int):
+    """
+    Read a byte range of a file in chunks, closing the file at the end.
+
+    :param file: the file object
+    :param start: int, the first byte position
+    :param end: int, the last byte position
+    """
+    with file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def clone_component_data(request: HttpRequest, component_type: Literal['plugin', 'placeholder'], component_id: int) -> HttpResponse:
+    """"
+    Clone the plugin tree of a source plugin or placeholder to a given
+    component, without going through an export file.
+
+    :param request: HttpRequest object
+    :param component_type: str, 'plugin' or 'placeholder', the target type
+    :param component_id: int, ID of the target component
+
+    :return: HttpResponse object
+    """
+
+    new_form = PluginOrPlaceholderSelectionForm({component_type: component_id})
+
+    if not new_form.is_valid():
+        return HttpResponseBadRequest("Form received unexpected values.")
+
+    clone_form = CloneForm(
+        data=request.POST or None,
+        initial=new_form.cleaned_data,
+    )
+
+    context = {
+        "form": clone_form,
+        "title": "Clone plugins",
+        "submit_label": "Clone",
+        "has_change_permission": True,
+        "is_popup": True,
+        "app_label": 'djangocms_plugie',
+    }
+
+    if not clone_form.is_valid():
+        return render(request, "djangocms_plugie/import_plugins.html", context)
+
+    try:
+        clone_form.run_clone()
+        messages.success(request, 'Plugin tree cloned successfully!')
+    except Exception as e:
+        clone_form.add_error(None, str(e))
+        return render(request, "djangocms_plugie/import_plugins.html", context)
+
+    return render(request, "djangocms_plugie/refresh_page.html")